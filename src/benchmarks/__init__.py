@@ -0,0 +1,4 @@
+"""
+Benchmarks for The Deep game. Run each one from the src directory, e.g.
+    python -m benchmarks.inventory
+"""
@@ -0,0 +1,69 @@
+"""
+Combat benchmark: games resolved one step at a time against a CombatBatch.
+Both runs use the same seeds and must end in identical games, and both run
+with the text server's garbage collector settings. Like the text server's
+tick loop, the batched run steps games one by one when there are fewer than
+MIN_ARRAY_BATCH of them, so small sizes should match stepping.
+"""
+
+import time
+from game.combat import CombatBatch, MIN_ARRAY_BATCH
+from game.core import GameCore
+from game.player import Player
+from server.text_server import freeze_shared_state
+from world.enemies import get_enemy_templates
+
+def _games(count):
+    games = [GameCore(Player(f"Diver {i}"), seed=i) for i in range(count)]
+    for game in games:
+        game.start()
+    return games
+
+def _keep_fighting(game, enemy_ids):
+    """Put a game back into a fight, patching the player up so nobody dies"""
+    game.player.health = game.player.max_health
+    if not game.in_combat:
+        game.current_enemy = get_enemy_templates()[enemy_ids[game.turn % len(enemy_ids)]].spawn()
+
+def _action(game, tick):
+    return "flee" if (game.seed + tick) % 7 == 0 else "attack"
+
+def run(batch_sizes=(1, 10, 100, 1000, 5000), actions=40000):
+    """Time attack and flee actions through GameCore.step() and through CombatBatch"""
+    enemy_ids = sorted(get_enemy_templates())
+    for size in batch_sizes:
+        ticks = max(1, actions // size)
+
+        games = _games(size)
+        start = time.perf_counter()
+        for tick in range(ticks):
+            for game in games:
+                _keep_fighting(game, enemy_ids)
+                game.step(_action(game, tick))
+        step_time = time.perf_counter() - start
+        stepped = [game.snapshot() for game in games]
+
+        games = _games(size)
+        batch = CombatBatch()
+        start = time.perf_counter()
+        for tick in range(ticks):
+            if size < MIN_ARRAY_BATCH:
+                for game in games:
+                    _keep_fighting(game, enemy_ids)
+                    game.step(_action(game, tick))
+                continue
+            for game in games:
+                _keep_fighting(game, enemy_ids)
+                batch.submit(game, _action(game, tick))
+            batch.resolve()
+        batch_time = time.perf_counter() - start
+        batched = [game.snapshot() for game in games]
+
+        total = ticks * size
+        print(f"{size:>5} games: step {total / step_time:>9,.0f} actions/s, "
+              f"batched {total / batch_time:>9,.0f} actions/s, "
+              f"{'identical' if stepped == batched else 'DIFFERENT'} results")
+
+if __name__ == "__main__":
+    freeze_shared_state()
+    run()
@@ -0,0 +1,47 @@
+"""
+Inventory benchmark: indexed Inventory lookups against the old list scans.
+"""
+
+import random
+import time
+from game.inventory import Inventory
+from world.items import Item
+
+def run(sizes=(1000, 5000, 20000), lookups=2000):
+    """Compare name lookups and removals against the old list scans"""
+    def list_get(items, name):
+        for item in items:
+            if item.name.lower() == name.lower():
+                return item
+        return None
+
+    for size in sizes:
+        definitions = [Item(f"item_{i}", f"Item {i}", "Benchmark item") for i in range(size)]
+        items = [definitions[i % size].instance() for i in range(size * 2)]
+        names = [random.choice(definitions).name for _ in range(lookups)]
+
+        inventory_list = list(items)
+        start = time.perf_counter()
+        for name in names:
+            list_get(inventory_list, name)
+        list_time = time.perf_counter() - start
+
+        inventory = Inventory(items)
+        start = time.perf_counter()
+        for name in names:
+            inventory.get(name)
+        indexed_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for name in names:
+            item = inventory.take(name)
+            if item is not None:
+                inventory.add(item)
+        take_time = time.perf_counter() - start
+
+        print(f"{len(items):>6} items: list get {list_time / lookups * 1e6:8.2f} us, "
+              f"indexed get {indexed_time / lookups * 1e6:6.2f} us, "
+              f"take+add {take_time / lookups * 1e6:6.2f} us")
+
+if __name__ == "__main__":
+    run()
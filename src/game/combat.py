@@ -0,0 +1,188 @@
+"""
+Combat rolls for The Deep game.
+Combat dice are counter based: every roll is a hash of the game's seed, the
+combat round and the roll's position in that round. A fight therefore plays
+out the same way whether GameCore resolves it on its own or a CombatBatch
+resolves it together with the fights of other games, computing the rolls and
+damage of the whole batch as NumPy arrays.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from game.player import ATTACK_DAMAGE
+
+_MASK = (1 << 64) - 1
+# SplitMix64 constants
+_SEED_STEP = 0x9E3779B97F4A7C15
+_ROUND_STEP = 0xD1B54A32D192ED03
+_SLOT_STEP = 0x8CB92BA72F3D8DD7
+_MIX_1 = 0xBF58476D1CE4E5B9
+_MIX_2 = 0x94D049BB133111EB
+_TO_UNIT = 2.0 ** -53
+
+# Verbs a CombatBatch resolves; anything else in combat runs on its own
+BATCHED_VERBS = ("attack", "flee")
+# Smaller batches run each game's action as a normal step, which is cheaper
+# than setting up the arrays
+MIN_ARRAY_BATCH = 32
+
+def escape_chance(threat_level):
+    """Chance of fleeing an enemy; works on NumPy arrays of threat levels too."""
+    return 0.8 - threat_level * 0.1
+
+def combat_roll(seed, combat_round, slot):
+    """A uniform float in [0, 1) for one roll"""
+    x = (seed * _SEED_STEP + combat_round * _ROUND_STEP + slot * _SLOT_STEP) & _MASK
+    x = ((x ^ (x >> 30)) * _MIX_1) & _MASK
+    x = ((x ^ (x >> 27)) * _MIX_2) & _MASK
+    x ^= x >> 31
+    return (x >> 11) * _TO_UNIT
+
+def combat_rolls(seeds, combat_rounds, slot):
+    """combat_roll() for arrays of uint64 seeds and rounds"""
+    with np.errstate(over="ignore"):
+        x = seeds * np.uint64(_SEED_STEP) + combat_rounds * np.uint64(_ROUND_STEP) + np.uint64(slot * _SLOT_STEP & _MASK)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(_MIX_1)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(_MIX_2)
+    x ^= x >> np.uint64(31)
+    return (x >> np.uint64(11)).astype(np.float64) * _TO_UNIT
+
+class CombatDice:
+    """
+    The rolls of one combat round. It has random() and randint() like
+    random.Random, so Player.attack() and Enemy.attack() accept it. Each call
+    takes the next roll of the round: the player's roll comes first, then the
+    enemy's.
+    """
+    __slots__ = ("seed", "combat_round", "slot")
+
+    def __init__(self, seed, combat_round):
+        self.seed = seed & _MASK
+        self.combat_round = combat_round
+        self.slot = 0
+
+    def random(self):
+        value = combat_roll(self.seed, self.combat_round, self.slot)
+        self.slot += 1
+        return value
+
+    def randint(self, a, b):
+        return a + int(self.random() * (b - a + 1))
+
+class CombatBatch:
+    """
+    Collects the attack and flee actions of many games during a tick and
+    resolves them together. Rolls, the enemies' health and the players'
+    health are computed as array columns and written back to each game,
+    which then reports the round and finishes its turn as usual.
+    Submit at most one action per game between calls to resolve().
+
+    Batches smaller than MIN_ARRAY_BATCH aren't worth setting up arrays for,
+    so their games simply run their actions as a normal step would.
+    """
+    def __init__(self):
+        # Waiting actions, in parallel lists
+        self._cores = []
+        self._actions = []
+        self._verbs = []
+
+    def __len__(self):
+        return len(self._cores)
+
+    def submit(self, core, action):
+        """
+        Take an action for a game.
+
+        Returns:
+            list: The action's events if it ran straight away, or None if it
+                  is an attack or flee waiting for resolve()
+        """
+        action = core.begin_step(action)
+        if action is None:
+            return core.events
+        parsed = core.parse_action(action)
+        if parsed and core.in_combat and parsed[0] in BATCHED_VERBS:
+            self._cores.append(core)
+            self._actions.append(action)
+            self._verbs.append(parsed[0])
+            return None
+        if parsed:
+            core.run_action(*parsed)
+        return core.finish_step(action)
+
+    def resolve(self):
+        """
+        Resolve every waiting fight.
+
+        Returns:
+            iterator: (core, events) for each game that was waiting, in submission order
+        """
+        cores, actions, verbs = self._cores, self._actions, self._verbs
+        self._cores, self._actions, self._verbs = [], [], []
+        if len(cores) < MIN_ARRAY_BATCH or np is None:
+            results = []
+            for core, action, verb in zip(cores, actions, verbs):
+                core.run_action(verb, "")
+                results.append(core.finish_step(action))
+            return zip(cores, results)
+
+        rounds = self._resolve_arrays(cores, verbs)
+        results = []
+        for core, action, verb, (damage, escaped, enemy_damage) in zip(cores, actions, verbs, rounds):
+            core.combat_round += 1
+            if verb == "flee":
+                core.report_flee(escaped, enemy_damage)
+            else:
+                core.report_attack(damage, enemy_damage)
+            results.append(core.finish_step(action))
+        return zip(cores, results)
+
+    @staticmethod
+    def _resolve_arrays(cores, verbs):
+        """
+        Roll every waiting game's round and apply its damage, as
+        GameCore.resolve_attack/resolve_flee would one game at a time.
+
+        Returns:
+            iterator: (damage, escaped, enemy_damage) for each game
+        """
+        count = len(cores)
+
+        def column(values, dtype):
+            return np.fromiter(values, dtype, count)
+
+        players = [core.player for core in cores]
+        enemies = [core.current_enemy for core in cores]
+        seeds = column((core.seed & _MASK for core in cores), np.uint64)
+        rounds = column((core.combat_round for core in cores), np.uint64)
+        fleeing = column((verb == "flee" for verb in verbs), np.bool_)
+        bonus = column((player.equipped_weapon.damage_bonus if player.equipped_weapon else 0
+                        for player in players), np.int64)
+        player_health = column((player.health for player in players), np.int64)
+        enemy_health = column((enemy.health for enemy in enemies), np.int64)
+        enemy_min = column((enemy.attack_min for enemy in enemies), np.int64)
+        enemy_max = column((enemy.attack_max for enemy in enemies), np.int64)
+        threat = column((enemy.threat_level for enemy in enemies), np.float64)
+
+        # The player's roll is the first of the round, the enemy's the second
+        player_roll = combat_rolls(seeds, rounds, 0)
+        enemy_roll = combat_rolls(seeds, rounds, 1)
+        low, high = ATTACK_DAMAGE
+        damage = low + (player_roll * (high - low + 1)).astype(np.int64) + bonus
+        escaped = player_roll < escape_chance(threat)
+        enemy_damage = enemy_min + (enemy_roll * (enemy_max - enemy_min + 1)).astype(np.int64)
+
+        # Attacks wound the enemy; the enemy strikes back if it survives an
+        # attack or the player fails to flee
+        enemy_health = np.where(fleeing, enemy_health, np.maximum(0, enemy_health - damage))
+        struck = np.where(fleeing, ~escaped, enemy_health > 0)
+        player_health = player_health - np.where(struck, enemy_damage, 0)
+
+        for player, enemy, health, new_enemy_health in zip(players, enemies, player_health.tolist(),
+                                                           enemy_health.tolist()):
+            player.health = health
+            enemy.health = new_enemy_health
+        return zip(damage.tolist(), escaped.tolist(), enemy_damage.tolist())
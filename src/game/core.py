@@ -0,0 +1,1095 @@
+"""
+Headless game core for The Deep.
+Runs the game rules one player action at a time and returns output events
+instead of printing, sleeping or touching any UI toolkit. The terminal and
+GUI engines are thin front-ends that render these events.
+"""
+
+import logging
+from game.game_state import GameState
+from game.player import Player
+from world.enemies import get_random_enemy_for_location, get_enemy_templates
+from world.items import get_item_by_id
+from utils.config import Config
+from utils.save_load import load_game, get_background_saver
+from utils.action_log import JournalingRandom, ReplayError, new_seed
+from game.combat import CombatDice, escape_chance
+from game.parser import verb_vocabulary, noun_vocabulary, AMBIGUOUS, FUZZY
+
+# Setup logger
+logger = logging.getLogger('the_deep.core')
+
+# Directions the player can move in
+DIRECTIONS = ("north", "south", "east", "west", "up", "down")
+
+# Bumped when the layout of GameCore.snapshot() changes
+SNAPSHOT_VERSION = 3
+# Older layouts restore() still accepts. Version 1 had no seed or RNG state,
+# version 2 no combat round.
+READABLE_SNAPSHOT_VERSIONS = (1, 2, 3)
+
+# Verbs whose argument names an item, and where that item can be
+ITEM_VERB_SCOPES = {
+    "examine": "all",
+    "look": "all",
+    "take": "room",
+    "get": "room",
+    "use": "inventory",
+}
+
+# Educational notes shown on the first visit to matching locations
+LOCATION_NOTES = (
+    ("reef", "Coral reefs are among the most diverse ecosystems on Earth, but pollution, climate change, and ocean acidification have led to a 50% decline in coral reefs worldwide in the past 30 years."),
+    ("trench", "The deep ocean remains one of the least explored regions on Earth. Deep sea trenches can reach depths exceeding 36,000 feet, where pressure is more than 1,000 times that at sea level."),
+    ("bloom", "Algal blooms can create hypoxic conditions (low oxygen) that lead to 'dead zones' where marine life cannot survive. The largest dead zone in the world is in the Baltic Sea."),
+)
+
+DEATH_ENDING = """Your vision fades as the cold depths claim you. The last thing you see is the
+strange bioluminescence of the deep sea creatures surrounding you.
+
+Your research and samples are never recovered, and the mysteries of The Deep
+remain unsolved. Perhaps another brave soul will continue your work someday...
+
+GAME OVER - You have failed to survive The Deep."""
+
+WIN_ENDING = """With your extensive collection of samples and documentation of The Deep's
+corruption, you return to the surface as a hero. Your evidence leads to
+international action against ocean pollution and the mysterious entity
+known as the Tidecaller retreats to the deepest trenches.
+
+Your name goes down in scientific history, and the oceans begin their
+long process of healing thanks to your brave expedition.
+
+CONGRATULATIONS - You've successfully completed your mission!"""
+
+HELP_TEXT = """COMMAND HELP:
+- Movement: north, south, east, west, up, down (or n, e, w, u, d)
+- Travel to a place you've been: travel [location name]
+- Look around: look
+- Check inventory: inventory or i
+- Read journal: journal or j
+- View samples: samples or s
+- Examine item: examine [item name] or look at [item name]
+- Take item: take [item name] or get [item name]
+- Use item: use [item name]
+- View objectives: objectives or o
+- Save or load your game: save, load
+- Help: help
+- Quit: quit
+Any unique start of a command or item name works too, e.g. 'ex log'.
+
+In combat: attack, flee, use [item name]"""
+
+
+class OutputEvent:
+    """A single piece of output produced by the game core."""
+
+    # Event kinds
+    TEXT = "text"
+    STATUS = "status"
+    GAME_OVER = "game_over"
+    WIN = "win"
+    QUIT = "quit"
+
+    __slots__ = ("kind", "text", "style")
+
+    def __init__(self, kind, text="", style=None):
+        self.kind = kind
+        self.text = text
+        self.style = style  # Optional style hint: title, info, note, success, warning, danger
+
+    def __repr__(self):
+        return f"OutputEvent({self.kind!r}, {self.text!r}, style={self.style!r})"
+
+
+def new_objectives():
+    """Create a fresh set of side objectives."""
+    return {
+        "collect_samples": {
+            "name": "Collect Environmental Samples",
+            "description": "Collect water, tissue and pollution samples from different locations to analyze the environmental impact.",
+            "target": 5,
+            "progress": 0,
+            "completed": False
+        },
+        "document_mutations": {
+            "name": "Document Mutations",
+            "description": "Document evidence of how pollution has affected marine life through mutations.",
+            "target": 3,
+            "progress": 0,
+            "completed": False
+        },
+        "map_pollution": {
+            "name": "Map Pollution Sources",
+            "description": "Identify and map the sources of pollution in the area.",
+            "target": 3,
+            "progress": 0,
+            "completed": False
+        },
+        "find_research": {
+            "name": "Recover Research Data",
+            "description": "Find Dr. Mira Elson's research data on 'The Awakening'.",
+            "target": 1,
+            "progress": 0,
+            "completed": False
+        }
+    }
+
+
+class GameCore:
+    """Turn-based game rules with no I/O.
+
+    Call start() once, then step(action) for every player action. Each call
+    returns the list of OutputEvent objects produced by that turn.
+    """
+
+    def __init__(self, player=None, game_state=None, seed=None):
+        self.player = player or Player("Explorer")
+        self.game_state = game_state or GameState()
+        self.current_location = self.game_state.current_location
+        self.player.set_location(self.current_location)
+
+        # Combat related settings
+        self.current_enemy = None
+        self.min_steps_between_combat = 3
+        self.steps_since_combat = 0
+        self.spawn_chance = 0.25
+
+        # Game state flags
+        self.game_running = True
+        self.outcome = None  # "dead", "won" or "quit" once the game ends
+        self.turn = 0
+        self.save_path = Config.SAVE_FILE_PATH
+
+        # All randomness goes through rng so the journal can record and replay
+        # it, and a game started from the same seed plays out the same way
+        self.seed = self._choose_seed(seed)
+        self.rng = JournalingRandom(self.seed)
+        self.combat_round = 0  # Combat rolls are keyed by the seed and this counter
+        self.history = []  # Recent actions, at most Config.RECORDING_MAX_ACTIONS of them
+        self._history_start = None  # Snapshot history is replayed onto, None for a new game
+        self.journal = None  # Optional ActionJournal for crash recovery
+        self.generation = 0  # Bumped when reset() or restore() replaces the world and player
+        self._replaying = False
+        self._state_replaced = False
+        self._preloaded_save = None  # (snapshot,) read ahead for the next load command
+
+        # Objectives
+        self.game_objectives = new_objectives()
+        self.main_objective = {
+            "name": "Stop the Tide",
+            "description": "Discover the connection between the pollution and the Tidecaller entity, and find a way to prevent an ecological disaster.",
+            "completed": False
+        }
+
+        self._events = []
+
+        # Exploration commands, keyed by verb
+        self._commands = {
+            "look": self._cmd_look,
+            "inventory": self._cmd_inventory,
+            "i": self._cmd_inventory,
+            "journal": self._cmd_journal,
+            "j": self._cmd_journal,
+            "samples": self._cmd_samples,
+            "s": self._cmd_samples,
+            "examine": self._cmd_examine,
+            "take": self._cmd_take,
+            "get": self._cmd_take,
+            "use": self._cmd_use,
+            "go": self._cmd_go,
+            "travel": self._cmd_travel,
+            "objectives": self._cmd_objectives,
+            "o": self._cmd_objectives,
+            "help": self._cmd_help,
+            "save": self._cmd_save,
+            "load": self._cmd_load,
+            "quit": self._cmd_quit,
+        }
+        for direction in DIRECTIONS:
+            self._commands[direction] = self._cmd_go
+
+        # Combat commands, keyed by verb
+        self._combat_commands = {
+            "attack": self._combat_attack,
+            "flee": self._combat_flee,
+            "use": self._combat_use,
+            "help": self._cmd_help,
+            "quit": self._cmd_quit,
+        }
+
+        # Typed words are resolved against these before dispatch
+        self._verbs = verb_vocabulary(self._commands)
+        self._combat_verbs = verb_vocabulary(self._combat_commands)
+        self._directions = verb_vocabulary(DIRECTIONS)
+        self._nouns = {}  # scope -> (key it was built for, vocabulary)
+
+    @property
+    def events(self):
+        """The events produced so far by the current turn."""
+        return self._events
+
+    @property
+    def in_combat(self):
+        """True while an enemy is engaging the player."""
+        return self.current_enemy is not None and self.current_enemy.is_alive()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _choose_seed(seed):
+        if seed is not None:
+            return seed
+        if Config.GAME_SEED is not None:
+            return Config.GAME_SEED
+        return new_seed()
+
+    def start(self):
+        """Begin the game and return the events describing the first location."""
+        self._events = []
+        logger.info(f"Starting game with seed {self.seed}")
+        if self.journal is not None:
+            self.journal.start(self.snapshot())
+        self._describe_location()
+        self._emit_status()
+        return self._events
+
+    def reset(self, player_name=None, seed=None):
+        """Start a brand new game with a fresh world, player and seed."""
+        self.player = Player(player_name or self.player.name)
+        self.game_state = GameState()
+        self.current_location = self.game_state.current_location
+        self.player.set_location(self.current_location)
+        self.current_enemy = None
+        self.steps_since_combat = 0
+        self.game_running = True
+        self.outcome = None
+        self.turn = 0
+        self.seed = self._choose_seed(seed)
+        self.rng.seed(self.seed)
+        self.combat_round = 0
+        self.history = []
+        self._history_start = None
+        self.game_objectives = new_objectives()
+        self.main_objective["completed"] = False
+        self.generation += 1
+        self._nouns.clear()
+
+    def recording(self):
+        """
+        Everything needed to replay this game exactly (see utils.replay).
+
+        Returns:
+            dict: The seed and player name, the snapshot the actions start
+                  from (None for a new game) and the actions themselves.
+                  Long games start from a snapshot taken
+                  Config.RECORDING_MAX_ACTIONS actions ago at most.
+        """
+        return {
+            "seed": self.seed,
+            "player_name": self.player.name if self._history_start is None else None,
+            "start": self._history_start,
+            "actions": list(self.history),
+        }
+
+    def snapshot(self):
+        """
+        Capture the whole game as plain data for saving.
+        Items are stored by ID with only their per-copy state.
+        """
+        def item_data(item):
+            # Story events can put plain strings in the inventory
+            return [item.id, item.charges] if hasattr(item, "id") else item
+
+        player = self.player
+        inventory = list(player.inventory)
+        equipped = player.equipped_weapon
+        game_state = self.game_state
+        return {
+            "snapshot_version": SNAPSHOT_VERSION,
+            "game_version": Config.get_version(),
+            "seed": self.seed,
+            "rng": self.rng.state_data(),
+            "combat_round": self.combat_round,
+            "turn": self.turn,
+            "steps_since_combat": self.steps_since_combat,
+            "game_running": self.game_running,
+            "outcome": self.outcome,
+            "objectives": {key: [obj["progress"], obj["completed"]] for key, obj in self.game_objectives.items()},
+            "main_objective_completed": self.main_objective["completed"],
+            "player": {
+                "name": player.name,
+                "health": player.health,
+                "max_health": player.max_health,
+                "inventory": [item_data(item) for item in inventory],
+                "equipped": next((i for i, item in enumerate(inventory) if item is equipped), None),
+                "journal": list(player.journal),
+                "samples": list(player.samples),
+            },
+            "world": {
+                "current_location": self.current_location.id,
+                "visited": sorted(game_state.visited_locations),
+                "flags": dict(game_state.game_flags),
+                # Only rooms this game has touched; the rest are as the world template has them
+                "locations": {
+                    location_id: [location.visited, dict(location.exits), [item_data(item) for item in location.items]]
+                    for location_id, location in sorted(game_state.locations.items())
+                },
+            },
+            "enemy": [self.current_enemy.id, self.current_enemy.health] if self.in_combat else None,
+        }
+
+    def restore(self, snapshot):
+        """Replace the current game with one captured by snapshot()."""
+        if snapshot.get("snapshot_version") not in READABLE_SNAPSHOT_VERSIONS:
+            raise ValueError(f"Unsupported snapshot version {snapshot.get('snapshot_version')}")
+
+        def make_item(data):
+            if isinstance(data, str):
+                return data
+            item = get_item_by_id(data[0])
+            if item is not None:
+                item.charges = data[1]
+            return item
+
+        world = snapshot["world"]
+        game_state = GameState()
+        for location_id, (visited, exits, items) in world["locations"].items():
+            # Older snapshots list every room; ones never visited are still as the template has them
+            if not visited and location_id != world["current_location"]:
+                continue
+            location = game_state.enter_location(location_id)
+            if location is None:
+                continue
+            location.visited = visited
+            location.exits = dict(exits)
+            location.items = [item for item in map(make_item, items) if item is not None]
+            location.version += 1
+        game_state.visited_locations = set(world["visited"])
+        game_state.game_flags = dict(world["flags"])
+        game_state.current_location = game_state.enter_location(world["current_location"])
+
+        data = snapshot["player"]
+        player = Player(data["name"])
+        player.health = data["health"]
+        player.max_health = data["max_health"]
+        inventory = [make_item(item) for item in data["inventory"]]
+        for item in inventory:
+            if item is not None:
+                player.inventory.append(item)
+        if data["equipped"] is not None and inventory[data["equipped"]] is not None:
+            player.equipped_weapon = inventory[data["equipped"]]
+            player.equipped_weapon.equipped = True
+        player.journal = list(data["journal"])
+        player.samples = list(data["samples"])
+
+        enemy = None
+        if snapshot["enemy"] is not None:
+            enemy_id, health = snapshot["enemy"]
+            template = get_enemy_templates().get(enemy_id)
+            if template is not None:
+                enemy = template.spawn()
+                enemy.health = health
+
+        self.game_state = game_state
+        self.player = player
+        self.current_location = game_state.current_location
+        player.set_location(self.current_location)
+        self.current_enemy = enemy
+        self.turn = snapshot["turn"]
+        self.steps_since_combat = snapshot["steps_since_combat"]
+        self.game_running = snapshot["game_running"]
+        self.outcome = snapshot["outcome"]
+        self.game_objectives = new_objectives()
+        for key, (progress, completed) in snapshot["objectives"].items():
+            if key in self.game_objectives:
+                self.game_objectives[key]["progress"] = progress
+                self.game_objectives[key]["completed"] = completed
+        self.main_objective["completed"] = snapshot["main_objective_completed"]
+        if "seed" in snapshot:
+            self.seed = snapshot["seed"]
+            self.rng.set_state_data(snapshot["rng"])
+        self.combat_round = snapshot.get("combat_round", 0)
+        # Actions from here on replay onto this snapshot, not onto a new game
+        self.history = []
+        self._history_start = snapshot
+        self._state_replaced = True
+        self.generation += 1
+        # The cached nouns were keyed on the id() of rooms and an inventory that are gone
+        self._nouns.clear()
+
+    def step(self, action):
+        """Advance the game by one player action.
+
+        Args:
+            action (str): A command such as "north", "take binoculars" or "attack"
+
+        Returns:
+            list: The OutputEvent objects produced by this action
+        """
+        action = self.begin_step(action)
+        if action is not None:
+            parsed = self.parse_action(action)
+            if parsed:
+                self.run_action(*parsed)
+            self.finish_step(action)
+        return self._events
+
+    # step() is split into these parts so a CombatBatch can resolve the
+    # fights of many games together between parsing and finishing a turn
+
+    def begin_step(self, action):
+        """Start a turn. Returns the normalized action, or None if the game is over."""
+        self._events = []
+        if not self.game_running:
+            self._emit("The expedition is over.")
+            return None
+        self.rng.take_draws()
+
+        action = (action or "").lower().strip()
+        if len(self.history) >= Config.RECORDING_MAX_ACTIONS:
+            # Fold the older actions into the snapshot the rest replay onto
+            self._history_start = self.snapshot()
+            self.history = []
+        # Recorded before running so a "load" that replaces the history drops itself
+        self.history.append(action)
+        return action
+
+    def parse_action(self, action):
+        """Resolve an action to (verb, arg), or None after explaining what went wrong."""
+        if action.startswith("look at "):
+            verb, arg = "examine", action[8:]
+        else:
+            verb, _, arg = action.partition(" ")
+            arg = arg.strip()
+
+        if self.in_combat:
+            return self._parse(verb, arg, self._combat_verbs, "Invalid action. Choose attack, flee or use [item name].")
+        self.current_enemy = None
+        return self._parse(verb, arg, self._verbs, "I don't understand that command. Type 'help' for a list of commands.")
+
+    def run_action(self, verb, arg):
+        """Carry out a parsed action."""
+        if self.in_combat:
+            self._combat_commands[verb](arg)
+        elif self._commands[verb](verb, arg) is not False:
+            self._end_exploration_turn()
+
+    def finish_step(self, action):
+        """End a turn: check for death or victory and journal the action."""
+        self._check_end_conditions()
+        if self.journal is not None and not self._replaying:
+            self._journal_action(action)
+        return self._events
+
+    def _journal_action(self, action):
+        """Log the action just taken, snapshotting or discarding the journal when due."""
+        journal = self.journal
+        if not self.game_running:
+            # The game ended normally, so there is nothing to recover
+            journal.discard()
+            return
+        journal.append(action, self.rng.take_draws())
+        if self._state_replaced or journal.needs_snapshot():
+            # A loaded game can't be rebuilt by replay, so it needs a fresh snapshot
+            self._state_replaced = False
+            journal.write_snapshot(self.snapshot())
+
+    def recover(self):
+        """
+        Rebuild a game that ended unexpectedly from the journal.
+
+        Returns:
+            list: Events describing where the player is, or None if there was
+                  nothing to recover
+        """
+        result = self.journal.recover() if self.journal is not None else None
+        if result is None:
+            return None
+        snapshot, records, sequence = result
+        self.restore(snapshot)
+
+        self._replaying = True
+        replayed = 0
+        try:
+            for action, draws in records:
+                self.rng.replay(draws)
+                self.step(action)
+                unused = self.rng.stop_replay()
+                if unused:
+                    raise ReplayError(f"{unused} recorded draws were not used by '{action}'")
+                replayed += 1
+        except ReplayError as e:
+            logger.error(f"Stopped journal replay after {replayed} of {len(records)} actions: {str(e)}")
+        finally:
+            self.rng.stop_replay()
+            self._replaying = False
+        logger.info(f"Recovered game at turn {self.turn} by replaying {replayed} actions")
+
+        self.journal.resume(self.snapshot(), sequence)
+        self._state_replaced = False
+        self._events = []
+        self._emit("Your expedition has been restored.", "success")
+        self._describe_location()
+        if self.in_combat:
+            self._describe_enemy()
+        self._emit_status()
+        return self._events
+
+    def _parse(self, verb, arg, verbs, unknown_message):
+        """
+        Resolve abbreviated or misspelt input to a known verb and argument.
+        Returns (verb, arg), or None after telling the player what went wrong.
+        """
+        resolved, how, candidates = verbs.resolve(verb)
+        if resolved is None:
+            if how == AMBIGUOUS:
+                self._emit(f"Did you mean {verbs.describe(candidates)}?")
+            elif how == FUZZY:
+                self._emit(f"I don't understand '{verb}'. Did you mean {verbs.describe(candidates)}?")
+            else:
+                self._emit(unknown_message)
+            return None
+
+        verb = resolved
+        if verb == "travel" and arg.startswith("to "):
+            arg = arg[3:].strip()
+        nouns = self._argument_vocabulary(verb) if arg else None
+        if nouns is not None:
+            value, how, candidates = nouns.resolve(arg)
+            if how == AMBIGUOUS:
+                # A word that is the whole name of one candidate means that one
+                named = [candidate for candidate in candidates if candidate == arg or nouns.label(candidate).lower() == arg]
+                value = named[0] if len(named) == 1 else None
+            if value is not None:
+                arg = value
+            elif how == AMBIGUOUS or (how == FUZZY and not self._matches_directly(verb, arg)):
+                problem = f"I don't know anywhere called '{arg}'." if verb == "travel" else f"I don't see any '{arg}'."
+                self._emit(f"{problem} Did you mean {nouns.describe(candidates)}?")
+                return None
+            # Otherwise let the command fall back to its own partial matching
+        return verb, arg
+
+    def _matches_directly(self, verb, arg):
+        """True if the command's own name matching would find arg without the vocabulary."""
+        if verb == "travel":
+            location = self.game_state.find_location(arg)
+            return location is not None and location.visited
+        scope = ITEM_VERB_SCOPES.get(verb)
+        return scope is not None and self._find_item(self._scope_items(scope), arg) is not None
+
+    def _scope_items(self, scope):
+        """The items an item verb with this scope can name."""
+        things = []
+        if scope != "inventory":
+            things.extend(self.current_location.items)
+        if scope != "room":
+            things.extend(item for item, count in self.player.inventory.stacks())
+        return [thing for thing in things if hasattr(thing, "id")]
+
+    def _argument_vocabulary(self, verb):
+        """The words an argument to this verb can be resolved against, or None."""
+        if verb in DIRECTIONS or verb == "go":
+            return self._directions
+        scope = ITEM_VERB_SCOPES.get(verb)
+        if scope is not None:
+            location = self.current_location
+            inventory = self.player.inventory
+            key = (id(location), location.version, id(inventory), inventory.version)
+            cached = self._nouns.get(scope)
+            if cached is None or cached[0] != key:
+                cached = (key, noun_vocabulary(self._scope_items(scope)))
+                self._nouns[scope] = cached
+            return cached[1]
+        if verb == "travel":
+            visited = self.game_state.visited_locations
+            key = (id(visited), len(visited))
+            cached = self._nouns.get("travel")
+            if cached is None or cached[0] != key:
+                locations = (self.game_state.get_location(location_id) for location_id in visited)
+                cached = (key, noun_vocabulary(locations))
+                self._nouns["travel"] = cached
+            return cached[1]
+        return None
+
+    def update_objective(self, objective_id, amount=1):
+        """Advance an objective's progress and mark it complete when reached."""
+        objective = self.game_objectives.get(objective_id)
+        if not objective or objective["completed"]:
+            return
+        objective["progress"] = min(objective["progress"] + amount, objective["target"])
+        if objective["progress"] >= objective["target"]:
+            objective["completed"] = True
+            self._emit(f"Objective complete: {objective['name']}", "success")
+
+    def check_win_condition(self):
+        """Check if all objectives are completed to trigger win condition"""
+        # Final location requirement - player must be at the Black Bloom for final confrontation.
+        # Checked first because it rules out almost every turn.
+        at_final_location = self.current_location and self.current_location.id == "black_bloom"
+        if not at_final_location:
+            return False
+
+        all_objectives_complete = all(obj["completed"] for obj in self.game_objectives.values())
+
+        has_special_item = self.player.inventory.has("tidecaller_essence")
+
+        # If all other conditions are met but player doesn't have the item,
+        # place it in the current location if they're at the final location
+        if all_objectives_complete and at_final_location and not has_special_item:
+            already_placed = any(item.id == "tidecaller_essence" for item in self.current_location.items)
+            special_item = None if already_placed else get_item_by_id("tidecaller_essence")
+            if special_item:
+                self.current_location.add_item(special_item)
+                self._emit("\nThe water around you begins to shimmer with an otherworldly glow...\nSomething has formed in the center of the Black Bloom.", "info")
+
+        return all_objectives_complete and at_final_location and has_special_item
+
+    # ------------------------------------------------------------------
+    # Output helpers
+    # ------------------------------------------------------------------
+
+    def _emit(self, text, style=None, kind=OutputEvent.TEXT):
+        self._events.append(OutputEvent(kind, text, style))
+
+    def _emit_status(self):
+        location_name = self.current_location.name if self.current_location else "Unknown Location"
+        self._events.append(OutputEvent(OutputEvent.STATUS, location_name))
+
+    def _describe_location(self):
+        """Describe the current location, in full on the first visit."""
+        location = self.current_location
+        first_visit = not location.visited
+        location.visited = True
+        self.game_state.mark_location_visited(location.id)
+
+        self._emit(f"\n=== {location.name} ===", "title")
+
+        if first_visit:
+            self._emit(location.description, "info")
+            for keyword, note in LOCATION_NOTES:
+                if keyword in location.id:
+                    self._emit(f"\nEDUCATIONAL NOTE: {note}", "note")
+                    break
+            self.player.add_journal_entry(f"Visited {location.name}. {location.description[:100]}...")
+        else:
+            self._emit(f"You are back at {location.name}.")
+
+        self._describe_items()
+        if location.exits:
+            self._emit("\nPossible directions:\n" + "\n".join(f"- {direction}" for direction in location.exits), "info")
+
+    def _describe_items(self):
+        if self.current_location.items:
+            self._emit("\nYou notice:\n" + "\n".join(f"- {item.name}" for item in self.current_location.items), "success")
+
+    def _describe_enemy(self):
+        enemy = self.current_enemy
+        self._emit(f"\nWARNING: HOSTILE ENTITY DETECTED!\nCOMBAT: {enemy.name} attacks!", "danger")
+        self._emit(f"Enemy health: {enemy.health}/{enemy.max_health}\nThreat level: {enemy.threat_level}")
+        self._emit(enemy.description)
+
+    # ------------------------------------------------------------------
+    # Exploration
+    # ------------------------------------------------------------------
+
+    def _end_exploration_turn(self):
+        """Advance the turn counter and roll for a random encounter."""
+        self.turn += 1
+        if not self.game_running:
+            return
+        self.steps_since_combat += 1
+        if self.steps_since_combat >= self.min_steps_between_combat and self.rng.random() < self.spawn_chance:
+            self.spawn_enemy()
+
+    def spawn_enemy(self):
+        """Spawn a random enemy at the current location."""
+        enemy = get_random_enemy_for_location(self.current_location.id, self.rng)
+        if enemy:
+            self.current_enemy = enemy
+            self.steps_since_combat = 0
+            self._emit(f"\nA wild {enemy.name} appears!", "danger")
+            self._describe_enemy()
+        return enemy
+
+    def move_player(self, direction):
+        """Move player in the specified direction"""
+        target_location_id = self.current_location.exits.get(direction)
+        if target_location_id is None:
+            self._emit(f"You can't go {direction} from here.")
+            return False
+
+        new_location = self.game_state.enter_location(target_location_id)
+        if new_location is None:
+            logger.error(f"Exit '{direction}' leads to unknown location '{target_location_id}'")
+            self._emit(f"Error: Location '{target_location_id}' not found.")
+            return False
+
+        self.current_location = new_location
+        self.game_state.current_location = new_location
+        self.player.set_location(new_location)
+        self._describe_location()
+        self._emit_status()
+        return True
+
+    def _cmd_go(self, verb, arg):
+        direction = arg if verb == "go" else verb
+        if not direction:
+            self._emit("Go where?")
+            return False
+        return self.move_player(direction)
+
+    def _cmd_travel(self, verb, arg):
+        if arg.startswith("to "):
+            arg = arg[3:].strip()
+        if not arg:
+            self._emit("Travel where?")
+            return False
+        return self.travel_to(arg)
+
+    def travel_to(self, destination):
+        """Travel along the shortest route to a visited location in a single turn."""
+        target = self.game_state.find_location(destination)
+        if target is None or not target.visited:
+            self._emit(f"You don't know of anywhere called '{destination}'.")
+            return False
+        if target is self.current_location:
+            self._emit(f"You are already at the {target.name}.")
+            return False
+
+        route = self.game_state.routes.route(self.current_location.id, target.id)
+        if route is None:
+            self._emit(f"There is no way to reach the {target.name} from here.")
+            return False
+
+        # Pass through the rooms on the way without describing or entering them
+        self.current_location = self.game_state.enter_location(target.id)
+        self.game_state.current_location = self.current_location
+        self.player.set_location(self.current_location)
+        self._emit(f"You travel {len(route)} {'move' if len(route) == 1 else 'moves'} to the {target.name}.")
+        self._describe_location()
+        self._emit_status()
+        return True
+
+    def _cmd_look(self, verb, arg):
+        if arg:
+            return self._cmd_examine(verb, arg)
+        self._emit(self.current_location.description, "info")
+        self._describe_items()
+        return None
+
+    def _cmd_inventory(self, verb, arg):
+        self._emit(self.player.show_inventory())
+
+    def _cmd_journal(self, verb, arg):
+        self._emit(self.player.read_journal())
+
+    def _cmd_samples(self, verb, arg):
+        self._emit(self.player.view_samples())
+
+    def _cmd_examine(self, verb, arg):
+        item = self._find_item(self.current_location.items, arg) or self._find_in_inventory(arg)
+        if item is None:
+            self._emit("Item not found.")
+            return False
+        self._emit(f"Examining {item.name}: {item.description}")
+
+    def _cmd_take(self, verb, arg):
+        """Take an item from the current location."""
+        if not self.current_location.items:
+            self._emit("There's nothing here to take.")
+            return False
+
+        item = self._find_item(self.current_location.items, arg)
+        if item is None:
+            self._emit(f"There is no {arg} here to take.")
+            return False
+
+        self.current_location.remove_item(item)
+        self.player.inventory.append(item)
+        message = f"You take the {item.name}."
+        if item.on_pickup_message:
+            message += f"\n{item.on_pickup_message}"
+        self._emit(message, "success")
+
+        # Update relevant objectives
+        if "sample" in item.id:
+            self._emit("Sample added to your collection.", "warning")
+            self.update_objective("collect_samples", 1)
+        elif "research" in item.id:
+            self._emit("Research data recovered.", "warning")
+            self.update_objective("find_research", 1)
+
+    def _cmd_use(self, verb, arg):
+        return self._use_item(arg)
+
+    def _cmd_objectives(self, verb, arg):
+        lines = ["\n=== OBJECTIVES ==="]
+        for obj in self.game_objectives.values():
+            status = "✓" if obj["completed"] else " "
+            lines.append(f"[{status}] {obj['name']}: {obj['description']} (Progress: {obj['progress']}/{obj['target']})")
+        lines.append("===================")
+        lines.append(f"MAIN OBJECTIVE: {self.main_objective['name']} - {self.main_objective['description']}")
+        self._emit("\n".join(lines))
+
+    def _cmd_help(self, verb=None, arg=None):
+        self._emit(HELP_TEXT)
+        return False
+
+    def _cmd_save(self, verb=None, arg=None):
+        """Save in the background; only taking the snapshot happens on this thread."""
+        if self._replaying:
+            return False  # Already saved when the action was first taken
+        get_background_saver().save(self.snapshot(), self.save_path, self._on_save_done)
+        self._emit("Game saved.", "success")
+        return False
+
+    def _on_save_done(self, error):
+        if error is not None:
+            logger.error(f"Saving to {self.save_path} failed: {str(error)}")
+
+    def wants_saved_game(self, action):
+        """True if action would load the saved game, so a caller can read it beforehand."""
+        if not self.game_running or self.in_combat:
+            return False
+        verb = (action or "").lower().strip().partition(" ")[0]
+        return self._verbs.resolve(verb)[0] == "load"
+
+    def wants_to_quit(self, action):
+        """True if action would quit the game, so a front-end can ask for confirmation first."""
+        if not self.game_running:
+            return False
+        verb = (action or "").lower().strip().partition(" ")[0]
+        verbs = self._combat_verbs if self.in_combat else self._verbs
+        return verbs.resolve(verb)[0] == "quit"
+
+    def read_saved_game(self):
+        """Read the saved game, or None. Blocks on the disk, so servers call it off their event loop."""
+        # Make sure a save still being written is on disk first
+        get_background_saver().flush()
+        return load_game(self.save_path)
+
+    def preload_saved_game(self, snapshot):
+        """Hand the next load command a snapshot from read_saved_game() so it doesn't read the disk."""
+        self._preloaded_save = (snapshot,)
+
+    def _cmd_load(self, verb=None, arg=None):
+        if self._preloaded_save is not None:
+            (snapshot,), self._preloaded_save = self._preloaded_save, None
+        else:
+            snapshot = self.read_saved_game()
+        if snapshot is None:
+            self._emit("There is no saved game to load.", "warning")
+            return False
+        try:
+            self.restore(snapshot)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            logger.error(f"Could not restore saved game: {str(e)}")
+            self._emit("The saved game could not be loaded.", "danger")
+            return False
+        self._emit("Game loaded.", "success")
+        self._describe_location()
+        self._emit_status()
+        return False
+
+    def _cmd_quit(self, verb=None, arg=None):
+        self.game_running = False
+        self.outcome = "quit"
+        self._emit("You abandon the expedition and return to the surface.", kind=OutputEvent.QUIT)
+        return False
+
+    # ------------------------------------------------------------------
+    # Items
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _find_item(items, name):
+        """Find an item by exact name, falling back to a partial match."""
+        if not name:
+            return None
+        name = name.lower()
+        partial = None
+        for item in items:
+            item_name = item.name.lower()
+            if item_name == name or item.id == name:
+                return item
+            if partial is None and name in item_name:
+                partial = item
+        return partial
+
+    def _find_in_inventory(self, name):
+        """Find an inventory item by exact ID or name, falling back to a partial name match."""
+        item = self.player.inventory.get(name)
+        if item is None:
+            item = self._find_item(self.player.inventory, name)
+        return item
+
+    def _use_item(self, item_name):
+        """Use an item from the player's inventory."""
+        if not item_name:
+            usable = [item.name for item, count in self.player.inventory.stacks() if item.usable]
+            if usable:
+                self._emit("Use what? You could use:\n" + "\n".join(f"- {name}" for name in usable))
+            else:
+                self._emit("You have no usable items.")
+            return False
+
+        item = self._find_in_inventory(item_name)
+        if item is None:
+            self._emit(f"You don't have a {item_name}.")
+            return False
+        equipped = self.player.equipped_weapon
+        if equipped is not None and equipped.id == item.id:
+            item = equipped  # Using a weapon you hold copies of toggles the one in hand
+
+        health_before = self.player.health
+        self._emit(item.use(self.player, self.current_location))
+        if self.player.health != health_before:
+            self._emit(f"Health: {self.player.health}/{self.player.max_health}")
+            self._emit_status()
+
+        # Remove consumable items once their last charge is used
+        if item.consumable:
+            item.charges -= 1
+            if item.charges <= 0:
+                self.player.inventory.remove(item)
+        return True
+
+    # ------------------------------------------------------------------
+    # Combat
+    # ------------------------------------------------------------------
+
+    def _next_dice(self):
+        """Dice for the next round of combat"""
+        dice = CombatDice(self.seed, self.combat_round)
+        self.combat_round += 1
+        return dice
+
+    def _combat_attack(self, arg):
+        dice = self._next_dice()
+        self.resolve_attack(self.player.attack(dice), self.current_enemy.attack(dice))
+
+    def _combat_flee(self, arg):
+        dice = self._next_dice()
+        # Chance to escape based on enemy threat
+        escaped = dice.random() < escape_chance(self.current_enemy.threat_level)
+        self.resolve_flee(escaped, self.current_enemy.attack(dice))
+
+    def _combat_use(self, arg):
+        if self._use_item(arg):
+            self._enemy_turn(self.current_enemy.attack(self._next_dice()))
+
+    def resolve_attack(self, damage, enemy_damage):
+        """Apply a rolled attack; the enemy strikes back with enemy_damage if it survives."""
+        enemy = self.current_enemy
+        enemy.health = max(0, enemy.health - damage)
+        if enemy.is_alive():
+            self.player.health -= enemy_damage
+        self.report_attack(damage, enemy_damage)
+
+    def report_attack(self, damage, enemy_damage):
+        """Describe an attack whose damage has already been taken off the enemy and the player."""
+        enemy = self.current_enemy
+        weapon_text = ""
+        if self.player.equipped_weapon:
+            weapon_text = f" using your {self.player.equipped_weapon.name}"
+
+        self._emit(f"\nYou attack the {enemy.name}{weapon_text} for {damage} damage!")
+        self._emit(f"{enemy.name}'s health: {enemy.health}/{enemy.max_health}")
+
+        if not enemy.is_alive():
+            self._emit(f"\nYou have defeated the {enemy.name}!", "success")
+            self.handle_enemy_defeat(enemy)
+            self.current_enemy = None
+            return
+        self._report_enemy_turn(enemy_damage)
+
+    def resolve_flee(self, escaped, enemy_damage):
+        """Apply a rolled escape attempt; on failure the enemy strikes with enemy_damage."""
+        if not escaped:
+            self.player.health -= enemy_damage
+        self.report_flee(escaped, enemy_damage)
+
+    def report_flee(self, escaped, enemy_damage):
+        """Describe an escape attempt whose damage has already been taken off the player."""
+        enemy = self.current_enemy
+        if escaped:
+            self._emit(f"\nYou successfully escape from the {enemy.name}!", "warning")
+            self.current_enemy = None
+            return
+        self._emit(f"\nYou fail to escape from the {enemy.name}!", "danger")
+        self._report_enemy_turn(enemy_damage)
+
+    def _enemy_turn(self, damage):
+        """Let the current enemy strike back."""
+        self.player.health -= damage
+        self._report_enemy_turn(damage)
+
+    def _report_enemy_turn(self, damage):
+        enemy = self.current_enemy
+        self._emit(f"\nThe {enemy.name} attacks you for {damage} damage!", "danger")
+        self._emit(f"Your health: {self.player.health}/{self.player.max_health}")
+        self._emit_status()
+
+    def handle_enemy_defeat(self, enemy):
+        """Handle enemy defeat rewards and educational content"""
+        # Award some health for winning
+        health_gain = self.rng.randint(5, 15)
+        self.player.health = min(self.player.max_health, self.player.health + health_gain)
+        self._emit(f"You recovered {health_gain} health points from the victory!", "success")
+        self._emit(f"Current health: {self.player.health}/{self.player.max_health}")
+        self._emit_status()
+
+        # Educational content based on enemy type
+        if "mutated" in enemy.id:
+            self.update_objective("document_mutations", 1)
+            self._emit("\nEDUCATIONAL NOTE:\nYou've documented evidence of genetic mutations caused by chemical pollution.\nMarine life exposed to toxic chemicals can develop deformities and behavioral changes.", "note")
+            self.player.add_journal_entry(f"Encountered {enemy.name}. The mutations appear to be caused by chemical waste exposure.")
+        elif "plastic" in enemy.id:
+            self.update_objective("map_pollution", 1)
+            self._emit("\nEDUCATIONAL NOTE:\nPlastic waste takes hundreds of years to decompose in marine environments.\nMany animals mistake plastic fragments for food, leading to starvation and death.", "note")
+
+        # Check for item drops (70% chance of getting loot)
+        if self.rng.random() < 0.7:
+            loot_options = []
+            if "angler" in enemy.id:
+                loot_options = ["fish_tissue", "water_sample"]
+            elif "plastic" in enemy.id:
+                loot_options = ["plastic_sample", "water_sample"]
+            elif "chemical" in enemy.id:
+                loot_options = ["chemical_sample"]
+            elif "bloom" in enemy.id:
+                loot_options = ["corrupted_tissue"]
+
+            if loot_options:
+                loot_id = self.rng.choice(loot_options)
+                loot_item = get_item_by_id(loot_id)
+                if loot_item:
+                    self._emit(f"\nThe {enemy.name} dropped: {loot_item.name}", "warning")
+                    self.current_location.add_item(loot_item)
+                    if "sample" in loot_id or "tissue" in loot_id:
+                        self.update_objective("collect_samples", 1)
+
+        self.steps_since_combat = 0
+
+    # ------------------------------------------------------------------
+    # End of game
+    # ------------------------------------------------------------------
+
+    def _check_end_conditions(self):
+        if not self.game_running:
+            return
+        if self.player.health <= 0:
+            self.game_running = False
+            self.outcome = "dead"
+            self.current_enemy = None
+            self._emit("\nYou have succumbed to the depths...", "danger")
+            self._emit(DEATH_ENDING, "danger", kind=OutputEvent.GAME_OVER)
+        elif self.check_win_condition():
+            self.game_running = False
+            self.outcome = "won"
+            self.main_objective["completed"] = True
+            self._emit("\nYOU WIN!", "success")
+            self._emit(WIN_ENDING, "success", kind=OutputEvent.WIN)
@@ -3,43 +3,89 @@ Game state module for The Deep game.
 Manages the game world, locations, and state.
 """
 
-from world.locations import initialize_locations
+from world.locations import Location, get_world_template
+from world.routes import RouteTable
 
 class GameState:
-    """Manages the game world state, including locations and game progression."""
-    
-    def __init__(self):
-        """Initialize the game state with all locations."""
-        self.locations = initialize_locations()
-        
+    """Manages the game world state, including locations and game progression.
+
+    Locations are copy-on-write: rooms the game hasn't entered or changed are
+    read from the shared world template, and a room gets its own Location the
+    first time it is entered. self.locations only holds those copies.
+
+    get_location() is for reading and may return a LocationTemplate, which has
+    the same attributes as a Location but can't be changed. Use
+    enter_location() for a room the game is going to change.
+    """
+
+    def __init__(self, world=None):
+        """Initialize the game state on the shared world template."""
+        self.world = world or get_world_template()
+        self.locations = {}  # Location ID -> this game's own Location, for rooms it has touched
+        self._routes = self.world.routes
+        self._routes_key = ()  # Versions of this game's own rooms when _routes was chosen
+
         # Set the starting location
-        self.starting_location_id = "ship_deck"
-        self.current_location = self.get_location(self.starting_location_id)
-        
+        self.starting_location_id = self.world.starting_location_id
+        self.current_location = self.enter_location(self.starting_location_id)
+
         # Track game progression
         self.visited_locations = set()
         self.game_flags = {}
-        
+
     def get_location(self, location_id):
-        """Get a location by its ID."""
-        if location_id in self.locations:
-            return self.locations[location_id]
-        else:
-            # Return a default location if the ID is not found
-            return None
-            
+        """Get a location by its ID, for reading. Untouched rooms come from the shared template."""
+        location = self.locations.get(location_id)
+        if location is None:
+            # None if the ID is not found
+            location = self.world.locations.get(location_id)
+        return location
+
+    def enter_location(self, location_id):
+        """Get this game's own copy of a location, making it on first use. None if the ID is not found."""
+        location = self.locations.get(location_id)
+        if location is None:
+            template = self.world.locations.get(location_id)
+            if template is None:
+                return None
+            location = self.locations[location_id] = Location.from_template(template)
+        return location
+
+    @property
+    def routes(self):
+        """Routes between locations: the world's, unless this game has changed some exits."""
+        key = tuple((location_id, location.version) for location_id, location in self.locations.items())
+        if key != self._routes_key:
+            self._routes_key = key
+            templates = self.world.locations
+            if all(location.exits == templates[location_id].exits for location_id, location in self.locations.items()):
+                self._routes = self.world.routes
+            else:
+                self._routes = RouteTable({**templates, **self.locations})
+        return self._routes
+
+    def find_location(self, name):
+        """Find a location by its ID or (case-insensitive) name."""
+        name = name.strip().lower()
+        if name in self.world.locations:
+            return self.get_location(name)
+        for location_id, template in self.world.locations.items():
+            if template.name.lower() == name or location_id == name.replace(" ", "_"):
+                return self.get_location(location_id)
+        return None
+
     def set_flag(self, flag_name, value=True):
         """Set a game flag to track progression or events."""
         self.game_flags[flag_name] = value
-        
+
     def check_flag(self, flag_name):
         """Check if a game flag is set."""
         return self.game_flags.get(flag_name, False)
-        
+
     def mark_location_visited(self, location_id):
         """Mark a location as visited."""
         self.visited_locations.add(location_id)
-        
+
     def is_location_visited(self, location_id):
         """Check if a location has been visited."""
-        return location_id in self.visited_locations
\ No newline at end of file
+        return location_id in self.visited_locations
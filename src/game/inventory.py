@@ -0,0 +1,137 @@
+"""
+Inventory module for The Deep game.
+Holds the player's items indexed by ID and by name, with copies of the same
+item stacked together.
+"""
+
+def normalize_name(name):
+    """Normalize an item name or ID for lookups"""
+    return name.strip().lower()
+
+def _item_key(item):
+    # Story events may add plain strings, which key and display as themselves
+    return getattr(item, "id", None) or str(item)
+
+def _item_name(item):
+    return getattr(item, "name", None) or str(item)
+
+class Inventory:
+    """
+    Items grouped into stacks by ID. Lookups by ID or name are O(1) and
+    iteration yields every item in the order its stack was first added.
+    It can be used where the old inventory list was: append, remove,
+    iteration, len() and truth testing all behave the same way.
+    """
+    def __init__(self, items=None):
+        self._stacks = {}  # item ID -> list of items, in insertion order
+        self._names = {}   # normalized name -> IDs of the stacks with that name
+        self._count = 0
+        self.version = 0   # Bumped on every change so callers can cache derived data
+        for item in items or ():
+            self.add(item)
+
+    def add(self, item):
+        """Add an item, stacking it with other copies of the same item"""
+        key = _item_key(item)
+        stack = self._stacks.get(key)
+        if stack is None:
+            self._stacks[key] = [item]
+            self._names.setdefault(normalize_name(_item_name(item)), []).append(key)
+        else:
+            stack.append(item)
+        self._count += 1
+        self.version += 1
+
+    append = add
+
+    def remove(self, item):
+        """Remove this exact item. Raises ValueError if it isn't held."""
+        key = _item_key(item)
+        stack = self._stacks.get(key)
+        if stack is None:
+            raise ValueError(f"{_item_name(item)} is not in the inventory")
+        for i in range(len(stack) - 1, -1, -1):
+            if stack[i] is item:
+                del stack[i]
+                break
+        else:
+            raise ValueError(f"{_item_name(item)} is not in the inventory")
+        if not stack:
+            self._drop_stack(key, item)
+        self._count -= 1
+        self.version += 1
+
+    def take(self, key):
+        """Remove and return one item matching an ID or name, or None"""
+        item_id = self._resolve(key)
+        if item_id is None:
+            return None
+        stack = self._stacks[item_id]
+        item = stack.pop()
+        if not stack:
+            self._drop_stack(item_id, item)
+        self._count -= 1
+        self.version += 1
+        return item
+
+    def get(self, key):
+        """Get one item matching an ID or name, or None"""
+        item_id = self._resolve(key)
+        return self._stacks[item_id][0] if item_id is not None else None
+
+    def has(self, key):
+        """Check for an item by ID or name"""
+        return self._resolve(key) is not None
+
+    def count(self, key):
+        """Number of copies held of an item, by ID or name"""
+        item_id = self._resolve(key)
+        return len(self._stacks[item_id]) if item_id is not None else 0
+
+    def stacks(self):
+        """Yield (item, count) for every stack, in insertion order"""
+        for stack in self._stacks.values():
+            yield stack[0], len(stack)
+
+    def clear(self):
+        """Remove every item"""
+        self._stacks.clear()
+        self._names.clear()
+        self._count = 0
+        self.version += 1
+
+    def _resolve(self, key):
+        if key in self._stacks:
+            return key
+        normalized = normalize_name(key)
+        if normalized in self._stacks:
+            return normalized
+        item_ids = self._names.get(normalized)
+        return item_ids[0] if item_ids else None
+
+    def _drop_stack(self, item_id, item):
+        del self._stacks[item_id]
+        name = normalize_name(_item_name(item))
+        item_ids = self._names[name]
+        item_ids.remove(item_id)
+        if not item_ids:
+            del self._names[name]
+
+    def __contains__(self, item):
+        if isinstance(item, str):
+            return self.has(item)
+        stack = self._stacks.get(_item_key(item))
+        return stack is not None and any(held is item for held in stack)
+
+    def __iter__(self):
+        for stack in list(self._stacks.values()):
+            yield from list(stack)
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def __repr__(self):
+        return f"<Inventory {self._count} items in {len(self._stacks)} stacks>"
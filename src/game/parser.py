@@ -0,0 +1,199 @@
+"""
+Command parser for The Deep game.
+Resolves typed words against precompiled tries of verbs and of the item and
+location names in scope. Exact words and unique prefixes ("n", "ex knife")
+resolve in time proportional to the input; anything else gets bounded
+edit-distance suggestions.
+"""
+
+# Standard one-letter abbreviations that would otherwise be ambiguous prefixes.
+# "s" is not here because it already means "samples".
+VERB_ALIASES = {
+    "n": "north",
+    "e": "east",
+    "w": "west",
+    "u": "up",
+    "d": "down",
+    "x": "examine",
+    "l": "look",
+}
+
+# Verbs that end the game. They must be typed in full, so a stray "q" or a
+# typo can't quit by prefix or suggestion.
+EXACT_ONLY_VERBS = {"quit"}
+
+# How a word was resolved
+EXACT = "exact"
+PREFIX = "prefix"
+AMBIGUOUS = "ambiguous"
+FUZZY = "fuzzy"
+UNKNOWN = "unknown"
+
+def max_edit_distance(word):
+    """How many typos to tolerate in a word of this length"""
+    if len(word) <= 2:
+        return 0
+    if len(word) <= 4:
+        return 1
+    return 2
+
+class _Node:
+    __slots__ = ("children", "exact", "values")
+
+    def __init__(self):
+        self.children = {}
+        self.exact = None    # Values of the words ending at this node
+        self.values = set()  # Every value stored at or below this node
+
+class Trie:
+    """Prefix tree mapping words to values"""
+    def __init__(self):
+        self._root = _Node()
+
+    def insert(self, word, value):
+        """Store a value under a word"""
+        node = self._root
+        node.values.add(value)
+        for char in word:
+            node = node.children.setdefault(char, _Node())
+            node.values.add(value)
+        if node.exact is None:
+            node.exact = set()
+        node.exact.add(value)
+
+    def lookup(self, word):
+        """
+        Resolve a word or a prefix of one.
+
+        Returns:
+            tuple: (value or None, how, candidates). how is EXACT, PREFIX,
+                   AMBIGUOUS or UNKNOWN; candidates lists the values an
+                   ambiguous prefix could mean.
+        """
+        node = self._root
+        for char in word:
+            node = node.children.get(char)
+            if node is None:
+                return None, UNKNOWN, []
+        if node.exact is not None:
+            if len(node.exact) == 1:
+                return next(iter(node.exact)), EXACT, []
+            # The same word names several things, e.g. "sample"
+            return None, AMBIGUOUS, sorted(node.exact)
+        if len(node.values) == 1:
+            return next(iter(node.values)), PREFIX, []
+        return None, AMBIGUOUS, sorted(node.values)
+
+    def within_distance(self, word, max_distance):
+        """
+        Values of words within max_distance edits of word, closest first.
+        Walks the trie with one edit-distance row per node and prunes any
+        branch that can no longer come within range.
+        """
+        found = {}
+        columns = range(1, len(word) + 1)
+        first_row = list(range(len(word) + 1))
+        stack = [(child, char, first_row) for char, child in self._root.children.items()]
+        while stack:
+            node, char, previous = stack.pop()
+            left = previous[0] + 1
+            row = [left]
+            best = left
+            for i in columns:
+                diagonal = previous[i - 1] if word[i - 1] == char else previous[i - 1] + 1
+                left = min(left + 1, previous[i] + 1, diagonal)
+                row.append(left)
+                if left < best:
+                    best = left
+            if node.exact is not None and left <= max_distance:
+                for value in node.exact:
+                    if left < found.get(value, max_distance + 1):
+                        found[value] = left
+            if best <= max_distance:
+                stack.extend((child, next_char, row) for next_char, child in node.children.items())
+        return [value for value, distance in sorted(found.items(), key=lambda pair: (pair[1], pair[0]))]
+
+class Vocabulary:
+    """A set of words in a trie, resolved exactly, by unique prefix or by suggestion"""
+    def __init__(self, entries=(), labels=None, exact_only=()):
+        """
+        Args:
+            entries: (word, value) pairs; several words may map to one value
+            labels (dict): Value -> text used when suggesting it (defaults to the value)
+            exact_only: (word, value) pairs that only resolve when typed in
+                        full and are never offered as prefixes or suggestions
+        """
+        self._trie = Trie()
+        self.labels = dict(labels or {})
+        self._exact_only = dict(exact_only)
+        # Typos tend to repeat, so remember what they matched. Bounded, and
+        # only ever holds what the trie would compute anyway.
+        self._suggestions = {}
+        for word, value in entries:
+            self._trie.insert(word, value)
+
+    def resolve(self, word):
+        """
+        Returns:
+            tuple: (value or None, how, candidates); on FUZZY or AMBIGUOUS the
+                   candidates are the values the player might have meant
+        """
+        value = self._exact_only.get(word)
+        if value is not None:
+            return value, EXACT, []
+        value, how, candidates = self._trie.lookup(word)
+        if how == UNKNOWN:
+            candidates = self._suggestions.get(word)
+            if candidates is None:
+                if len(self._suggestions) >= 256:
+                    self._suggestions.clear()
+                candidates = self._trie.within_distance(word, max_edit_distance(word))
+                self._suggestions[word] = candidates
+            if candidates:
+                how = FUZZY
+        return value, how, candidates
+
+    def label(self, value):
+        return self.labels.get(value, value)
+
+    def describe(self, candidates, limit=3):
+        """Format candidates as "'a', 'b' or 'c'" for a prompt"""
+        names = [f"'{self.label(value)}'" for value in candidates[:limit]]
+        if len(names) == 1:
+            return names[0]
+        return ", ".join(names[:-1]) + " or " + names[-1]
+
+# Verb vocabularies by verb list, shared by every game with the same
+# commands. Their words never change once built; the only thing that does is
+# the bounded suggestion cache, which holds the same answers for every game.
+_VERB_VOCABULARIES = {}
+
+def verb_vocabulary(verbs):
+    """Vocabulary over command verbs plus any aliases for them"""
+    key = tuple(verbs)
+    vocabulary = _VERB_VOCABULARIES.get(key)
+    if vocabulary is None:
+        entries = [(verb, verb) for verb in key if verb not in EXACT_ONLY_VERBS]
+        entries.extend((alias, verb) for alias, verb in VERB_ALIASES.items() if verb in key and alias not in key)
+        exact_only = [(verb, verb) for verb in key if verb in EXACT_ONLY_VERBS]
+        vocabulary = _VERB_VOCABULARIES[key] = Vocabulary(entries, exact_only=exact_only)
+    return vocabulary
+
+def noun_vocabulary(things):
+    """
+    Vocabulary over named things such as items or locations.
+
+    Args:
+        things: Objects with id and name attributes; each resolves to its id
+    """
+    entries = []
+    labels = {}
+    for thing in things:
+        labels[thing.id] = thing.name
+        entries.append((thing.id, thing.id))
+        # Every trailing run of words names the thing too, so "log" and
+        # "research log" both find "Dr. Elson's Research Log"
+        words = thing.name.lower().split()
+        for start in range(len(words)):
+            entries.append((" ".join(words[start:]), thing.id))
+    return Vocabulary(entries, labels)
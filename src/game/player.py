@@ -4,6 +4,11 @@ This is a reference file that imports the Player class from its actual location.
 """
 
 import random  # Add missing import for random.randint
+from game.inventory import Inventory
+
+# Balance numbers, also read by the balance simulator (sim.balance)
+STARTING_HEALTH = 100
+ATTACK_DAMAGE = (5, 15)  # Base damage range before the weapon bonus
 
 try:
     # Try importing from player package
@@ -14,17 +19,17 @@ except ModuleNotFoundError:
         """Player class for the game."""
         def __init__(self, name):
             self.name = name
-            self.health = 100
-            self.max_health = 100
-            self.inventory = []
+            self.health = STARTING_HEALTH
+            self.max_health = STARTING_HEALTH
+            self.inventory = Inventory()
             self.journal = []
             self.samples = []
             self.current_location = None  # Track current location
             self.equipped_weapon = None   # Track equipped weapon
             
-        def attack(self):
+        def attack(self, rng=random):
             """Return damage for an attack, including weapon bonus"""
-            base_damage = random.randint(5, 15)
+            base_damage = rng.randint(*ATTACK_DAMAGE)
             weapon_bonus = 0
             
             # Add weapon damage if equipped
@@ -37,7 +42,11 @@ except ModuleNotFoundError:
             """Return inventory as string"""
             if not self.inventory:
                 return "Your inventory is empty."
-            return "Inventory:\n" + "\n".join([f"- {item.name}" for item in self.inventory])
+            lines = []
+            for item, count in self.inventory.stacks():
+                name = getattr(item, "name", item)
+                lines.append(f"- {name} (x{count})" if count > 1 else f"- {name}")
+            return "Inventory:\n" + "\n".join(lines)
             
         def read_journal(self):
             """Return journal entries as string"""
@@ -67,24 +76,15 @@ except ModuleNotFoundError:
             
         def has_item(self, item_name):
             """Check if player has an item with the given name"""
-            for item in self.inventory:
-                if item.name.lower() == item_name.lower():
-                    return True
-            return False
+            return self.inventory.has(item_name)
             
         def get_item(self, item_name):
             """Get an item from inventory by name"""
-            for item in self.inventory:
-                if item.name.lower() == item_name.lower():
-                    return item
-            return None
+            return self.inventory.get(item_name)
             
         def remove_item(self, item_name):
             """Remove an item from inventory by name"""
-            for i, item in enumerate(self.inventory):
-                if item.name.lower() == item_name.lower():
-                    return self.inventory.pop(i)
-            return None
+            return self.inventory.take(item_name)
             
         def heal(self, amount):
             """Heal the player by the specified amount"""
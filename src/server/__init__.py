@@ -0,0 +1,6 @@
+"""
+Network front-ends for The Deep game. Run them from the src directory, e.g.
+    python -m server.text_server --port 4000
+    python -m server.supervisor --workers 4 --port 4000
+    python -m server.loadgen --sessions 2000 --active 200
+"""
@@ -0,0 +1,165 @@
+"""
+Load generator for the text server.
+Opens many connections to a server: most sit idle at the prompt and some
+play by sending commands at a steady pace. Reports command latency and
+throughput, and can start a server in the same process to test locally.
+
+    python -m server.loadgen --sessions 2000 --active 200 --duration 10
+
+Against a supervisor's pool, split the clients over several processes so
+the load generator isn't the bottleneck:
+
+    python -m server.loadgen --remote --port 4000 --processes 4 --sessions 8000 --active 2000
+"""
+
+import time
+import random
+import asyncio
+import multiprocessing
+from server.text_server import TextServer, PROMPT, freeze_shared_state
+
+PROMPT_BYTES = PROMPT.encode("utf-8")
+
+COMMANDS = ("look", "north", "south", "east", "west", "up", "down", "down", "take all",
+            "inventory", "attack", "attack", "attack", "flee", "use medkit", "objectives")
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.connected = 0
+        self.failed = 0
+        self.games_over = 0
+
+    def merge(self, other):
+        self.latencies.extend(other.latencies)
+        self.connected += other.connected
+        self.failed += other.failed
+        self.games_over += other.games_over
+
+    def percentile(self, fraction):
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+async def _client(host, port, index, active, interval, stop_at, stats):
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        stats.failed += 1
+        return
+    try:
+        await reader.readuntil(PROMPT_BYTES)
+        writer.write(f"load{index}\n".encode())
+        await reader.readuntil(PROMPT_BYTES)
+        stats.connected += 1
+        rng = random.Random(index)
+        if not active:
+            # Idle until the end of the run, holding the connection open
+            await asyncio.sleep(max(0.0, stop_at - time.monotonic()))
+            return
+        # Spread active clients out so they don't all send at once
+        await asyncio.sleep(rng.random() * interval)
+        while time.monotonic() < stop_at:
+            sent = time.perf_counter()
+            writer.write(f"{rng.choice(COMMANDS)}\n".encode())
+            try:
+                await reader.readuntil(PROMPT_BYTES)
+            except asyncio.IncompleteReadError:
+                stats.games_over += 1  # The game ended and the server closed the connection
+                return
+            stats.latencies.append(time.perf_counter() - sent)
+            await asyncio.sleep(interval)
+    except (OSError, asyncio.IncompleteReadError):
+        stats.failed += 1
+    finally:
+        writer.close()
+
+async def run(host="127.0.0.1", port=None, sessions=1000, active=100, interval=0.05, duration=10.0,
+              local=True, connect_rate=500, first_index=0):
+    """
+    Drive a server with sessions connections, active of which send a command every interval seconds.
+
+    Args:
+        local (bool): Start a server in this process (on a free port if port is None)
+        connect_rate (int): New connections opened per second
+        first_index (int): Number of the first client, so several load generators use different names
+
+    Returns:
+        Stats: Latencies and connection counts
+    """
+    server = None
+    if local:
+        server = TextServer(host, port or 0, max_sessions=sessions + 1, color=False)
+        await server.start()
+        port = server.port
+
+    stats = Stats()
+    ramp = sessions / connect_rate
+    stop_at = time.monotonic() + ramp + duration
+    tasks = []
+    for index in range(sessions):
+        tasks.append(asyncio.ensure_future(
+            _client(host, port, first_index + index, index < active, interval, stop_at, stats)))
+        if index % 50 == 49:
+            await asyncio.sleep(50 / connect_rate)
+    await asyncio.gather(*tasks)
+
+    if server is not None:
+        print(f"Server ran {server.actions_run:,} actions in {server.ticks:,} ticks "
+              f"({server.actions_run / max(1, server.ticks):.1f} per tick)")
+        await server.close()
+    return stats
+
+def _run_remote(args):
+    # Runs in a child process: one share of the clients
+    host, port, sessions, active, interval, duration, connect_rate, first_index = args
+    return asyncio.run(run(host, port, sessions, active, interval, duration, local=False,
+                           connect_rate=connect_rate, first_index=first_index))
+
+def run_processes(processes, host, port, sessions, active, interval, duration, connect_rate=500):
+    """Drive a running server from several processes and combine their stats"""
+    shares = [(host, port, sessions // processes, active // processes, interval, duration,
+               connect_rate / processes, i * (sessions // processes)) for i in range(processes)]
+    stats = Stats()
+    with multiprocessing.get_context("spawn").Pool(processes) as pool:
+        for share in pool.map(_run_remote, shares):
+            stats.merge(share)
+    return stats
+
+def main():
+    import argparse
+    import resource
+
+    parser = argparse.ArgumentParser(description="Load test the text server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="Port of a running server; without --remote a local one is started")
+    parser.add_argument("--remote", action="store_true", help="Connect to a server that is already running")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--active", type=int, default=100, help="Sessions that send commands; the rest stay idle")
+    parser.add_argument("--interval", type=float, default=0.05, help="Seconds between commands of an active session")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--processes", type=int, default=1, help="Client processes to spread a --remote run over")
+    args = parser.parse_args()
+
+    # Each session needs a socket, twice over when the server runs in this process
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = min(hard, args.sessions * 2 + 100)
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+    if not args.remote:
+        freeze_shared_state()
+    begin = time.perf_counter()
+    if args.remote and args.processes > 1:
+        stats = run_processes(args.processes, args.host, args.port, args.sessions, args.active,
+                              args.interval, args.duration)
+    else:
+        stats = asyncio.run(run(args.host, args.port, args.sessions, args.active, args.interval,
+                                args.duration, local=not args.remote))
+    elapsed = time.perf_counter() - begin
+    print(f"{stats.connected} sessions connected, {stats.failed} failed, {stats.games_over} games ended")
+    print(f"{len(stats.latencies):,} commands in {elapsed:.1f}s ({len(stats.latencies) / args.duration:,.0f}/s); "
+          f"latency p50 {stats.percentile(0.5) * 1000:.2f}ms, p99 {stats.percentile(0.99) * 1000:.2f}ms, "
+          f"max {stats.percentile(1.0) * 1000:.2f}ms")
+
+if __name__ == "__main__":
+    main()
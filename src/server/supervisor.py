@@ -0,0 +1,314 @@
+"""
+Process pool for the text server.
+One Python process can only run one session's turn at a time, so the
+supervisor spreads sessions over worker processes, each with its own
+session table and tick loop. The supervisor accepts every connection and
+asks for the player's name. A consistent-hash ring over the workers then
+picks the worker that owns that name, and the connected socket is handed
+to it (Unix only).
+
+Routing is sticky: the same name always reaches the same worker while the
+pool is unchanged. When workers are added or removed, only the names whose
+owner changed are affected. Their sessions move to the new owner as
+snapshots in the save file format, together with the socket, so players
+carry on mid-game without noticing.
+
+    python -m server.supervisor [--workers N] [--host HOST] [--port PORT]
+"""
+
+import os
+import bisect
+import socket
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+from server.text_server import TextServer, BANNER, ASK_NAME, PROMPT, MAX_LINE, clean_name, strip_telnet, freeze_shared_state
+from utils.config import Config
+from utils.save_load import encode, decode, dumps, loads
+
+logger = logging.getLogger('the_deep.server.supervisor')
+
+# Largest control message; session snapshots are a few KB
+_MESSAGE_SIZE = 256 * 1024
+
+def _hash(key):
+    # Python's hash() differs between processes, so use a real digest
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+def routing_key(name):
+    """The key a player is routed by; names that share a save file share a worker"""
+    return name.strip().lower()
+
+class HashRing:
+    """Consistent hashing of keys onto nodes, with virtual nodes to even out the load"""
+    def __init__(self, nodes, replicas=64):
+        self.nodes = tuple(nodes)
+        points = sorted((_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(replicas))
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def lookup(self, key):
+        """The node that owns a key"""
+        if not self._nodes:
+            raise LookupError("The ring has no nodes")
+        i = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[i]
+
+def send_message(sock, message, fd=None):
+    """Send one control message, optionally passing a file descriptor along"""
+    data = encode(message)
+    if fd is None:
+        sock.send(data)
+    else:
+        socket.send_fds(sock, [data], [fd])
+
+def receive_message(sock):
+    """Receive one control message. Returns (message, fds), or (None, []) once the other end is gone."""
+    data, fds, _, _ = socket.recv_fds(sock, _MESSAGE_SIZE, 1)
+    if not data:
+        return None, []
+    return decode(data), fds
+
+# ----------------------------------------------------------------------
+# Worker processes
+# ----------------------------------------------------------------------
+
+class WorkerServer(TextServer):
+    """A TextServer that takes its connections from the supervisor instead of listening"""
+    def __init__(self, worker_id, control, workers):
+        super().__init__(color=True)
+        self.worker_id = worker_id
+        self.control = control
+        self.ring = HashRing(workers)
+        self.stopping = False
+        self._done = None
+
+    async def run(self):
+        self._done = asyncio.get_running_loop().create_future()
+        await self.start(listen=False)
+        asyncio.get_running_loop().add_reader(self.control.fileno(), self._on_control)
+        await self._done
+        await self.close()
+
+    def _on_control(self):
+        try:
+            message, fds = receive_message(self.control)
+        except OSError:
+            message, fds = None, []
+        if message is None:
+            # The supervisor has gone, so there is nobody left to serve
+            asyncio.get_running_loop().remove_reader(self.control.fileno())
+            self._finish()
+            return
+
+        op = message["op"]
+        if op == "session":
+            sock = socket.socket(fileno=fds[0])
+            snapshot = loads(message["snapshot"], "migrated session") if message["snapshot"] else None
+            asyncio.ensure_future(self.adopt(sock, message["name"], message["pending"], snapshot))
+        elif op == "ring":
+            self.ring = HashRing(message["workers"])
+            for session in list(self.sessions):
+                if session.name is not None and self.ring.lookup(routing_key(session.name)) != self.worker_id:
+                    session.request_migration()
+        elif op == "stop":
+            # Hand every session to the rest of the pool, then exit
+            self.stopping = True
+            for session in list(self.sessions):
+                session.request_migration()
+            self._check_stopped()
+        elif op == "stats":
+            send_message(self.control, {"op": "stats", "worker": self.worker_id, "sessions": len(self.sessions),
+                                        "actions": self.actions_run, "ticks": self.ticks})
+
+    async def migrate(self, session):
+        """Send a session's game and connection to the supervisor for its new owner"""
+        fd, pending = await session.detach()
+        try:
+            send_message(self.control, {"op": "migrated", "name": session.name, "pending": pending,
+                                        "snapshot": dumps(session.core.snapshot())}, fd)
+        finally:
+            os.close(fd)
+        logger.info(f"Worker {self.worker_id} handed over {session.name}")
+        asyncio.get_running_loop().call_soon(self._check_stopped)
+
+    def _check_stopped(self):
+        if self.stopping and not self.sessions:
+            self._finish()
+
+    def _finish(self):
+        if not self._done.done():
+            self._done.set_result(None)
+
+def worker_main(worker_id, control, workers):
+    """Entry point of a worker process"""
+    logging.basicConfig(level=logging.INFO, format=f'%(asctime)s - worker {worker_id} - %(name)s - %(levelname)s - %(message)s')
+    control.setblocking(True)
+    freeze_shared_state()
+    asyncio.run(WorkerServer(worker_id, control, workers).run())
+
+# ----------------------------------------------------------------------
+# Supervisor
+# ----------------------------------------------------------------------
+
+class Supervisor:
+    """Accepts connections and routes each one to the worker that owns the player"""
+    def __init__(self, workers=None, host=None, port=None):
+        self.host = host or Config.SERVER_HOST
+        self.port = Config.SERVER_PORT if port is None else port
+        self.initial_workers = workers or os.cpu_count() or 1
+        self.workers = {}  # worker ID -> (process, control socket)
+        self.ring = None
+        self.routed = 0
+        self.migrated = 0
+        self._next_id = 0
+        self._listener = None
+        self._accept_task = None
+        self._stats = None
+        self._stats_waiting = None
+
+    async def start(self):
+        """Start the workers and begin accepting connections"""
+        await self.resize(self.initial_workers)
+        self._listener = socket.create_server((self.host, self.port), backlog=1024)
+        self._listener.setblocking(False)
+        self.port = self._listener.getsockname()[1]
+        self._accept_task = asyncio.ensure_future(self._accept_loop())
+        logger.info(f"Supervisor listening on {self.host}:{self.port} with {len(self.workers)} workers")
+
+    async def serve_forever(self):
+        await self.start()
+        await self._accept_task
+
+    async def close(self):
+        """Stop accepting and shut every worker down, ending their sessions"""
+        if self._accept_task is not None:
+            self._accept_task.cancel()
+            self._listener.close()
+        loop = asyncio.get_running_loop()
+        for process, control in self.workers.values():
+            loop.remove_reader(control.fileno())
+            control.close()  # Workers exit when their control socket closes
+        for process, _ in self.workers.values():
+            await loop.run_in_executor(None, process.join, 10)
+        self.workers.clear()
+
+    async def resize(self, count):
+        """
+        Grow or shrink the pool to count workers. Sessions whose owner
+        changes are moved to it; removed workers exit once they are empty.
+        """
+        loop = asyncio.get_running_loop()
+        ids = sorted(self.workers)
+        while len(ids) < count:
+            ids.append(self._next_id)
+            self._next_id += 1
+        keep, remove = ids[:count], ids[count:]
+        self.ring = HashRing(keep)
+
+        context = multiprocessing.get_context("spawn")
+        for worker_id in keep:
+            if worker_id in self.workers:
+                send_message(self.workers[worker_id][1], {"op": "ring", "workers": list(keep)})
+                continue
+            ours, theirs = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+            process = context.Process(target=worker_main, args=(worker_id, theirs, list(keep)),
+                                      name=f"deep-worker-{worker_id}", daemon=True)
+            process.start()
+            theirs.close()
+            ours.setblocking(True)
+            self.workers[worker_id] = (process, ours)
+            loop.add_reader(ours.fileno(), self._on_worker_message, worker_id)
+        for worker_id in remove:
+            send_message(self.workers[worker_id][1], {"op": "stop"})
+
+    async def stats(self):
+        """Ask every worker for its session and action counts"""
+        self._stats = {}
+        waiting = asyncio.get_running_loop().create_future()
+        self._stats_waiting = (waiting, len(self.workers))
+        for _, control in self.workers.values():
+            send_message(control, {"op": "stats"})
+        await asyncio.wait_for(waiting, 10)
+        return [self._stats[worker_id] for worker_id in sorted(self._stats)]
+
+    def _on_worker_message(self, worker_id):
+        process, control = self.workers[worker_id]
+        try:
+            message, fds = receive_message(control)
+        except OSError:
+            message, fds = None, []
+        if message is None:
+            # The worker exited, after a stop or by crashing
+            asyncio.get_running_loop().remove_reader(control.fileno())
+            control.close()
+            del self.workers[worker_id]
+            if worker_id in self.ring.nodes:
+                logger.error(f"Worker {worker_id} exited unexpectedly; its sessions are lost")
+                self.ring = HashRing([node for node in self.ring.nodes if node != worker_id])
+            return
+
+        if message["op"] == "migrated":
+            try:
+                owner = self.ring.lookup(routing_key(message["name"]))
+                message["op"] = "session"
+                send_message(self.workers[owner][1], message, fds[0])
+                self.migrated += 1
+            finally:
+                os.close(fds[0])
+        elif message["op"] == "stats":
+            self._stats[message["worker"]] = message
+            waiting, expected = self._stats_waiting
+            if len(self._stats) >= expected and not waiting.done():
+                waiting.set_result(None)
+
+    async def _accept_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            conn, _ = await loop.sock_accept(self._listener)
+            asyncio.ensure_future(self._route(conn))
+
+    async def _route(self, conn):
+        """Ask for the player's name and pass the connection to its worker"""
+        loop = asyncio.get_running_loop()
+        try:
+            conn.setblocking(False)
+            await loop.sock_sendall(conn, (BANNER + ASK_NAME + PROMPT).replace("\n", "\r\n").encode("utf-8"))
+            data = b""
+            while b"\n" not in data:
+                chunk = await asyncio.wait_for(loop.sock_recv(conn, MAX_LINE), Config.SERVER_IDLE_TIMEOUT)
+                if not chunk or len(data) + len(chunk) > MAX_LINE:
+                    return
+                data += chunk
+            line, _, pending = data.partition(b"\n")
+            name = clean_name(strip_telnet(line).decode("utf-8", "replace"))
+            owner = self.ring.lookup(routing_key(name))
+            send_message(self.workers[owner][1], {"op": "session", "name": name, "pending": pending, "snapshot": None},
+                         conn.fileno())
+            self.routed += 1
+        except LookupError:
+            logger.error("No workers to route a connection to")
+        except (OSError, asyncio.TimeoutError) as e:
+            logger.info(f"Connection dropped before it was routed: {str(e)}")
+        finally:
+            conn.close()
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Host The Deep on a pool of worker processes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--host", default=Config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=Config.SERVER_PORT)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    supervisor = Supervisor(args.workers, args.host, args.port)
+    try:
+        asyncio.run(supervisor.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+Text server for The Deep game.
+An asyncio TCP server that plays telnet-compatible text sessions: every
+connection drives its own headless GameCore. Reading a command is awaited
+instead of blocking a thread, so idle connections cost only their game.
+
+Commands from every session are run by one tick loop, which passes busy ticks
+through a CombatBatch so the fights of all their sessions are resolved
+together. Each turn's output is written in one piece. A session doesn't
+read its next command until the client has taken its output, and clients
+that stop reading altogether are dropped.
+
+    python -m server.text_server [--host HOST] [--port PORT]
+"""
+
+import gc
+import os
+import re
+import asyncio
+import logging
+from game.combat import CombatBatch, MIN_ARRAY_BATCH
+from game.core import GameCore, OutputEvent
+from game.player import Player
+from utils.config import Config
+from utils.save_load import get_background_saver
+from ui.styles import style_text
+
+logger = logging.getLogger('the_deep.server')
+
+PROMPT = "\r\n> "
+MAX_LINE = 512  # Longest command accepted, in bytes
+
+# Telnet protocol bytes
+IAC, SB, SE = 255, 250, 240
+NEGOTIATION = (251, 252, 253, 254)  # WILL, WONT, DO, DONT
+
+BANNER = """
+==============================
+ THE DEEP - multiplayer server
+==============================
+Every diver explores their own copy of the ocean.
+Type 'help' at any time for a list of commands.
+"""
+ASK_NAME = "\nWhat is your name, diver?"
+
+class SessionClosed(Exception):
+    """Raised when a client disconnects, goes idle or stops reading"""
+
+def strip_telnet(data):
+    """Remove telnet negotiation from received bytes"""
+    if IAC not in data:
+        return data
+    out = bytearray()
+    i = 0
+    end = len(data)
+    while i < end:
+        byte = data[i]
+        following = data[i + 1] if i + 1 < end else None
+        if byte != IAC:
+            out.append(byte)
+            i += 1
+        elif following == IAC:
+            out.append(IAC)  # An escaped 255 byte
+            i += 2
+        elif following == SB:
+            close = data.find(bytes((IAC, SE)), i + 2)
+            i = end if close < 0 else close + 2
+        elif following in NEGOTIATION:
+            i += 3
+        else:
+            i += 2
+    return bytes(out)
+
+def clean_name(line):
+    """A player name from what the client typed"""
+    return line[:32].strip() or "Explorer"
+
+def save_path_for(name):
+    """Save file of a player, so players don't overwrite each other's saves"""
+    safe_name = re.sub(r"[^a-z0-9_-]", "_", name.lower())[:32] or "explorer"
+    return os.path.join(Config.SERVER_SAVE_DIRECTORY, f"{safe_name}.sav")
+
+def freeze_shared_state():
+    """
+    Load the game content and shared tables, then take everything alive out
+    of the garbage collector's view so full collections only walk sessions.
+    Also collects less often, since every tick replaces the events of every
+    session at once. Affects the whole process, so only call it from an
+    entry point.
+    """
+    GameCore(Player("Explorer")).start()
+    gc.collect()
+    gc.freeze()
+    gc.set_threshold(Config.SERVER_GC_THRESHOLD, *gc.get_threshold()[1:])
+
+def render(events, color=True):
+    """Turn core events into text for a telnet client"""
+    lines = []
+    for event in events:
+        if event.kind == OutputEvent.STATUS or not event.text:
+            continue
+        lines.append(style_text(event.text, event.style) if color else event.text)
+    return "\n".join(lines).replace("\n", "\r\n")
+
+class Session:
+    """One connection and the game it is playing"""
+    def __init__(self, server, reader, writer):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.core = None
+        self.name = None
+        self.task = None  # Task running this session
+        self.migrating = False  # Set when the session should move to another process
+        self._reading = False
+        self.peer = writer.get_extra_info("peername")
+        writer.transport.set_write_buffer_limits(high=Config.SERVER_OUTPUT_HIGH_WATER)
+
+    async def run(self, name=None, snapshot=None):
+        """
+        Play until the game ends or the client goes away.
+
+        Args:
+            name (str): Player name, if it was already asked for
+            snapshot (dict): Game to carry on with, for a session moved from another process
+        """
+        try:
+            if name is None:
+                await self.send(BANNER + ASK_NAME + PROMPT)
+                name = clean_name(await self.read_line())
+            self.name = name
+            self.core = GameCore(Player(name))
+            self.core.save_path = save_path_for(name)
+            if snapshot is None:
+                logger.info(f"{self.peer} started a game as {name} with seed {self.core.seed}")
+                await self.send(render(self.core.start(), self.server.color) + PROMPT)
+            else:
+                # The client is already at a prompt, so carry on without a word
+                self.core.restore(snapshot)
+
+            while self.core.game_running:
+                if self.migrating:
+                    await self.server.migrate(self)
+                    return
+                self._reading = True
+                try:
+                    line = await self.read_line()
+                except asyncio.CancelledError:
+                    if not self.migrating:
+                        raise
+                    await self.server.migrate(self)
+                    return
+                finally:
+                    self._reading = False
+                if self.core.wants_saved_game(line):
+                    # Reading the save waits on the disk, so keep it off the loop every session shares
+                    snapshot = await asyncio.get_running_loop().run_in_executor(None, self.core.read_saved_game)
+                    self.core.preload_saved_game(snapshot)
+                events = await self.server.submit(self.core, line)
+                text = render(events, self.server.color)
+                await self.send(text + (PROMPT if self.core.game_running else "\r\n"))
+        except SessionClosed as e:
+            logger.info(f"{self.peer} disconnected: {str(e)}")
+        except Exception:
+            logger.exception(f"Session for {self.peer} failed")
+            try:
+                await self.send("\r\nSomething went wrong with your game. Please reconnect.\r\n")
+            except SessionClosed:
+                pass
+        finally:
+            self.writer.close()
+
+    def request_migration(self):
+        """
+        Move this session to another process as soon as it is waiting for a
+        command. Only servers with a migrate(session) coroutine can ask this.
+        """
+        self.migrating = True
+        if self._reading:
+            self.task.cancel()
+
+    async def detach(self):
+        """
+        Hand the connection over for a move: returns a duplicate of the socket's
+        file descriptor and any input received but not yet read. The session's
+        own transport can then be closed without ending the connection.
+        """
+        # Input arriving from now on waits in the socket and moves with it.
+        # Ending the stream lets read() return what it has already buffered.
+        self.writer.transport.pause_reading()
+        self.reader.feed_eof()
+        pending = await self.reader.read()
+        sock = self.writer.get_extra_info("socket")
+        return os.dup(sock.fileno()), pending
+
+    async def read_line(self):
+        """Wait for the next command from the client"""
+        try:
+            data = await asyncio.wait_for(self.reader.readline(), Config.SERVER_IDLE_TIMEOUT)
+        except asyncio.TimeoutError:
+            await self.send("\r\nDisconnected after being idle for too long.\r\n")
+            raise SessionClosed("idle") from None
+        except (ValueError, asyncio.LimitOverrunError):
+            raise SessionClosed("line too long") from None
+        except ConnectionError as e:
+            raise SessionClosed(str(e)) from None
+        if not data:
+            raise SessionClosed("connection closed")
+        return strip_telnet(data).decode("utf-8", "replace").strip()
+
+    async def send(self, text):
+        """
+        Queue text for the client. Returns straight away unless the client
+        has more than SERVER_OUTPUT_HIGH_WATER bytes unread, in which case
+        it waits for the client to catch up.
+        """
+        if self.writer.is_closing():
+            raise SessionClosed("connection closed")
+        self.writer.write(text.encode("utf-8"))
+        try:
+            await asyncio.wait_for(self.writer.drain(), Config.SERVER_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise SessionClosed("not reading its output") from None
+        except ConnectionError as e:
+            raise SessionClosed(str(e)) from None
+
+class TextServer:
+    """Accepts connections and runs every session's commands in ticks"""
+    def __init__(self, host=None, port=None, max_sessions=None, color=True):
+        self.host = host or Config.SERVER_HOST
+        self.port = Config.SERVER_PORT if port is None else port
+        self.max_sessions = max_sessions or Config.SERVER_MAX_SESSIONS
+        self.color = color
+        self.sessions = set()
+        self.actions_run = 0
+        self.ticks = 0
+        self._queue = None
+        self._server = None
+        self._tick_task = None
+
+    async def start(self, listen=True):
+        """
+        Start the tick loop and, if listen is set, accept connections.
+        Returns once the server is ready.
+        """
+        self._queue = asyncio.Queue()
+        self._tick_task = asyncio.ensure_future(self._tick_loop())
+        if listen:
+            self._server = await asyncio.start_server(self._accept, self.host, self.port, limit=MAX_LINE, backlog=1024)
+            self.port = self._server.sockets[0].getsockname()[1]
+            logger.info(f"Text server listening on {self.host}:{self.port}")
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stop accepting connections and end every session"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        sessions = list(self.sessions)
+        for session in sessions:
+            session.task.cancel()
+        await asyncio.gather(*(session.task for session in sessions), return_exceptions=True)
+        self._tick_task.cancel()
+        # Let saves still being written in the background reach the disk
+        await asyncio.get_running_loop().run_in_executor(None, get_background_saver().flush)
+
+    async def _accept(self, reader, writer):
+        await self._run_session(reader, writer)
+
+    async def adopt(self, sock, name=None, pending=b"", snapshot=None):
+        """
+        Run a session on a connection accepted elsewhere.
+
+        Args:
+            sock: The connected socket
+            name (str): Player name, if it was already asked for
+            pending (bytes): Input already received from the client
+            snapshot (dict): Game to carry on with, for a session moved from another process
+        """
+        reader, writer = await asyncio.open_connection(sock=sock, limit=MAX_LINE)
+        if pending:
+            reader.feed_data(pending)
+        await self._run_session(reader, writer, name, snapshot)
+
+    async def _run_session(self, reader, writer, name=None, snapshot=None):
+        if len(self.sessions) >= self.max_sessions:
+            writer.write(b"The server is full. Please try again later.\r\n")
+            writer.close()
+            return
+        session = Session(self, reader, writer)
+        session.task = asyncio.current_task()
+        self.sessions.add(session)
+        try:
+            await session.run(name, snapshot)
+        except asyncio.CancelledError:
+            pass  # The server is shutting down
+        finally:
+            self.sessions.discard(session)
+
+    def submit(self, core, action):
+        """Queue an action for the next tick. Returns a future for its events."""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((core, action, future))
+        return future
+
+    async def _tick_loop(self):
+        batch = CombatBatch()
+        while True:
+            # Take everything that arrived since the last tick
+            queued = [await self._queue.get()]
+            while not self._queue.empty():
+                queued.append(self._queue.get_nowait())
+            self.ticks += 1
+
+            if len(queued) < MIN_ARRAY_BATCH:
+                # Too few to be worth batching, so run them as plain steps
+                for core, action, future in queued:
+                    try:
+                        future.set_result(core.step(action))
+                    except Exception as e:
+                        future.set_exception(e)
+                self.actions_run += len(queued)
+                continue
+
+            waiting = {}
+            for core, action, future in queued:
+                try:
+                    events = batch.submit(core, action)
+                except Exception as e:
+                    future.set_exception(e)
+                    continue
+                if events is None:
+                    waiting[core] = future
+                else:
+                    future.set_result(events)
+            try:
+                for core, events in batch.resolve():
+                    waiting.pop(core).set_result(events)
+            except Exception as e:
+                logger.exception("Combat batch failed")
+                for future in waiting.values():
+                    if not future.done():
+                        future.set_exception(e)
+            self.actions_run += len(queued)
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Host The Deep for many players over telnet")
+    parser.add_argument("--host", default=Config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=Config.SERVER_PORT)
+    parser.add_argument("--max-sessions", type=int, default=Config.SERVER_MAX_SESSIONS)
+    parser.add_argument("--no-color", action="store_true", help="Send plain text without ANSI colours")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    server = TextServer(args.host, args.port, args.max_sessions, color=not args.no_color)
+    freeze_shared_state()
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""
+Simulators for The Deep game. These need NumPy; run each one from the src
+directory, e.g.
+    python -m sim.balance
+"""
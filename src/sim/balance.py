@@ -0,0 +1,253 @@
+"""
+Combat balance simulator for The Deep game.
+Resolves many fights at once as NumPy arrays, one row per fight, for every
+combination of weapon, enemy and difficulty. It uses the same numbers as the
+game: Player.attack's damage range plus the weapon bonus, each enemy's attack
+range and health, the flee formula and Config.DIFFICULTY_LEVELS.
+
+The fighter attacks every turn. When the next hit could kill them, they use
+a healing item if they have one left, and otherwise try to flee. A
+difficulty scales enemy damage by its enemy_damage_multiplier and the
+number of healing items carried by its resource_spawn_rate.
+
+    python -m sim.balance [--fights N] [--seed S] [--heals N] [--no-flee]
+"""
+
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from game.combat import escape_chance
+from game.player import ATTACK_DAMAGE, STARTING_HEALTH
+from utils.config import Config
+from world.enemies import get_enemy_templates
+from world.items import WeaponItem, get_item_definition, get_item_definitions
+
+# How a fight ended
+ONGOING, WON, DIED, FLED, TIMED_OUT = range(5)
+
+# Fights resolved together; bounds memory use to a few hundred MB
+CHUNK_ROWS = 2_000_000
+
+def require_numpy():
+    """Raise a helpful error if NumPy isn't installed"""
+    if np is None:
+        raise RuntimeError("The balance simulator needs NumPy: pip install numpy")
+
+def weapon_bonuses():
+    """Weapon ID -> damage bonus, with None for fighting unarmed"""
+    bonuses = {None: 0}
+    for item_id, item in get_item_definitions().items():
+        if isinstance(item, WeaponItem):
+            bonuses[item_id] = item.damage_bonus
+    return bonuses
+
+class Matchup:
+    """One weapon/enemy/difficulty combination and the numbers that drive it"""
+    __slots__ = ("weapon", "enemy", "difficulty", "damage_bonus", "enemy_health",
+                 "enemy_min", "enemy_max", "damage_multiplier", "heals", "escape_chance")
+
+    def __init__(self, weapon, damage_bonus, template, difficulty, settings, healing_items):
+        self.weapon = weapon
+        self.enemy = template.id
+        self.difficulty = difficulty
+        self.damage_bonus = damage_bonus
+        self.enemy_health = template.max_health
+        self.enemy_min = template.attack_min
+        self.enemy_max = template.attack_max
+        self.damage_multiplier = settings["enemy_damage_multiplier"]
+        self.heals = int(healing_items * settings["resource_spawn_rate"])
+        self.escape_chance = escape_chance(template.threat_level)
+
+    def max_hit(self):
+        """The most damage the enemy can do in one attack"""
+        return int(round(self.enemy_max * self.damage_multiplier))
+
+def matchups(weapons=None, enemies=None, difficulties=None, healing_items=2):
+    """
+    Every combination to simulate.
+
+    Args:
+        weapons: Weapon IDs to include (None in the list means unarmed); default all
+        enemies: Enemy IDs to include; default all
+        difficulties: Difficulty names to include; default all
+        healing_items (int): Healing items carried at normal difficulty
+    """
+    bonuses = weapon_bonuses()
+    templates = get_enemy_templates()
+    levels = Config.DIFFICULTY_LEVELS
+    result = []
+    for weapon in (bonuses if weapons is None else weapons):
+        for enemy_id in (templates if enemies is None else enemies):
+            for difficulty in (levels if difficulties is None else difficulties):
+                result.append(Matchup(weapon, bonuses[weapon], templates[enemy_id], difficulty,
+                                      levels[difficulty], healing_items))
+    return result
+
+def _fight(rng, rows, matchup_of, params, player_health, heal_amount, flee, max_turns):
+    """Resolve one chunk of fights. Returns per-row outcome, turns, damage taken and heals used."""
+    bonus, enemy_health, enemy_min, enemy_max, multiplier, heals, escape, threshold = (
+        column[matchup_of] for column in params)
+    base_min, base_max = ATTACK_DAMAGE
+
+    health = np.full(rows, player_health, dtype=np.int32)
+    enemy_health = enemy_health.astype(np.int32)
+    heals_left = heals.astype(np.int32)
+    outcome = np.zeros(rows, dtype=np.int8)
+    turns = np.zeros(rows, dtype=np.int32)
+    taken = np.zeros(rows, dtype=np.int32)
+    used = np.zeros(rows, dtype=np.int32)
+
+    active = np.arange(rows)
+    for _ in range(max_turns):
+        if not active.size:
+            break
+        turns[active] += 1
+        in_danger = health[active] <= threshold[active]
+        healing = in_danger & (heals_left[active] > 0)
+        fleeing = in_danger & ~healing if flee else np.zeros(active.size, dtype=bool)
+        attacking = ~(healing | fleeing)
+
+        rows_healing = active[healing]
+        health[rows_healing] = np.minimum(health[rows_healing] + heal_amount, player_health)
+        heals_left[rows_healing] -= 1
+        used[rows_healing] += 1
+
+        rows_fleeing = active[fleeing]
+        escaped = rng.random(rows_fleeing.size) < escape[rows_fleeing]
+        outcome[rows_fleeing[escaped]] = FLED
+
+        rows_attacking = active[attacking]
+        damage = rng.integers(base_min, base_max + 1, rows_attacking.size, dtype=np.int32) + bonus[rows_attacking]
+        enemy_health[rows_attacking] -= damage
+        outcome[rows_attacking[enemy_health[rows_attacking] <= 0]] = WON
+
+        # Whoever is still fighting takes the enemy's turn
+        active = active[outcome[active] == ONGOING]
+        low, high = enemy_min[active], enemy_max[active]
+        hits = np.rint(rng.integers(low, high + 1) * multiplier[active]).astype(np.int32)
+        health[active] -= hits
+        taken[active] += hits
+        outcome[active[health[active] <= 0]] = DIED
+        active = active[outcome[active] == ONGOING]
+
+    outcome[active] = TIMED_OUT
+    return outcome, turns, taken, used
+
+def simulate(fights=20000, weapons=None, enemies=None, difficulties=None, healing_items=2,
+             heal_amount=None, player_health=STARTING_HEALTH, flee=True, seed=None, max_turns=200):
+    """
+    Simulate fights for every matchup.
+
+    Args:
+        fights (int): Fights per matchup
+        heal_amount (int): Health restored per healing item; defaults to the Medical Kit's
+        player_health (int): Health at the start of each fight (also the maximum)
+        flee (bool): Try to flee when out of healing items and in danger
+        seed: Seed for NumPy's generator, for repeatable results
+
+    Returns:
+        list: One dict of results per matchup (see summarize())
+    """
+    require_numpy()
+    if heal_amount is None:
+        heal_amount = get_item_definition("medkit").heal_amount
+    rng = np.random.default_rng(seed)
+    all_matchups = matchups(weapons, enemies, difficulties, healing_items)
+
+    results = []
+    per_chunk = max(1, CHUNK_ROWS // fights)
+    for start in range(0, len(all_matchups), per_chunk):
+        chunk = all_matchups[start:start + per_chunk]
+        params = tuple(np.array(column) for column in (
+            [m.damage_bonus for m in chunk],
+            [m.enemy_health for m in chunk],
+            [m.enemy_min for m in chunk],
+            [m.enemy_max for m in chunk],
+            [m.damage_multiplier for m in chunk],
+            [m.heals for m in chunk],
+            [m.escape_chance for m in chunk],
+            [m.max_hit() for m in chunk],
+        ))
+        matchup_of = np.repeat(np.arange(len(chunk)), fights)
+        columns = _fight(rng, matchup_of.size, matchup_of, params, player_health, heal_amount, flee, max_turns)
+        # Rows are grouped by matchup, so each one is a slice of fights rows
+        outcome, turns, taken, used = (column.reshape(len(chunk), fights) for column in columns)
+        for i, matchup in enumerate(chunk):
+            results.append(summarize(matchup, outcome[i], turns[i], taken[i], used[i]))
+    return results
+
+def summarize(matchup, outcome, turns, taken, used):
+    """Reduce one matchup's fights to rates, means and percentiles"""
+    fights = outcome.size
+    won = outcome == WON
+    kill_turns = turns[won]
+    p50, p90, p99 = np.percentile(taken, (50, 90, 99))
+    return {
+        "weapon": matchup.weapon,
+        "enemy": matchup.enemy,
+        "difficulty": matchup.difficulty,
+        "fights": fights,
+        "win_rate": won.mean(),
+        "death_rate": (outcome == DIED).mean(),
+        "flee_rate": (outcome == FLED).mean(),
+        "timeout_rate": (outcome == TIMED_OUT).mean(),
+        "escape_chance": matchup.escape_chance,
+        "turns_to_kill_mean": kill_turns.mean() if kill_turns.size else None,
+        "turns_to_kill_p90": np.percentile(kill_turns, 90) if kill_turns.size else None,
+        "damage_taken_mean": taken.mean(),
+        "damage_taken_p50": p50,
+        "damage_taken_p90": p90,
+        "damage_taken_p99": p99,
+        "heals_used_mean": used.mean(),
+        "heals_carried": matchup.heals,
+    }
+
+def format_results(results):
+    """Results as a text table"""
+    header = (f"{'weapon':<16}{'enemy':<19}{'difficulty':<11}{'win':>7}{'died':>7}{'fled':>7}"
+              f"{'ttk':>6}{'ttk90':>6}{'dmg':>7}{'dmg50':>6}{'dmg90':>6}{'dmg99':>6}{'heals':>7}")
+    lines = [header, "-" * len(header)]
+    for r in results:
+        heals = f"{r['heals_used_mean']:.2f}/{r['heals_carried']}"
+        ttk = f"{r['turns_to_kill_mean']:6.1f}{r['turns_to_kill_p90']:6.0f}" if r["turns_to_kill_mean"] is not None else f"{'-':>6}{'-':>6}"
+        lines.append(
+            f"{r['weapon'] or 'unarmed':<16}{r['enemy']:<19}{r['difficulty']:<11}"
+            f"{r['win_rate']:7.1%}{r['death_rate']:7.1%}{r['flee_rate']:7.1%}{ttk}"
+            f"{r['damage_taken_mean']:7.1f}{r['damage_taken_p50']:6.0f}{r['damage_taken_p90']:6.0f}"
+            f"{r['damage_taken_p99']:6.0f}{heals:>7}"
+        )
+    return "\n".join(lines)
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulate combat balance for The Deep")
+    parser.add_argument("--fights", type=int, default=20000, help="Fights per weapon/enemy/difficulty")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for repeatable results")
+    parser.add_argument("--heals", type=int, default=2, help="Healing items carried at normal difficulty")
+    parser.add_argument("--heal-amount", type=int, default=None, help="Health restored per healing item")
+    parser.add_argument("--health", type=int, default=STARTING_HEALTH, help="Player health at the start of a fight")
+    parser.add_argument("--no-flee", action="store_true", help="Never try to flee")
+    parser.add_argument("--enemy", action="append", help="Only simulate this enemy (repeatable)")
+    parser.add_argument("--difficulty", action="append", help="Only simulate this difficulty (repeatable)")
+    args = parser.parse_args()
+
+    try:
+        require_numpy()
+    except RuntimeError as e:
+        raise SystemExit(str(e))
+
+    begin = time.perf_counter()
+    results = simulate(args.fights, enemies=args.enemy, difficulties=args.difficulty, healing_items=args.heals,
+                       heal_amount=args.heal_amount, player_health=args.health, flee=not args.no_flee, seed=args.seed)
+    elapsed = time.perf_counter() - begin
+    print(format_results(results))
+    total = sum(r["fights"] for r in results)
+    print(f"\n{total:,} fights in {elapsed:.2f}s ({total / elapsed:,.0f} fights/s)")
+
+if __name__ == "__main__":
+    main()
@@ -28,7 +28,7 @@ class Consequence:
             player.mental_state += self.amount
             print(f"Your mental state has {'improved' if self.amount > 0 else 'deteriorated'}.")
 
-def generate_random_event():
+def generate_random_event(rng=random):
     events = [
         Event("You find a strange glowing coral that whispers secrets of the deep.", 
               [Consequence('mental_state', 1)]),
@@ -41,4 +41,4 @@ def generate_random_event():
         Event("A hallucination causes you to lose track of time, affecting your progress.", 
               [Consequence('mental_state', -3)]),
     ]
-    return random.choice(events)
\ No newline at end of file
+    return rng.choice(events)
\ No newline at end of file
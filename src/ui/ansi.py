@@ -0,0 +1,100 @@
+"""
+ANSI colour support for the GUI.
+Turns text containing ANSI escape sequences (as produced by the Colors
+class in ui.styles) into styled spans that map onto Tk text tags.
+"""
+
+import re
+
+# Any CSI escape sequence; only SGR ("m") sequences affect styling
+_ANSI_RE = re.compile(r'\033\[([0-9;?]*)([A-Za-z])')
+
+# Foreground colour SGR codes and the tag each one maps to
+FOREGROUND_TAGS = {
+    30: "ansi_black", 31: "ansi_red", 32: "ansi_green", 33: "ansi_yellow",
+    34: "ansi_blue", 35: "ansi_magenta", 36: "ansi_cyan", 37: "ansi_white",
+    90: "ansi_gray", 91: "ansi_bright_red", 92: "ansi_bright_green", 93: "ansi_bright_yellow",
+    94: "ansi_bright_blue", 95: "ansi_bright_magenta", 96: "ansi_bright_cyan", 97: "ansi_bright_white",
+}
+BOLD_TAG = "ansi_bold"
+
+# Colours picked to stay readable on the game's dark blue background
+TAG_COLORS = {
+    "ansi_black": "#555555",
+    "ansi_red": "#ff6b6b",
+    "ansi_green": "#7ee787",
+    "ansi_yellow": "#ffd75f",
+    "ansi_blue": "#79a8ff",
+    "ansi_magenta": "#ff79c6",
+    "ansi_cyan": "#5fd7ff",
+    "ansi_white": "#e0e0e0",
+    "ansi_gray": "#8a8a8a",
+    "ansi_bright_red": "#ff8c8c",
+    "ansi_bright_green": "#a6ffa6",
+    "ansi_bright_yellow": "#ffff87",
+    "ansi_bright_blue": "#9ec3ff",
+    "ansi_bright_magenta": "#ff9ee0",
+    "ansi_bright_cyan": "#8ff0ff",
+    "ansi_bright_white": "#ffffff",
+}
+
+def parse_ansi(text):
+    """
+    Split text into (segment, tags) spans in a single pass.
+
+    Args:
+        text (str): Text that may contain ANSI escape sequences
+
+    Returns:
+        list: (str, tuple) pairs; the tuple holds the Tk tag names for the span
+    """
+    if "\033" not in text:
+        return [(text, ())] if text else []
+
+    parts = _ANSI_RE.split(text)
+    spans = []
+    color = None
+    bold = False
+    tags = ()
+
+    # split() yields text, params, command, text, params, command, ...
+    if parts[0]:
+        spans.append((parts[0], tags))
+    for i in range(1, len(parts), 3):
+        params, command, segment = parts[i], parts[i + 1], parts[i + 2]
+        if command == "m":
+            for code in (params.split(";") if params else ("0",)):
+                code = int(code) if code.isdigit() else 0
+                if code == 0:
+                    color, bold = None, False
+                elif code == 1:
+                    bold = True
+                elif code == 22:
+                    bold = False
+                elif code == 39:
+                    color = None
+                elif code in FOREGROUND_TAGS:
+                    color = FOREGROUND_TAGS[code]
+            if color and bold:
+                tags = (color, BOLD_TAG)
+            elif color:
+                tags = (color,)
+            elif bold:
+                tags = (BOLD_TAG,)
+            else:
+                tags = ()
+        if segment:
+            spans.append((segment, tags))
+    return spans
+
+def strip_ansi(text):
+    """Return text with all ANSI escape sequences removed"""
+    if "\033" not in text:
+        return text
+    return _ANSI_RE.sub("", text)
+
+def configure_ansi_tags(text_widget, bold_font):
+    """Create the Tk text tags used by parse_ansi() on a Text widget"""
+    for tag, color in TAG_COLORS.items():
+        text_widget.tag_configure(tag, foreground=color)
+    text_widget.tag_configure(BOLD_TAG, font=bold_font)
@@ -3,8 +3,10 @@ ASCII art loader for The Deep game.
 """
 
 import os
+import mmap
 import logging
 from utils.config import Config
+from utils.content_pack import get_content_pack
 
 logger = logging.getLogger('the_deep.ui.ascii_art')
 
@@ -24,33 +26,124 @@ def display_title():
     """
     print(title_art)
 
-def load_ascii_art(art_file):
-    """Load ASCII art from a file in the assets directory"""
-    try:
-        # Build paths correctly
-        script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        art_path = os.path.join(script_dir, "ui", "assets", art_file)
-        
-        # Check if alternative location exists
-        if not os.path.exists(art_path):
-            alt_path = os.path.join(script_dir, "assets", art_file)
-            if os.path.exists(alt_path):
-                art_path = alt_path
-                
-        # Print paths for debugging
-        logger.debug(f"Attempting to load ASCII art from: {art_path}")
-        
-        # If file exists, load and return it
-        if os.path.exists(art_path):
-            with open(art_path, 'r') as file:
-                return file.read()
+class AsciiArtRegistry:
+    """Index of every ASCII art file, served from memory after the first lookup"""
+    def __init__(self, roots=None, use_mmap=None, use_pack=None):
+        """
+        Args:
+            roots (list): Directories to index, earlier ones win on name clashes
+            use_mmap (bool): Memory-map art files instead of reading them into strings
+            use_pack (bool): Serve art from the content pack when one is built
+                (defaults to True for the default directories, False for explicit ones)
+        """
+        if roots is None:
+            src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            project_dir = os.path.dirname(src_dir)
+            roots = [
+                os.path.join(src_dir, "ui", "assets"),
+                os.path.join(src_dir, "assets"),
+                os.path.join(project_dir, Config.ASSETS_PATH),
+            ]
+        else:
+            # Explicit directories are always read from disk
+            use_pack = False if use_pack is None else use_pack
+        self.roots = roots
+        self.use_pack = True if use_pack is None else use_pack
+        self.use_mmap = Config.ASCII_ART_MMAP if use_mmap is None else use_mmap
+        self._index = None   # "locations/trench.txt" -> absolute path
+        self._cache = {}     # "locations/trench.txt" -> str or mmap
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(art_file):
+        return art_file.replace("\\", "/").strip("/").lower()
+
+    def build_index(self):
+        """Walk the art directories once and remember where every file lives"""
+        if self.use_pack:
+            pack = get_content_pack()
+            if pack is not None and "ascii_art" in pack:
+                # The pack already holds every file's text, so nothing is read from disk
+                art = pack.section("ascii_art")
+                self._cache.update(art)
+                self._index = dict.fromkeys(art, pack.path)
+                logger.debug(f"Indexed {len(art)} ASCII art files from the content pack")
+                return self._index
+
+        index = {}
+        for root in self.roots:
+            if not os.path.isdir(root):
+                continue
+            for directory, _, files in os.walk(root):
+                for name in files:
+                    path = os.path.join(directory, name)
+                    index.setdefault(self._key(os.path.relpath(path, root)), path)
+        self._index = index
+        logger.debug(f"Indexed {len(index)} ASCII art files")
+        return index
+
+    def get(self, art_file):
+        """Return the art for a file name such as "locations/trench.txt", or None"""
+        key = self._key(art_file)
+        art = self._cache.get(key)
+        if art is not None:
+            self.hits += 1
         else:
-            logger.warning(f"ASCII art file not found: {art_path}")
+            self.misses += 1
+            art = self._load(key)
+            if art is None:
+                return None
+        if self.use_mmap and not isinstance(art, str):
+            return art[:].decode("utf-8")
+        return art
+
+    def preload(self):
+        """Load every indexed file now so later lookups never touch the disk"""
+        for key in self.index:
+            if key not in self._cache:
+                self._load(key)
+
+    def stats(self):
+        """Hit/miss counters for the in-memory cache"""
+        return {"files": len(self.index), "cached": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+    @property
+    def index(self):
+        if self._index is None:
+            self.build_index()
+        return self._index
+
+    def _load(self, key):
+        path = self.index.get(key)
+        if key in self._cache:
+            return self._cache[key]  # Indexing from the content pack fills the cache
+        if path is None:
+            logger.warning(f"ASCII art file not found: {key}")
             return None
-            
-    except Exception as e:
-        logger.error(f"Error loading ASCII art: {str(e)}")
-        return None
+        try:
+            if self.use_mmap and os.path.getsize(path) > 0:
+                with open(path, "rb") as file:
+                    art = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                with open(path, "r", encoding="utf-8") as file:
+                    art = file.read()
+        except OSError as e:
+            logger.error(f"Error loading ASCII art: {str(e)}")
+            return None
+        self._cache[key] = art
+        return art
+
+# Shared registry, indexed lazily on first use
+_registry = AsciiArtRegistry()
+
+def get_art_registry():
+    """Get the shared ASCII art registry"""
+    return _registry
+
+def load_ascii_art(art_file):
+    """Load ASCII art by its path relative to an art directory, e.g. "items/coral.txt" """
+    return _registry.get(art_file)
 
 def display_location_art(location_name):
     """
@@ -0,0 +1,124 @@
+"""
+UI command channel for The Deep game.
+Lets the game thread request UI changes without touching Tk directly. Calls
+are queued and run in batches on the Tk main thread from a single after() tick.
+"""
+
+import threading
+import logging
+from collections import deque
+from utils.config import Config
+
+logger = logging.getLogger('the_deep.ui.command_channel')
+
+class UICommandChannel:
+    """Queue of UI calls that may be posted from any thread and run on the Tk thread"""
+    def __init__(self, root, interval_ms=None, max_batch=500):
+        """
+        Args:
+            root: The tkinter root window that owns the main loop
+            interval_ms (int): Delay between drain ticks in milliseconds
+            max_batch (int): Maximum number of commands run per tick
+        """
+        self.root = root
+        self.interval_ms = interval_ms or Config.UI_FRAME_MS
+        self.max_batch = max_batch
+        self._commands = deque()  # append/popleft are thread-safe
+        self._tick_id = None
+        self._frame_callbacks = []
+        self.commands_run = 0
+
+    def post(self, func, *args, **kwargs):
+        """Queue a call to be made on the Tk main thread"""
+        self._commands.append((func, args, kwargs))
+
+    def add_frame_callback(self, callback):
+        """Register a callback run at the end of every tick, after the queued commands"""
+        self._frame_callbacks.append(callback)
+
+    def start(self):
+        """Start draining the queue (must be called from the Tk main thread)"""
+        if self._tick_id is None:
+            self._tick_id = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        """Stop the drain tick"""
+        if self._tick_id is not None:
+            try:
+                self.root.after_cancel(self._tick_id)
+            except Exception:
+                pass  # Window already destroyed
+            self._tick_id = None
+
+    def run_pending(self, limit=None):
+        """Run queued commands in order. Returns the number of commands run."""
+        commands = self._commands
+        count = 0
+        while commands and (limit is None or count < limit):
+            func, args, kwargs = commands.popleft()
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"UI command {getattr(func, '__name__', func)} failed: {str(e)}")
+            count += 1
+        self.commands_run += count
+        return count
+
+    def _tick(self):
+        self._tick_id = None
+        self.run_pending(self.max_batch)
+        for callback in self._frame_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Frame callback failed: {str(e)}")
+        try:
+            self._tick_id = self.root.after(self.interval_ms, self._tick)
+        except Exception:
+            pass  # Window was destroyed by one of the commands
+
+class UIProxy:
+    """Stand-in for a UI object whose method calls are posted to a UICommandChannel"""
+    def __init__(self, target, channel):
+        self._target = target
+        self._channel = channel
+
+    def __getattr__(self, name):
+        method = getattr(self._target, name)
+        if not callable(method):
+            raise AttributeError(f"'{name}' is not a UI method and cannot be posted")
+
+        def post(*args, **kwargs):
+            self._channel.post(method, *args, **kwargs)
+
+        # Cache the poster so the lookup only happens once per method
+        setattr(self, name, post)
+        return post
+
+class _ThreadCheckedTkApp:
+    """Wraps a Tcl interpreter and fails loudly on calls from other threads"""
+    def __init__(self, tkapp, owner_ident):
+        self._tkapp = tkapp
+        self._owner_ident = owner_ident
+
+    def __getattr__(self, name):
+        attr = getattr(self._tkapp, name)
+        if not callable(attr):
+            return attr
+        owner_ident = self._owner_ident
+
+        def checked(*args, **kwargs):
+            if threading.get_ident() != owner_ident:
+                raise AssertionError(
+                    f"Tk call '{name}{args[:2]}' made from thread "
+                    f"'{threading.current_thread().name}' instead of the Tk main thread"
+                )
+            return attr(*args, **kwargs)
+        return checked
+
+def install_tk_thread_guard(root):
+    """Make every Tk call on root and widgets created after it assert it runs on this thread"""
+    if isinstance(root.tk, _ThreadCheckedTkApp):
+        return
+    root.tk = _ThreadCheckedTkApp(root.tk, threading.get_ident())
+    logger.info("Tk thread guard enabled")
@@ -5,10 +5,13 @@ Creates a tkinter window for the game while keeping debugging output in the term
 import tkinter as tk
 from tkinter import scrolledtext, font
 import sys
-import queue
 import threading
 import logging
 import time
+from ui.ansi import parse_ansi, configure_ansi_tags
+from ui.command_channel import UICommandChannel
+from ui.scrollback import TranscriptScrollback
+from utils.config import Config
 
 # Configure logging to show in terminal
 logging.basicConfig(
@@ -19,18 +22,35 @@ logging.basicConfig(
 logger = logging.getLogger('the_deep')
 
 class StdoutRedirector:
-    """Redirects stdout to both the terminal and the GUI"""
-    def __init__(self, text_widget):
+    """Redirects stdout to the GUI, optionally mirroring it to the terminal"""
+    def __init__(self, gui, mirror=None):
         self.terminal = sys.stdout
-        self.text_widget = text_widget
-        self.queue = queue.Queue()
+        self.gui = gui
+        self.mirror = Config.MIRROR_STDOUT if mirror is None else mirror
+        self._buffer = []
+        self._lock = threading.Lock()
         
     def write(self, message):
-        self.terminal.write(message)  # Write to terminal
-        self.queue.put(message)       # Queue for GUI thread
+        if self.mirror:
+            self.terminal.write(message)  # Write to terminal
+        if not message:
+            return
+        with self._lock:
+            wake = not self._buffer
+            self._buffer.append(message)
+        # Only the first fragment after a flush schedules the next flush
+        if wake:
+            self.gui.commands.post(self._flush_to_gui)
+        
+    def _flush_to_gui(self):
+        """Join everything written since the last flush into one GUI update (Tk thread)"""
+        with self._lock:
+            fragments, self._buffer = self._buffer, []
+        self.gui.update_text_area("".join(fragments))
         
     def flush(self):
-        self.terminal.flush()
+        if self.mirror:
+            self.terminal.flush()
 
 class GameGUI:
     """Main GUI class for The Deep game"""
@@ -94,6 +114,18 @@ class GameGUI:
         self.text_area.pack(fill=tk.BOTH, expand=True)
         self.text_area.config(state=tk.DISABLED)  # Read only
         
+        # Tags used to render ANSI colours from the engine
+        self.bold_text_font = font.Font(family="Courier", size=11, weight="bold")
+        configure_ansi_tags(self.text_area, self.bold_text_font)
+        
+        # Keep the live text bounded; older lines go to a transcript file
+        self.scrollback = TranscriptScrollback(
+            self.text_area,
+            Config.TRANSCRIPT_PATH,
+            max_lines=Config.MAX_SCROLLBACK_LINES,
+            trim_lines=Config.SCROLLBACK_TRIM_LINES
+        )
+        
         # Prevent text area from capturing arrow key focus
         self.text_area.bind("<Up>", lambda e: "break")
         self.text_area.bind("<Down>", lambda e: "break")
@@ -134,43 +166,80 @@ class GameGUI:
         self.input_callback = None
         self.continue_callback = None
         
+        # Text waiting to be written to the text area on the next frame
+        self.pending_text = []
+        self.render_stats = {"inserts": 0, "updates": 0, "frames": 0}
+        self._last_render_stats = dict(self.render_stats)
+        
+        # UI calls posted by the game thread, drained on this thread. Pending
+        # text is flushed once at the end of every tick.
+        self.commands = UICommandChannel(self.root)
+        self.commands.add_frame_callback(self.flush_text)
+        self.commands.start()
+        
         # Set up stdout redirection
-        self.stdout_redirector = StdoutRedirector(self.text_area)
+        self.stdout_redirector = StdoutRedirector(self)
         sys.stdout = self.stdout_redirector
         
-        # Start a thread to process the queue
-        self.update_queue()
-        
         # Key bindings for navigation
+        self.restore_key_bindings()
+        
+        logger.info("GUI initialized")
+        
+    def restore_key_bindings(self):
+        """Bind the arrow, enter and space keys to menu navigation"""
         self.root.bind("<Up>", self.handle_up)
         self.root.bind("<Down>", self.handle_down)
         self.root.bind("<Return>", self.handle_select)
         self.root.bind("<space>", self.handle_select)
         
-        logger.info("GUI initialized")
-        
-    def update_queue(self):
-        """Process any stdout messages in the queue and update the text widget"""
-        try:
-            while True:
-                message = self.stdout_redirector.queue.get_nowait()
-                self.update_text_area(message)
-        except queue.Empty:
-            pass
-        self.root.after(100, self.update_queue)
+    def close(self, delay_ms=0):
+        """Close the window after an optional delay"""
+        self.commands.stop()
+        self.root.after(delay_ms, self.root.destroy)
         
     def update_text_area(self, message):
-        """Update the text area with new text"""
+        """Queue raw text for the text area"""
+        self.pending_text.append(message)
+        
+    def flush_text(self):
+        """Write all text queued this frame with a single insert and scroll"""
+        if not self.pending_text:
+            return
+        # Parse colours once for the whole frame and insert every styled
+        # span with a single call: insert(index, text, tags, text, tags, ...)
+        insert_args = []
+        for segment, tags in parse_ansi("".join(self.pending_text)):
+            insert_args.append(segment)
+            insert_args.append(tags)
+        self.pending_text.clear()
+        if not insert_args:
+            return
+        
         self.text_area.config(state=tk.NORMAL)
-        self.text_area.insert(tk.END, message)
+        self.scrollback.before_insert()
+        self.text_area.insert(tk.END, *insert_args)
+        self.scrollback.after_insert()
         self.text_area.see(tk.END)
         self.text_area.config(state=tk.DISABLED)
+        self.render_stats["inserts"] += 1
+        self.render_stats["frames"] += 1
+        
+    def report_render_stats(self, label):
+        """Log how many inserts and full updates the text area needed since the last report"""
+        self.flush_text()
+        delta = {key: value - self._last_render_stats[key] for key, value in self.render_stats.items()}
+        self._last_render_stats = dict(self.render_stats)
+        logger.debug(f"Render cost for {label}: {delta['inserts']} inserts, {delta['updates']} updates, {delta['frames']} frames")
+        return delta
         
     def clear_text_area(self):
         """Clear the text area"""
+        self.pending_text.clear()
         self.text_area.config(state=tk.NORMAL)
         self.text_area.delete(1.0, tk.END)
         self.text_area.config(state=tk.DISABLED)
+        self.scrollback.reset()
         
     def update_status(self, title, health, location):
         """Update the status bar with player info"""
@@ -182,35 +251,22 @@ class GameGUI:
             self.location_label.config(text=f"Location: {location}")
             
     def display_text(self, text):
-        """Display text in the main text area with improved formatting"""
-        if not text:
+        """Queue text for the main text area; it is written on the next frame"""
+        if not text or not text.strip():
             return
         
-        self.text_area.config(state=tk.NORMAL)
-        
-        # Add extra line breaks for readability
-        if text.strip():
-            # Make sure text has proper spacing
-            if not text.endswith("\n"):
-                text += "\n"
-            
-            # Add the text
-            self.text_area.insert(tk.END, text)
-            
-            # Add a visual separator for longer texts
-            if len(text.strip()) > 200:  # Only for substantial text blocks
-                self.text_area.insert(tk.END, "\n")
+        # Make sure text has proper spacing
+        if not text.endswith("\n"):
+            text += "\n"
+        self.pending_text.append(text)
         
-        self.text_area.see(tk.END)  # Auto-scroll to the bottom
-        self.text_area.config(state=tk.DISABLED)
-        self.root.update()  # Force update to show text immediately
-        logger.debug(f"Displayed text: {text[:30]}...")
+        # Add a visual separator for longer texts
+        if len(text.strip()) > 200:  # Only for substantial text blocks
+            self.pending_text.append("\n")
         
     def clear_text(self):
         """Clear the text area"""
-        self.text_area.config(state=tk.NORMAL)
-        self.text_area.delete(1.0, tk.END)
-        self.text_area.config(state=tk.DISABLED)
+        self.clear_text_area()
         
     def set_menu_options(self, options):
         """Set the available menu options"""
@@ -288,10 +344,7 @@ class GameGUI:
         self.root.bind("<space>", lambda e: callback())
         
         # Add a visual indicator for the continue prompt
-        self.text_area.config(state=tk.NORMAL)
-        self.text_area.insert(tk.END, "\n▼ Press ENTER or SPACE to continue ▼\n")
-        self.text_area.see(tk.END)
-        self.text_area.config(state=tk.DISABLED)
+        self.pending_text.append("\n▼ Press ENTER or SPACE to continue ▼\n")
         
     def handle_up(self, event):
         """Handle up arrow key"""
@@ -317,7 +370,6 @@ class GameGUI:
         self.options_listbox.selection_set(self.selected_option)
         self.options_listbox.see(self.selected_option)
         self.options_listbox.activate(self.selected_option)
-        self.root.update()
         
     def handle_select(self, event):
         """Handle enter or space key"""
@@ -334,8 +386,10 @@ class GameGUI:
     def show_message(self, message, duration=2.0):
         """Show a message in the text area with a minimum display time"""
         self.update_text_area(f"{message}\n")
+        self.flush_text()
         # Update immediately and wait to ensure visibility
         self.root.update()
+        self.render_stats["updates"] += 1
         time.sleep(duration)
         
     def _on_input_submit(self):
@@ -349,4 +403,7 @@ class GameGUI:
         
     def run(self):
         """Start the tkinter main loop"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.scrollback.close()
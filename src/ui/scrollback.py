@@ -0,0 +1,116 @@
+"""
+Scrollback management for The Deep game.
+Keeps the main text area at a bounded number of lines. Older lines are
+spilled in bulk to an append-only transcript file and paged back in when
+the player scrolls past the top.
+"""
+
+import os
+import logging
+import tkinter as tk
+
+logger = logging.getLogger('the_deep.ui.scrollback')
+
+class TranscriptScrollback:
+    """Bounded scrollback for a ScrolledText widget backed by a transcript file"""
+    def __init__(self, text_widget, transcript_path, max_lines=2000, trim_lines=500):
+        """
+        Args:
+            text_widget: The ScrolledText widget to manage
+            transcript_path (str): File that receives lines trimmed from the widget
+            max_lines (int): Number of live lines allowed before trimming
+            trim_lines (int): Extra lines removed on each trim so trims happen in bulk
+        """
+        self.text = text_widget
+        self.transcript_path = transcript_path
+        self.max_lines = max_lines
+        self.trim_lines = min(trim_lines, max_lines)
+        self._file = None
+        self._chunks = []  # (offset, size, line_count) of every spilled chunk, oldest first
+        self._next_page = 0  # Chunks before this index have not been paged back in
+        self._paged_lines = 0  # Lines of history currently paged back into the widget
+        self._page_pending = False
+        self.lines_spilled = 0
+
+        # Watch the view so we notice when the player scrolls to the top
+        self._vbar_set = text_widget.vbar.set
+        text_widget.config(yscrollcommand=self._on_yscroll)
+
+    def line_count(self):
+        """Number of lines currently held by the widget"""
+        return int(self.text.index("end-1c").split(".")[0])
+
+    def before_insert(self):
+        """Drop paged-in history so new output lands on the live window"""
+        if self._paged_lines:
+            self.text.delete("1.0", f"{self._paged_lines + 1}.0")
+            self._paged_lines = 0
+        self._next_page = len(self._chunks)
+
+    def after_insert(self):
+        """Spill the oldest lines to the transcript if the widget is over its cap"""
+        lines = self.line_count()
+        if lines <= self.max_lines:
+            return
+        count = lines - self.max_lines + self.trim_lines
+        end = f"{count + 1}.0"
+        self._append_chunk(self.text.get("1.0", end), count)
+        self.text.delete("1.0", end)
+        self._next_page = len(self._chunks)
+
+    def reset(self):
+        """Forget paged-in history after the widget has been cleared"""
+        self._paged_lines = 0
+        self._next_page = len(self._chunks)
+
+    def close(self):
+        """Close the transcript file"""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _append_chunk(self, text, line_count):
+        if self._file is None:
+            directory = os.path.dirname(self.transcript_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # A new transcript per session; it is only ever appended to after this
+            self._file = open(self.transcript_path, "w+b")
+        data = text.encode("utf-8")
+        self._file.seek(0, os.SEEK_END)
+        offset = self._file.tell()
+        self._file.write(data)
+        self._file.flush()
+        self._chunks.append((offset, len(data), line_count))
+        self.lines_spilled += line_count
+        logger.debug(f"Spilled {line_count} lines to transcript ({len(self._chunks)} chunks)")
+
+    def _on_yscroll(self, first, last):
+        self._vbar_set(first, last)
+        if float(first) <= 0.0 and self._can_page() and not self._page_pending:
+            # Don't modify the widget from inside its own scroll callback
+            self._page_pending = True
+            self.text.after_idle(self._page_in)
+
+    def _can_page(self):
+        # Paged-in history is capped at one window so memory stays bounded
+        return self._next_page > 0 and self._paged_lines < self.max_lines
+
+    def _page_in(self):
+        """Load the previous transcript chunk back in above the current top line"""
+        self._page_pending = False
+        if not self._can_page():
+            return
+        self._next_page -= 1
+        offset, size, line_count = self._chunks[self._next_page]
+        self._file.seek(offset)
+        text = self._file.read(size).decode("utf-8")
+
+        state = self.text.cget("state")
+        self.text.config(state=tk.NORMAL)
+        self.text.insert("1.0", text)
+        self.text.config(state=state)
+        self._paged_lines += line_count
+
+        # Keep the line the player was looking at in place
+        self.text.yview(f"{line_count + 1}.0")
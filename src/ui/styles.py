@@ -0,0 +1,33 @@
+"""
+ANSI colour and style codes for The Deep.
+Kept free of Tk so headless front-ends like the text server can use them.
+"""
+
+# ANSI color and style codes
+class Colors:
+    # ANSI color codes
+    RED = "\033[31m"
+    GREEN = "\033[32m"
+    YELLOW = "\033[33m"
+    BLUE = "\033[34m"
+    MAGENTA = "\033[35m"
+    CYAN = "\033[36m"
+    BOLD = "\033[1m"
+    RESET = "\033[0m"
+
+# Terminal colours for each core style hint
+STYLE_COLORS = {
+    "title": Colors.BOLD,
+    "info": Colors.CYAN,
+    "note": Colors.YELLOW,
+    "success": Colors.GREEN,
+    "warning": Colors.YELLOW,
+    "danger": Colors.RED + Colors.BOLD,
+}
+
+def style_text(text, style):
+    """Return text wrapped in the terminal colour for a core style hint."""
+    color = STYLE_COLORS.get(style)
+    if color:
+        return f"{color}{text}{Colors.RESET}"
+    return text
@@ -0,0 +1,124 @@
+"""
+Terminal rendering for The Deep game.
+Draws to the terminal with ANSI cursor and clear sequences instead of
+spawning 'cls'/'clear' processes, and writes each frame with one write().
+"""
+
+import sys
+import time
+import logging
+from utils.config import Config
+
+logger = logging.getLogger('the_deep.ui.terminal')
+
+# ANSI control sequences
+CURSOR_HOME = "\033[H"
+CLEAR_SCREEN = "\033[2J"
+CLEAR_TO_END = "\033[J"
+CLEAR_LINE = "\033[K"
+HIDE_CURSOR = "\033[?25l"
+SHOW_CURSOR = "\033[?25h"
+
+# Effect modes: "normal" animates, "fast" animates at a tenth of the delay,
+# "instant" skips animation and delays entirely
+EFFECT_MODES = ("normal", "fast", "instant")
+_effects_mode = None
+
+try:
+    # Older Windows consoles need colorama to understand ANSI sequences
+    import colorama
+    colorama.just_fix_windows_console()
+except (ImportError, AttributeError):
+    pass
+
+def set_effects_mode(mode):
+    """Set the global text effect mode ("normal", "fast" or "instant")"""
+    global _effects_mode
+    if mode not in EFFECT_MODES:
+        raise ValueError(f"Unknown effects mode '{mode}'. Choose from: {', '.join(EFFECT_MODES)}")
+    _effects_mode = mode
+
+def get_effects_mode():
+    """Get the text effect mode, defaulting to instant when output isn't a terminal"""
+    if _effects_mode:
+        return _effects_mode
+    mode = Config.TEXT_EFFECTS
+    if mode == "auto":
+        isatty = getattr(sys.stdout, "isatty", None)
+        return "normal" if isatty and isatty() else "instant"
+    return mode
+
+def effect_delay(delay):
+    """Scale an animation delay for the current effect mode"""
+    mode = get_effects_mode()
+    if mode == "instant":
+        return 0
+    if mode == "fast":
+        return delay / 10
+    return delay
+
+class TerminalRenderer:
+    """Double-buffered terminal output written with one write() per frame"""
+    def __init__(self, stream=None):
+        self._stream = stream
+        self._front = []  # Lines currently on screen
+
+    @property
+    def stream(self):
+        # Resolve lazily so stdout redirection is respected
+        return self._stream or sys.stdout
+
+    def write(self, text):
+        """Write text and flush it in a single call"""
+        self.stream.write(text)
+        self.stream.flush()
+
+    def clear(self):
+        """Clear the screen and move the cursor home"""
+        self._front = []
+        self.write(CURSOR_HOME + CLEAR_SCREEN)
+
+    def draw(self, lines):
+        """
+        Draw a full frame, rewriting only the lines that changed since the last frame.
+
+        Args:
+            lines (list): The lines of text making up the frame
+        """
+        front = self._front
+        parts = [HIDE_CURSOR]
+        for row, line in enumerate(lines):
+            if row >= len(front) or front[row] != line:
+                parts.append(f"\033[{row + 1};1H{line}{CLEAR_LINE}")
+        if len(lines) < len(front):
+            # Wipe anything left over from a taller previous frame
+            parts.append(f"\033[{len(lines) + 1};1H{CLEAR_TO_END}")
+        parts.append(f"\033[{len(lines) + 1};1H{SHOW_CURSOR}")
+        self.write("".join(parts))
+        self._front = list(lines)
+
+    def animate(self, frames, delay):
+        """Draw a sequence of frames with a delay between them"""
+        delay = effect_delay(delay)
+        self.clear()
+        for frame in frames:
+            self.draw(frame)
+            if delay:
+                time.sleep(delay)
+
+    def type_out(self, text, delay):
+        """Write text a few characters per frame instead of one write per character"""
+        delay = effect_delay(delay)
+        if not delay:
+            self.write(text)
+            return
+
+        # Aim for roughly 60 writes per second whatever the per-character delay
+        frame = 1 / 60
+        chunk = max(1, int(frame / delay))
+        for start in range(0, len(text), chunk):
+            self.write(text[start:start + chunk])
+            time.sleep(delay * chunk)
+
+# Shared renderer used by the terminal engine and text effects
+renderer = TerminalRenderer()
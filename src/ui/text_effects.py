@@ -1,8 +1,7 @@
-import sys
 import time
-import os
 import tkinter as tk
-from threading import Thread
+from utils.config import Config
+from ui.terminal import renderer, get_effects_mode
 
 def print_typing_effect(text, delay=0.05):
     """
@@ -12,11 +11,7 @@ def print_typing_effect(text, delay=0.05):
         text (str): The text to print.
         delay (float): The delay between each character.
     """
-    for char in text:
-        sys.stdout.write(char)
-        sys.stdout.flush()
-        time.sleep(delay)
-    print()  # Ensure the cursor moves to the next line after printing the text
+    renderer.type_out(text + "\n", delay)
 
 def print_bold(text):
     """
@@ -76,14 +71,17 @@ def print_menu(options, selected_index):
         else:
             print(f"  {option}")
 
-def typewriter_effect(text, delay=0.5):  # Increased from 0.03 to 0.08 for slower effect
+def typewriter_effect(text, delay=None):
     """
     Display text with a typewriter effect.
     
     Args:
         text (str): The text to display
-        delay (float): Delay between characters in seconds
+        delay (float): Delay between characters in seconds (defaults to Config.TEXT_SPEED)
     """
+    if delay is None:
+        delay = Config.TEXT_SPEED
+    
     # Process text to handle potential formatting issues
     lines = text.split("\n")
     processed_lines = []
@@ -96,15 +94,12 @@ def typewriter_effect(text, delay=0.5):  # Increased from 0.03 to 0.08 for slowe
     # Join back into a single string
     processed_text = "\n".join(processed_lines)
     
-    # Print the text character by character
-    for char in processed_text:
-        sys.stdout.write(char)
-        sys.stdout.flush()
-        time.sleep(delay)
-    
     # Ensure a newline at the end
     if not processed_text.endswith("\n"):
-        print()
+        processed_text += "\n"
+    
+    # Written a frame's worth of characters at a time
+    renderer.type_out(processed_text, delay)
 
 def fade_in_text(text, steps=10, delay=0.05):
     """
@@ -115,23 +110,24 @@ def fade_in_text(text, steps=10, delay=0.05):
         steps (int): Number of brightness steps
         delay (float): Delay between steps in seconds
     """
-    os.system('cls' if os.name == 'nt' else 'clear')
+    lines = text.split('\n')
+    if get_effects_mode() == "instant":
+        renderer.write(text + "\n")
+        return
     
     # Create brightness levels using characters of increasing "weight"
     brightness_levels = [
         ' ', '.', ':', '-', '=', '+', '*', '#', '%', '@'
     ]
     
+    frames = []
     for level in range(steps):
-        os.system('cls' if os.name == 'nt' else 'clear')
         brightness_char = brightness_levels[min(level, len(brightness_levels)-1)]
-        for line in text.split('\n'):
-            print(line.replace('@', brightness_char))
-        time.sleep(delay)
+        frames.append([line.replace('@', brightness_char) for line in lines])
     
     # Final display with actual text
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print(text)
+    frames.append(lines)
+    renderer.animate(frames, delay)
 
 def horror_text_effect(text, flicker_count=3, delay=0.1):
     """
@@ -142,32 +138,76 @@ def horror_text_effect(text, flicker_count=3, delay=0.1):
         flicker_count (int): Number of flickers
         delay (float): Delay between flickers in seconds
     """
+    lines = text.split('\n')
+    if get_effects_mode() == "instant":
+        renderer.write(text + "\n")
+        return
     
-    # Display the text with flickering effect
+    # Alternate between the text and a blank screen
+    frames = []
     for i in range(flicker_count):
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print(text)
-        time.sleep(delay)
-        
-        os.system('cls' if os.name == 'nt' else 'clear')
-        time.sleep(delay / 2)
+        frames.append(lines)
+        frames.append([])
     
     # Final display
-    print(text)
+    frames.append(lines)
+    renderer.animate(frames, delay)
+
+class _TypewriterScheduler:
+    """Drives every running TypewriterEffect on one window from a single after() tick"""
+    _schedulers = {}
+    
+    def __init__(self, root, interval_ms=16):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.effects = []
+        self._tick_id = None
+    
+    @classmethod
+    def for_widget(cls, widget):
+        """Get the shared scheduler for the window that owns widget"""
+        root = widget._root()
+        scheduler = cls._schedulers.get(root)
+        if scheduler is None:
+            scheduler = cls._schedulers[root] = cls(root)
+        return scheduler
+    
+    def add(self, effect):
+        if effect not in self.effects:
+            self.effects.append(effect)
+        if self._tick_id is None:
+            self._tick_id = self.root.after(self.interval_ms, self._tick)
+    
+    def remove(self, effect):
+        if effect in self.effects:
+            self.effects.remove(effect)
+    
+    def _tick(self):
+        self._tick_id = None
+        now = time.perf_counter()
+        for effect in list(self.effects):
+            if not effect.advance(now):
+                self.remove(effect)
+        
+        # Stop ticking while nothing is animating
+        if self.effects:
+            self._tick_id = self.root.after(self.interval_ms, self._tick)
 
 class TypewriterEffect:
-    def __init__(self, text_widget, text, base_delay=0.3):
+    def __init__(self, text_widget, text, base_delay=0.3, on_complete=None):
         """
         Initialize typewriter effect for GUI
         
         Args:
-            text_widget: tkinter Text or Label widget
+            text_widget: tkinter Text widget (a Label also works, but is redrawn in full each tick)
             text (str): The text to display
             base_delay (float): Base delay between characters in seconds
+            on_complete (callable): Called once all the text is shown
         """
         self.text_widget = text_widget
         self.text = text
         self.base_delay = base_delay * 1000  # Convert to milliseconds
+        self.on_complete = on_complete
         self.char_index = 0
         self.is_running = False
         self.pause_after_punctuation = {
@@ -178,39 +218,77 @@ class TypewriterEffect:
             '\n': 1500, # 1500ms pause after new lines
             ' ': 300,   # 300ms pause after spaces
         }
+        self._appends = hasattr(text_widget, "insert")
+        self._next_due = 0.0
+        self._scheduler = _TypewriterScheduler.for_widget(text_widget)
     
     def start(self):
         """Start the typewriter effect"""
         self.char_index = 0
         self.is_running = True
-        self._type_text()
+        self._next_due = time.perf_counter()
+        self._scheduler.add(self)
     
     def stop(self):
         """Stop the typewriter effect"""
         self.is_running = False
+        self._scheduler.remove(self)
     
-    def _type_text(self):
-        """Type text character by character with dynamic delays"""
+    def finish(self):
+        """Skip to the end and show the whole text at once"""
         if not self.is_running:
             return
-            
-        if self.char_index < len(self.text):
-            # Update the text
-            current_text = self.text[:self.char_index + 1]
-            self.text_widget.config(text=current_text)
-            
-            # Calculate delay for next character
-            current_char = self.text[self.char_index]
-            
-            # Base delay plus any additional pause for punctuation
-            next_delay = self.base_delay
-            if current_char in self.pause_after_punctuation:
-                next_delay += self.pause_after_punctuation[current_char]
-            
-            self.char_index += 1
-            
-            # Schedule next character with proper delay
-            self.text_widget.after(int(next_delay), self._type_text)
+        self._show(len(self.text))
+        self._complete()
+    
+    def bind_skip(self, widget=None, sequence="<Key>"):
+        """Let a key press (or any other event sequence) complete the effect instantly"""
+        (widget or self.text_widget).bind(sequence, lambda event: self.finish(), add="+")
+    
+    def advance(self, now):
+        """Show every character that is due by now. Returns False once finished."""
+        if not self.is_running:
+            return False
+        
+        text = self.text
+        index = self.char_index
+        next_due = self._next_due
+        length = len(text)
+        
+        # Work out how far the animation should have got, then append
+        # the new characters in one go
+        while index < length and next_due <= now:
+            delay = self.base_delay + self.pause_after_punctuation.get(text[index], 0)
+            next_due += delay / 1000
+            index += 1
+        self._next_due = next_due
+        
+        if index > self.char_index:
+            self._show(index)
+        if index >= length:
+            self._complete()
+            return False
+        return True
+    
+    def _show(self, index):
+        """Append text[char_index:index] to the widget"""
+        if self._appends:
+            state = self.text_widget.cget("state")
+            if state == tk.DISABLED:
+                self.text_widget.config(state=tk.NORMAL)
+            self.text_widget.insert(tk.END, self.text[self.char_index:index])
+            self.text_widget.see(tk.END)
+            if state == tk.DISABLED:
+                self.text_widget.config(state=tk.DISABLED)
+        else:
+            self.text_widget.config(text=self.text[:index])
+        self.char_index = index
+    
+    def _complete(self):
+        self.is_running = False
+        self._scheduler.remove(self)
+        if self.on_complete:
+            self.on_complete()
 
 def show_text_with_effect(text):
     """
@@ -223,21 +301,23 @@ def show_text_with_effect(text):
     root.title("The Deep")
     root.geometry("600x400")
     
-    # Configure the label with proper styling
-    label = tk.Label(
+    # Text widget so the effect only appends new characters
+    text_widget = tk.Text(
         root,
-        text="",
-        wraplength=500,
-        justify=tk.LEFT,
+        wrap=tk.WORD,
         font=("Courier", 14),
         bg="black",
-        fg="green"
+        fg="green",
+        relief=tk.FLAT,
+        highlightthickness=0
     )
-    label.pack(padx=40, pady=40, expand=True, fill='both')
+    text_widget.pack(padx=40, pady=40, expand=True, fill='both')
+    text_widget.config(state=tk.DISABLED)
     
-    # Create effect with much slower base delay
-    effect = TypewriterEffect(label, text, base_delay=0.3)  # 300ms between characters
+    # Create effect with much slower base delay; any key shows the rest
+    effect = TypewriterEffect(text_widget, text, base_delay=0.3)  # 300ms between characters
+    effect.bind_skip(root)
     effect.start()
     
     # Keep window running
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
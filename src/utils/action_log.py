@@ -0,0 +1,312 @@
+"""
+Action journal for The Deep game.
+A write-ahead log of every player action and the random draws it made,
+written with one unbuffered append per turn and fsync'd in batches: after
+enough appends, or at most fsync_interval seconds after an unsynced append.
+Periodic snapshots bound the log; after a crash the game is rebuilt by
+loading the latest snapshot and replaying the log on top of it.
+
+The log is split into numbered segments. Taking a snapshot starts a new
+segment, and older segments are deleted once the snapshot is on disk.
+"""
+
+import os
+import glob
+import time
+import random
+import struct
+import logging
+import threading
+import zlib
+from collections import deque
+from utils.save_load import encode, decode, read_save, get_background_saver, SaveError
+
+logger = logging.getLogger('the_deep.utils.action_log')
+
+# Payload length and CRC32 in front of every record
+_RECORD_HEADER = struct.Struct("<II")
+
+class ReplayError(Exception):
+    """Raised when a replayed action asks for draws the journal didn't record"""
+
+# Mersenne Twister state: 624 words plus the position in them
+_RNG_STATE = struct.Struct("<625I")
+
+def new_seed():
+    """Pick a seed for a new game"""
+    return random.SystemRandom().getrandbits(32)
+
+class JournalingRandom(random.Random):
+    """
+    Random number generator that records every draw, or plays recorded draws back.
+    All of random.Random's methods are built on random() and getrandbits(),
+    so overriding those two covers randint(), choice(), uniform() and the rest.
+    """
+    def __init__(self, x=None):
+        self.draws = []
+        self._replay = None
+        super().__init__(x)
+
+    def random(self):
+        # While replaying the generator still advances, so it carries on
+        # from the right place once the replay is over
+        value = super().random()
+        if self._replay is not None:
+            return self._next_recorded(float)
+        self.draws.append(value)
+        return value
+
+    def getrandbits(self, k):
+        value = super().getrandbits(k)
+        if self._replay is not None:
+            return self._next_recorded(int)
+        self.draws.append(value)
+        return value
+
+    def state_data(self):
+        """The generator state as bytes, for snapshots"""
+        version, internal, gauss_next = self.getstate()
+        return _RNG_STATE.pack(*internal)
+
+    def set_state_data(self, data):
+        """Restore a state returned by state_data()"""
+        self.setstate((3, _RNG_STATE.unpack(data), None))
+
+    def take_draws(self):
+        """Return the draws recorded since the last call and start a new list"""
+        draws = self.draws
+        self.draws = []
+        return draws
+
+    def replay(self, draws):
+        """Return these draws, in order, instead of generating new ones"""
+        self._replay = deque(draws)
+
+    def stop_replay(self):
+        """Go back to generating draws. Returns how many recorded draws went unused."""
+        unused = len(self._replay) if self._replay is not None else 0
+        self._replay = None
+        return unused
+
+    def _next_recorded(self, kind):
+        if not self._replay:
+            raise ReplayError("The journal has no more draws recorded for this action")
+        value = self._replay.popleft()
+        if type(value) is not kind:
+            raise ReplayError(f"Expected a recorded {kind.__name__} draw, found {value!r}")
+        return value
+
+class ActionJournal:
+    """Write-ahead log of player actions plus the snapshots it is replayed onto"""
+    def __init__(self, path, snapshot_path, fsync_interval=1.0, fsync_batch=32, snapshot_interval=50):
+        """
+        Args:
+            path (str): Base path of the log; segments are written to path.1, path.2, ...
+            snapshot_path (str): Where the compacted snapshot is written
+            fsync_interval (float): Longest an appended action waits for an fsync. A later
+                append past the interval fsyncs itself; otherwise a timer does it
+            fsync_batch (int): Number of appends that forces an fsync
+            snapshot_interval (int): Appends between snapshots
+        """
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.fsync_interval = fsync_interval
+        self.fsync_batch = fsync_batch
+        self.snapshot_interval = snapshot_interval
+        self._fd = None
+        self._segment = 0
+        self._sequence = 0  # Number of the last record written
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._since_snapshot = 0
+        self._lock = threading.Lock()  # Guards segment deletion against the save thread
+        self._sync_lock = threading.Lock()  # Guards the open segment against the sync timer
+        self._sync_timer = None
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def start(self, snapshot):
+        """Begin a new journal from a snapshot, discarding any previous log"""
+        self.close()
+        # Let pending snapshot writes finish so their cleanup can't touch the new log
+        get_background_saver().flush()
+        self._remove_segments(everything=True)
+        try:
+            os.remove(self.snapshot_path)
+        except FileNotFoundError:
+            pass
+        self._segment = 0
+        self._sequence = 0
+        self.write_snapshot(snapshot)
+
+    def resume(self, snapshot, sequence):
+        """Continue a recovered journal: write a fresh snapshot and carry on appending"""
+        self._sequence = sequence
+        self._segment = max(self._segment_numbers(), default=0)
+        self.write_snapshot(snapshot)
+
+    def append(self, action, draws):
+        """Append one accepted action and the random draws it made"""
+        self._sequence += 1
+        payload = encode([self._sequence, action, draws])
+        self._since_snapshot += 1
+        with self._sync_lock:
+            # One unbuffered write: once it returns, a crash of the game can't lose it
+            os.write(self._fd, _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+            self._unsynced += 1
+            now = time.monotonic()
+            if self._unsynced >= self.fsync_batch or now - self._last_sync >= self.fsync_interval:
+                self._sync()
+            elif self._sync_timer is None:
+                # Sync even if the player goes idle and nothing else is appended
+                self._sync_timer = threading.Timer(self.fsync_interval, self._sync_when_due)
+                self._sync_timer.daemon = True
+                self._sync_timer.start()
+
+    def needs_snapshot(self):
+        """True once enough actions have been appended since the last snapshot"""
+        return self._since_snapshot >= self.snapshot_interval
+
+    def write_snapshot(self, snapshot):
+        """
+        Start a new log segment and save the snapshot in the background.
+        Older segments are deleted once the snapshot is safely on disk.
+        """
+        self._open_segment(self._segment + 1)
+        self._since_snapshot = 0
+        record = {"sequence": self._sequence, "segment": self._segment, "snapshot": snapshot}
+        segment = self._segment
+
+        def on_saved(error):
+            if error is None:
+                with self._lock:
+                    self._remove_segments(before=segment)
+
+        get_background_saver().save(record, self.snapshot_path, on_saved)
+
+    def sync(self):
+        """fsync everything appended so far"""
+        with self._sync_lock:
+            self._sync()
+
+    def _sync(self):
+        if self._fd is not None and self._unsynced:
+            os.fsync(self._fd)
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _sync_when_due(self):
+        # Runs on the timer thread
+        with self._sync_lock:
+            if self._sync_timer is threading.current_thread():
+                self._sync_timer = None
+            self._sync()
+
+    def close(self):
+        """Flush and close the current segment"""
+        with self._sync_lock:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            if self._fd is not None:
+                self._sync()
+                os.close(self._fd)
+                self._fd = None
+
+    def discard(self):
+        """Close the journal and delete it, e.g. when a game ends normally"""
+        self.close()
+        get_background_saver().flush()
+        with self._lock:
+            self._remove_segments(everything=True)
+            try:
+                os.remove(self.snapshot_path)
+            except FileNotFoundError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+
+    def has_recovery(self):
+        """True if an earlier session left a journal behind"""
+        return os.path.exists(self.snapshot_path)
+
+    def recover(self):
+        """
+        Read back what a crashed session left behind.
+
+        Returns:
+            tuple: (snapshot, records, sequence) where records are the
+                   (action, draws) pairs to replay on top of the snapshot and
+                   sequence is the number of the last one, or None if there
+                   is nothing usable to recover
+        """
+        try:
+            saved = read_save(self.snapshot_path)
+        except (OSError, SaveError) as e:
+            logger.error(f"Can't recover from journal snapshot: {str(e)}")
+            return None
+
+        sequence = saved["sequence"]
+        records = []
+        for number in self._segment_numbers():
+            if number < saved["segment"]:
+                continue
+            for record_sequence, action, draws in self._read_segment(self._segment_path(number)):
+                if record_sequence <= sequence:
+                    continue
+                if record_sequence != sequence + 1:
+                    logger.warning(f"Journal skips from record {sequence} to {record_sequence}; stopping there")
+                    return saved["snapshot"], records, sequence
+                records.append((action, draws))
+                sequence = record_sequence
+        return saved["snapshot"], records, sequence
+
+    def _read_segment(self, path):
+        """Yield the records of a segment, stopping at a torn or damaged tail"""
+        with open(path, "rb") as file:
+            data = file.read()
+        pos = 0
+        while pos + _RECORD_HEADER.size <= len(data):
+            size, checksum = _RECORD_HEADER.unpack_from(data, pos)
+            start = pos + _RECORD_HEADER.size
+            payload = data[start:start + size]
+            if len(payload) != size or zlib.crc32(payload) != checksum:
+                logger.warning(f"Ignoring damaged journal tail in {path} at byte {pos}")
+                return
+            yield decode(payload)
+            pos = start + size
+
+    # ------------------------------------------------------------------
+    # Segments
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, number):
+        return f"{self.path}.{number}"
+
+    def _segment_numbers(self):
+        numbers = []
+        for path in glob.glob(glob.escape(self.path) + ".*"):
+            suffix = path[len(self.path) + 1:]
+            if suffix.isdigit():
+                numbers.append(int(suffix))
+        return sorted(numbers)
+
+    def _open_segment(self, number):
+        self.close()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._segment = number
+        self._fd = os.open(self._segment_path(number), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def _remove_segments(self, before=None, everything=False):
+        for number in self._segment_numbers():
+            if everything or number < before:
+                try:
+                    os.remove(self._segment_path(number))
+                except FileNotFoundError:
+                    pass
@@ -13,6 +13,13 @@ class Config:
     
     # UI settings
     TEXT_SPEED = 0.03  # seconds per character for text animation
+    TEXT_EFFECTS = 'auto'  # normal, fast, instant, or auto (instant when output isn't a terminal)
+    UI_FRAME_MS = 16  # how often the GUI applies queued updates from the game thread
+    DEBUG_TK_THREADS = False  # raise AssertionError on Tk calls made off the main thread
+    MAX_SCROLLBACK_LINES = 2000  # live lines kept in the main text area
+    SCROLLBACK_TRIM_LINES = 500  # extra lines spilled per trim so trims happen in bulk
+    TRANSCRIPT_PATH = 'saves/transcript.txt'
+    MIRROR_STDOUT = False  # also write GUI stdout to the terminal
     TITLE_COLOR = "cyan"
     TEXT_COLOR = "white"
     WARNING_COLOR = "yellow"
@@ -40,8 +47,27 @@ class Config:
     }
 
     DEFAULT_DIFFICULTY = 'normal'
-    SAVE_FILE_PATH = 'saves/save_data.json'
+    SAVE_FILE_PATH = 'saves/save_data.sav'
+    GAME_SEED = None  # fixed seed for every new game, e.g. to reproduce a bug; None picks one at random
+    RECORDING_PATH = 'saves/last_run.rec'  # seed and actions of the last game, see python -m utils.replay
+    RECORDING_MAX_ACTIONS = 1000  # actions a game keeps for its recording; older ones are folded into a snapshot
+    JOURNAL_PATH = 'saves/journal.wal'  # action log written every turn for crash recovery
+    AUTOSAVE_PATH = 'saves/autosave.sav'  # snapshot the journal is replayed onto
+    JOURNAL_FSYNC_INTERVAL = 1.0  # longest an appended action waits to be fsync'd
+    JOURNAL_SNAPSHOT_INTERVAL = 50  # actions between autosave snapshots
+    SERVER_HOST = '127.0.0.1'  # python -m server.text_server
+    SERVER_PORT = 4000
+    SERVER_MAX_SESSIONS = 5000
+    SERVER_IDLE_TIMEOUT = 1800  # seconds a connection may sit without sending a command
+    SERVER_OUTPUT_HIGH_WATER = 64 * 1024  # bytes queued for a client before its session waits for it to read
+    SERVER_DRAIN_TIMEOUT = 30  # seconds a client may leave output unread before it is dropped
+    SERVER_SAVE_DIRECTORY = 'saves/players'  # one save file per player name
+    SERVER_GC_THRESHOLD = 5000  # allocations between young collections; each tick replaces every session's events
     ASSETS_PATH = 'resources/ascii/'
+    ASCII_ART_MMAP = False  # memory-map art files instead of holding them as strings
+    CONTENT_PACK_PATH = 'resources/content.pack'  # built with: python -m utils.content_pack
+    USE_CONTENT_PACK = True  # load world content from the pack when it exists
+    CHECK_CONTENT_PACK_SOURCES = False  # while editing content: ignore a pack older than its source files
 
     @staticmethod
     def get_version():
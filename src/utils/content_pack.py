@@ -0,0 +1,196 @@
+"""
+Content pack for The Deep game.
+Compiles the world (locations, items, enemies) and the ASCII art into one
+versioned file with an offset index. At runtime the pack is memory-mapped
+and each section is decoded the first time it is asked for.
+
+The Python definitions stay the source of truth, so rebuild the pack after
+changing them. The pack records the size and modification time of every
+file it was compiled from; with Config.CHECK_CONTENT_PACK_SOURCES set, a
+pack older than its sources is ignored until it is rebuilt. The check stats
+every source file, so it is off by default to keep startup to one file open.
+
+Build the pack from the src directory with:
+    python -m utils.content_pack
+"""
+
+import os
+import sys
+import json
+import hashlib
+import mmap
+import struct
+import logging
+from utils.config import Config
+
+logger = logging.getLogger('the_deep.utils.content_pack')
+
+PACK_MAGIC = b"DEEPPACK"
+PACK_FORMAT_VERSION = 1
+# magic, format version, length of the JSON index that follows the header
+_HEADER = struct.Struct("<8sHI")
+
+class ContentPackError(Exception):
+    """Raised when a content pack is missing, corrupt or out of date"""
+
+def _project_dir():
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def get_pack_path():
+    """Absolute path of the content pack"""
+    return os.path.join(_project_dir(), Config.CONTENT_PACK_PATH)
+
+def source_files():
+    """Paths of the files a content pack is compiled from"""
+    from ui.ascii_art import AsciiArtRegistry
+
+    world_dir = os.path.join(_project_dir(), "src", "world")
+    paths = [os.path.join(world_dir, name) for name in ("items.py", "locations.py", "enemies.py")]
+    paths.extend(sorted(AsciiArtRegistry(use_pack=False).index.values()))
+    return paths
+
+def source_fingerprint():
+    """Digest of the size and modification time of every source file, to spot stale packs"""
+    digest = hashlib.blake2b(digest_size=16)
+    project_dir = _project_dir()
+    for path in source_files():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        digest.update(f"{os.path.relpath(path, project_dir)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+class ContentPack:
+    """Read-only view of a built content pack, decoded one section at a time"""
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_index()
+        except Exception:
+            self._data.close()
+            raise
+        self._sections = {}
+
+    def _read_index(self):
+        if len(self._data) < _HEADER.size:
+            raise ContentPackError(f"{self.path} is too short to be a content pack")
+        magic, version, index_size = _HEADER.unpack_from(self._data, 0)
+        if magic != PACK_MAGIC:
+            raise ContentPackError(f"{self.path} is not a content pack")
+        if version != PACK_FORMAT_VERSION:
+            raise ContentPackError(f"{self.path} uses pack format {version}, expected {PACK_FORMAT_VERSION}")
+        index = json.loads(self._data[_HEADER.size:_HEADER.size + index_size])
+        if index.get("game_version") != Config.get_version():
+            raise ContentPackError(f"{self.path} was built for version {index.get('game_version')}; rebuild it")
+        if Config.CHECK_CONTENT_PACK_SOURCES and index.get("source") != source_fingerprint():
+            raise ContentPackError(f"{self.path} is older than the content it was built from; rebuild it")
+        self.game_version = index["game_version"]
+        self._offsets = index["sections"]  # name -> [offset, size]
+
+    def sections(self):
+        """Names of the sections in the pack"""
+        return list(self._offsets)
+
+    def __contains__(self, name):
+        return name in self._offsets
+
+    def section(self, name):
+        """Decode a section on first access and return the cached result afterwards"""
+        if name not in self._sections:
+            try:
+                offset, size = self._offsets[name]
+            except KeyError:
+                raise ContentPackError(f"Content pack has no '{name}' section") from None
+            self._sections[name] = json.loads(self._data[offset:offset + size])
+        return self._sections[name]
+
+    def close(self):
+        """Release the memory map. Sections already decoded stay usable."""
+        self._data.close()
+
+def collect_content():
+    """Gather every section of the pack from the Python definitions and art files"""
+    from world.items import _define_items, item_to_data
+    from world.locations import _define_locations, location_to_data
+    from world.enemies import _define_enemies, enemy_to_data
+    from ui.ascii_art import AsciiArtRegistry
+
+    content = {
+        "items": [item_to_data(item) for item in _define_items().values()],
+        "locations": [location_to_data(location) for location in _define_locations().values()],
+        "enemies": [enemy_to_data(enemy) for enemy in _define_enemies().values()],
+    }
+
+    # Read the art straight from disk, never from an existing pack
+    registry = AsciiArtRegistry(use_pack=False)
+    content["ascii_art"] = {key: registry.get(key) for key in registry.index}
+    return content
+
+def build_content_pack(path=None):
+    """
+    Compile all game content into a content pack.
+
+    Args:
+        path (str): Where to write the pack (defaults to Config.CONTENT_PACK_PATH)
+
+    Returns:
+        str: The path the pack was written to
+    """
+    path = path or get_pack_path()
+    source = source_fingerprint()
+    encoded = {
+        name: json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        for name, data in collect_content().items()
+    }
+
+    # Offsets depend on the index size, so grow the estimate until it settles
+    index_size = 0
+    while True:
+        offset = _HEADER.size + index_size
+        sections = {}
+        for name, data in encoded.items():
+            sections[name] = [offset, len(data)]
+            offset += len(data)
+        index = json.dumps({"game_version": Config.get_version(), "source": source, "sections": sections}).encode("utf-8")
+        if len(index) == index_size:
+            break
+        index_size = len(index)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(_HEADER.pack(PACK_MAGIC, PACK_FORMAT_VERSION, index_size))
+        file.write(index)
+        for data in encoded.values():
+            file.write(data)
+    os.replace(temp_path, path)
+    logger.info(f"Built content pack {path} ({offset} bytes, {len(encoded)} sections)")
+    return path
+
+_pack = None
+_pack_checked = False
+
+def get_content_pack():
+    """
+    Get the shared content pack, or None if packs are disabled or none has been built.
+    The game falls back to its Python definitions when this returns None.
+    """
+    global _pack, _pack_checked
+    if not _pack_checked:
+        _pack_checked = True
+        path = get_pack_path()
+        if Config.USE_CONTENT_PACK and os.path.exists(path):
+            try:
+                _pack = ContentPack(path)
+            except (OSError, ValueError, ContentPackError) as e:
+                logger.warning(f"Ignoring content pack: {str(e)}")
+    return _pack
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(build_content_pack(sys.argv[1] if len(sys.argv) > 1 else None))
@@ -0,0 +1,117 @@
+"""
+Replays for The Deep game.
+A recording is a game's seed and the actions taken, saved in the save file
+format. Replaying it runs the headless core as fast as it will go, which
+reproduces a bug exactly or serves as a benchmark.
+
+    python -m utils.replay saves/last_run.rec [--verbose] [--repeat N]
+"""
+
+import time
+import zlib
+import logging
+from utils.save_load import save_game, read_save, encode, SaveError
+
+logger = logging.getLogger('the_deep.utils.replay')
+
+RECORDING_VERSION = 1
+
+def snapshot_checksum(core):
+    """CRC32 of a game's snapshot, to tell whether two games ended up identical"""
+    return zlib.crc32(encode(core.snapshot()))
+
+def save_recording(core, filename):
+    """
+    Write the recording of a game, including a checksum of where it ended.
+
+    Returns:
+        bool: True if the recording was written
+    """
+    recording = core.recording()
+    recording["recording_version"] = RECORDING_VERSION
+    recording["checksum"] = snapshot_checksum(core)
+    try:
+        save_game(recording, filename)
+        return True
+    except (OSError, TypeError) as e:
+        logger.error(f"Error saving recording: {str(e)}")
+        return False
+
+def load_recording(filename):
+    """
+    Read a recording written by save_recording().
+
+    Raises:
+        FileNotFoundError: If there is no such file
+        SaveError: If the file is not a recording or is damaged
+    """
+    recording = read_save(filename)
+    if not isinstance(recording, dict) or recording.get("recording_version") != RECORDING_VERSION:
+        raise SaveError(f"{filename} is not a recording")
+    return recording
+
+def replay(recording, on_events=None):
+    """
+    Play a recording back without a UI, journal or save files.
+
+    Args:
+        recording (dict): As returned by GameCore.recording() or load_recording()
+        on_events: Optional callback called with the events of every action
+
+    Returns:
+        GameCore: The game as it stands after the last action
+    """
+    from game.core import GameCore
+    from game.player import Player
+
+    core = GameCore(Player(recording["player_name"] or "Explorer"), seed=recording["seed"])
+    if recording["start"] is not None:
+        core.restore(recording["start"])
+    # Saves are skipped and nothing is journaled, as during crash recovery
+    core._replaying = True
+    events = core.start()
+    if on_events is not None:
+        on_events(events)
+    for action in recording["actions"]:
+        events = core.step(action)
+        if on_events is not None:
+            on_events(events)
+    core._replaying = False
+    return core
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay a recorded game of The Deep")
+    parser.add_argument("recording", help="Recording file, e.g. saves/last_run.rec")
+    parser.add_argument("--verbose", action="store_true", help="Print the game's output")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay this many times and report the speed")
+    args = parser.parse_args()
+
+    try:
+        recording = load_recording(args.recording)
+    except (OSError, SaveError) as e:
+        raise SystemExit(f"Can't read recording: {str(e)}")
+
+    def show(events):
+        for event in events:
+            if event.text:
+                print(event.text)
+
+    actions = len(recording["actions"])
+    begin = time.perf_counter()
+    for run in range(args.repeat):
+        core = replay(recording, show if args.verbose and run == 0 else None)
+    elapsed = time.perf_counter() - begin
+
+    print(f"Seed {recording['seed']}, {actions} actions, turn {core.turn}, "
+          f"health {core.player.health}, at {core.current_location.name}, outcome {core.outcome or 'still playing'}")
+    if snapshot_checksum(core) == recording["checksum"]:
+        print("Replay matches the recorded game.")
+    else:
+        print("Replay DIVERGED from the recorded game.")
+    total = actions * args.repeat
+    print(f"{args.repeat} replay(s) in {elapsed:.3f}s ({total / elapsed if elapsed else 0:,.0f} actions/s)")
+
+if __name__ == "__main__":
+    main()
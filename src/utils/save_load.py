@@ -1,21 +1,300 @@
-def save_game(game_state, filename='save_file.json'):
-    import json
+"""
+Save and load for The Deep game.
+Snapshots are plain dicts/lists of primitives, written in a compact tagged
+binary format behind a versioned header. Files are replaced atomically
+(temp file, fsync, rename) and saves can run on a background thread.
+"""
 
-    with open(filename, 'w') as f:
-        json.dump(game_state, f)
-    print("Game saved successfully.")
+import os
+import queue
+import struct
+import logging
+import threading
+import zlib
 
-def load_game(filename='save_file.json'):
-    import json
+logger = logging.getLogger('the_deep.utils.save_load')
 
+SAVE_MAGIC = b"DEEPSAVE"
+SAVE_FORMAT_VERSION = 1
+# magic, format version, CRC32 of the payload, payload length
+_HEADER = struct.Struct("<8sHII")
+_DOUBLE = struct.Struct("<d")
+
+# One-byte type tags
+_NONE, _TRUE, _FALSE, _INT, _FLOAT, _STR, _BYTES, _LIST, _DICT = b"NTFIDSBLM"
+
+class SaveError(Exception):
+    """Raised when a save file can't be read"""
+
+def _write_varint(parts, value):
+    while value > 0x7F:
+        parts.append((value & 0x7F) | 0x80)
+        value >>= 7
+    parts.append(value)
+
+def _encode(value, out):
+    # out is a bytearray; ints are zigzag varints so small negatives stay small
+    if value is None:
+        out.append(_NONE)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif isinstance(value, int):
+        out.append(_INT)
+        _write_varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+    elif isinstance(value, float):
+        out.append(_FLOAT)
+        out += _DOUBLE.pack(value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        out.append(_STR)
+        _write_varint(out, len(data))
+        out += data
+    elif isinstance(value, (bytes, bytearray)):
+        out.append(_BYTES)
+        _write_varint(out, len(value))
+        out += value
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        out.append(_LIST)
+        _write_varint(out, len(value))
+        for item in value:
+            _encode(item, out)
+    elif isinstance(value, dict):
+        out.append(_DICT)
+        _write_varint(out, len(value))
+        for key, item in value.items():
+            _encode(key, out)
+            _encode(item, out)
+    else:
+        raise TypeError(f"Can't save a value of type {type(value).__name__}")
+
+def encode(value):
+    """Encode a snapshot (None, bool, int, float, str, bytes, list, tuple, set, dict) to bytes"""
+    out = bytearray()
+    _encode(value, out)
+    return bytes(out)
+
+def decode(data):
+    """Decode bytes produced by encode(). Tuples and sets come back as lists."""
+    data = memoryview(data)
+    end = len(data)
+
+    def varint(pos):
+        result = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result, pos
+            shift += 7
+
+    def value(pos):
+        tag = data[pos]
+        pos += 1
+        if tag == _NONE:
+            return None, pos
+        if tag == _TRUE:
+            return True, pos
+        if tag == _FALSE:
+            return False, pos
+        if tag == _INT:
+            raw, pos = varint(pos)
+            return (raw >> 1) if not raw & 1 else -((raw + 1) >> 1), pos
+        if tag == _FLOAT:
+            return _DOUBLE.unpack_from(data, pos)[0], pos + 8
+        if tag == _STR or tag == _BYTES:
+            size, pos = varint(pos)
+            if pos + size > end:
+                raise SaveError("Save data is truncated")
+            chunk = data[pos:pos + size]
+            return (str(chunk, "utf-8") if tag == _STR else bytes(chunk)), pos + size
+        if tag == _LIST:
+            count, pos = varint(pos)
+            items = []
+            for _ in range(count):
+                item, pos = value(pos)
+                items.append(item)
+            return items, pos
+        if tag == _DICT:
+            count, pos = varint(pos)
+            items = {}
+            for _ in range(count):
+                key, pos = value(pos)
+                items[key], pos = value(pos)
+            return items, pos
+        raise SaveError(f"Unknown type tag {tag!r} in save data")
+
+    try:
+        result, pos = value(0)
+    except IndexError:
+        raise SaveError("Save data is truncated") from None
+    if pos != end:
+        raise SaveError("Unexpected data after the end of the save")
+    return result
+
+def write_atomic(path, data):
+    """Replace a file with data so readers only ever see the old or the new contents"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
     try:
-        with open(filename, 'r') as f:
-            game_state = json.load(f)
-        print("Game loaded successfully.")
+        with open(temp_path, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        # Make the rename itself durable
+        fd = os.open(directory or ".", os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+def dumps(game_state):
+    """A snapshot as the bytes of a save file: versioned header, then the encoded payload"""
+    payload = encode(game_state)
+    return _HEADER.pack(SAVE_MAGIC, SAVE_FORMAT_VERSION, zlib.crc32(payload), len(payload)) + payload
+
+def loads(data, source="save data"):
+    """
+    Read a snapshot from the bytes of a save file.
+
+    Raises:
+        SaveError: If the data is not a save or is damaged
+    """
+    if len(data) < _HEADER.size:
+        raise SaveError(f"{source} is too short to be a save file")
+    magic, version, checksum, size = _HEADER.unpack_from(data, 0)
+    if magic != SAVE_MAGIC:
+        raise SaveError(f"{source} is not a save file")
+    if version != SAVE_FORMAT_VERSION:
+        raise SaveError(f"{source} uses save format {version}, expected {SAVE_FORMAT_VERSION}")
+    payload = memoryview(data)[_HEADER.size:]
+    if len(payload) != size or zlib.crc32(payload) != checksum:
+        raise SaveError(f"{source} is damaged")
+    return decode(payload)
+
+def save_game(game_state, filename='saves/save_data.sav'):
+    """
+    Write a snapshot to a save file.
+
+    Args:
+        game_state: The snapshot to save (see GameCore.snapshot())
+        filename (str): Path of the save file
+
+    Returns:
+        int: Size of the file in bytes
+    """
+    data = dumps(game_state)
+    write_atomic(filename, data)
+    logger.info(f"Game saved to {filename} ({len(data)} bytes)")
+    return len(data)
+
+def read_save(filename='saves/save_data.sav'):
+    """
+    Read a snapshot from a save file.
+
+    Raises:
+        FileNotFoundError: If there is no save file
+        SaveError: If the file is not a save or is damaged
+    """
+    with open(filename, "rb") as file:
+        data = file.read()
+    return loads(data, filename)
+
+def load_game(filename='saves/save_data.sav'):
+    """Read a snapshot from a save file, or return None if it is missing or unreadable"""
+    try:
+        game_state = read_save(filename)
+        logger.info(f"Game loaded from {filename}")
         return game_state
     except FileNotFoundError:
-        print("Save file not found. Starting a new game.")
+        logger.info(f"No save file at {filename}")
+        return None
+    except (OSError, SaveError) as e:
+        logger.error(f"Error loading save file: {str(e)}")
         return None
-    except json.JSONDecodeError:
-        print("Error loading save file. It may be corrupted.")
-        return None
\ No newline at end of file
+
+class BackgroundSaver:
+    """Writes saves on a worker thread so the game never waits for the disk"""
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.saves_written = 0
+        self.last_error = None
+
+    def save(self, game_state, filename, on_done=None):
+        """
+        Queue a snapshot to be written. The snapshot must not be modified afterwards.
+
+        Args:
+            on_done: Optional callback called on the worker thread with the
+                     exception raised by the write, or None on success
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+                self._thread.start()
+        self._queue.put((game_state, filename, on_done))
+
+    def flush(self):
+        """Block until every queued save has been written"""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            game_state, filename, on_done = self._queue.get()
+            callbacks = [on_done]
+            try:
+                # Only the newest pending save of a file is worth writing. The
+                # callbacks of the saves it replaces wait for it to be written.
+                pending = []
+                while True:
+                    try:
+                        pending.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                for later in pending:
+                    if later[1] == filename:
+                        game_state = later[0]
+                        callbacks.append(later[2])
+                    else:
+                        self._queue.put(later)
+                    self._queue.task_done()
+
+                error = None
+                try:
+                    save_game(game_state, filename)
+                    self.saves_written += 1
+                except Exception as e:
+                    logger.error(f"Background save to {filename} failed: {str(e)}")
+                    self.last_error = error = e
+                for callback in callbacks:
+                    self._finish(callback, error)
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _finish(on_done, error):
+        if on_done is not None:
+            try:
+                on_done(error)
+            except Exception as e:
+                logger.error(f"Save callback failed: {str(e)}")
+
+_saver = BackgroundSaver()
+
+def get_background_saver():
+    """Get the shared background saver"""
+    return _saver
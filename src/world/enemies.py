@@ -1,21 +1,55 @@
 import random
+from utils.content_pack import get_content_pack
+
+class EnemyTemplate:
+    """Immutable definition of an enemy type, shared by every enemy spawned from it."""
+    __slots__ = ("id", "name", "description", "max_health", "damage", "loot",
+                 "attack_min", "attack_max", "threat_level")
+
+    def __init__(self, id, name, description, health, damage, loot=None, attack_range=(5, 15), threat_level=0.5):
+        set_field = object.__setattr__
+        set_field(self, "id", id)
+        set_field(self, "name", name)
+        set_field(self, "description", description)
+        set_field(self, "max_health", health)
+        set_field(self, "damage", damage)
+        set_field(self, "loot", tuple(loot or ()))  # Possible item IDs to drop
+        set_field(self, "attack_min", attack_range[0])
+        set_field(self, "attack_max", attack_range[1])
+        set_field(self, "threat_level", threat_level)  # 0.0 to 1.0
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Enemy template '{self.id}' is immutable")
+
+    def spawn(self):
+        """Create a new enemy of this type at full health."""
+        enemy = Enemy.__new__(Enemy)
+        enemy.template = self
+        enemy.health = self.max_health
+        return enemy
 
 class Enemy:
     """Base class for all enemies in the game."""
+    # Only health changes during a fight; everything else is read from the template
+    __slots__ = ("template", "health")
+
     def __init__(self, id, name, description, health, damage, loot=None, attack_range=(5, 15), threat_level=0.5):
-        self.id = id
-        self.name = name
-        self.description = description
-        self.max_health = health
+        self.template = EnemyTemplate(id, name, description, health, damage, loot, attack_range, threat_level)
         self.health = health
-        self.damage = damage
-        self.loot = loot or []  # List of possible item IDs to drop
-        self.attack_min, self.attack_max = attack_range
-        self.threat_level = threat_level  # Add this attribute (0.0 to 1.0)
+
+    id = property(lambda self: self.template.id)
+    name = property(lambda self: self.template.name)
+    description = property(lambda self: self.template.description)
+    max_health = property(lambda self: self.template.max_health)
+    damage = property(lambda self: self.template.damage)
+    loot = property(lambda self: self.template.loot)
+    attack_min = property(lambda self: self.template.attack_min)
+    attack_max = property(lambda self: self.template.attack_max)
+    threat_level = property(lambda self: self.template.threat_level)
     
-    def attack(self):
+    def attack(self, rng=random):
         """Return damage for an attack"""
-        return random.randint(self.attack_min, self.attack_max)
+        return rng.randint(self.attack_min, self.attack_max)
     
     def take_damage(self, amount):
         """Enemy takes damage"""
@@ -36,11 +70,11 @@ class Enemy:
         """Check if enemy is still alive"""
         return self.health > 0
     
-    def get_loot(self):
+    def get_loot(self, rng=random):
         """Get random loot from enemy"""
         if not self.loot:
             return None
-        return random.choice(self.loot)
+        return rng.choice(self.loot)
     
     def describe(self):
         """Get enemy description with health status"""
@@ -56,8 +90,41 @@ class Enemy:
             
         return f"{self.description}\n\nIt appears {health_status}."
 
-# Define enemy types
+def enemy_to_data(enemy):
+    """Convert an enemy into plain data for the content pack."""
+    return {
+        "id": enemy.id,
+        "name": enemy.name,
+        "description": enemy.description,
+        "health": enemy.max_health,
+        "damage": enemy.damage,
+        "loot": enemy.loot,
+        "attack_range": [enemy.attack_min, enemy.attack_max],
+        "threat_level": enemy.threat_level,
+    }
+
 def initialize_enemies():
+    """Create and return a dictionary of all enemy types."""
+    pack = get_content_pack()
+    if pack is None:
+        return _define_enemies()
+    return {
+        data["id"]: Enemy(
+            data["id"],
+            data["name"],
+            data["description"],
+            health=data["health"],
+            damage=data["damage"],
+            loot=list(data["loot"]),
+            attack_range=tuple(data["attack_range"]),
+            threat_level=data["threat_level"]
+        )
+        for data in pack.section("enemies")
+    }
+
+# Define enemy types
+def _define_enemies():
+    """Built-in enemy definitions. This is the source compiled into the content pack."""
     enemies = {
         "mutated_angler": Enemy(
             "mutated_angler",
@@ -123,35 +190,78 @@ def initialize_enemies():
     }
     return enemies
 
-# Enemy spawn configuration per location
+# Enemy spawn weights per location; higher weights spawn more often
 ENEMY_SPAWNS = {
-    "erebus9": ["chemical_crawler"],
-    "trench": ["mutated_angler", "ghost_shoal"],
-    "ghost_reef": ["ghost_shoal", "plastic_kraken"],
-    "fishing_trawler": ["mutated_angler", "chemical_crawler"],
-    "black_bloom": ["bloom_stalker", "tidecaller_avatar"]
+    "erebus9": {"chemical_crawler": 1},
+    "trench": {"mutated_angler": 1, "ghost_shoal": 1},
+    "ghost_reef": {"ghost_shoal": 1, "plastic_kraken": 1},
+    "fishing_trawler": {"mutated_angler": 1, "chemical_crawler": 1},
+    "black_bloom": {"bloom_stalker": 1, "tidecaller_avatar": 1}
 }
 
-def get_random_enemy_for_location(location_id):
+class SpawnTable:
+    """Weighted choice between enemy types, sampled in O(1) with the alias method."""
+    __slots__ = ("enemy_ids", "_probability", "_alias")
+
+    def __init__(self, weights):
+        """
+        Args:
+            weights (dict): Enemy ID -> relative spawn weight
+        """
+        self.enemy_ids = tuple(enemy_id for enemy_id, weight in weights.items() if weight > 0)
+        count = len(self.enemy_ids)
+        total = sum(weights[enemy_id] for enemy_id in self.enemy_ids)
+        scaled = [weights[enemy_id] * count / total for enemy_id in self.enemy_ids] if count else []
+        probability = [1.0] * count
+        alias = list(range(count))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probability[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1.0 up to rounding error
+
+        self._probability = tuple(probability)
+        self._alias = tuple(alias)
+
+    def __bool__(self):
+        return bool(self.enemy_ids)
+
+    def sample(self, rng=random):
+        """Pick an enemy ID according to the weights."""
+        column = int(rng.random() * len(self.enemy_ids))
+        if rng.random() < self._probability[column]:
+            return self.enemy_ids[column]
+        return self.enemy_ids[self._alias[column]]
+
+_TEMPLATES = None
+_SPAWN_TABLES = None
+
+def get_enemy_templates():
+    """Get the enemy templates by ID, built once on first use."""
+    global _TEMPLATES
+    if _TEMPLATES is None:
+        _TEMPLATES = {enemy_id: enemy.template for enemy_id, enemy in initialize_enemies().items()}
+    return _TEMPLATES
+
+def get_spawn_table(location_id):
+    """Get the spawn table for a location, or None if nothing spawns there."""
+    global _SPAWN_TABLES
+    if _SPAWN_TABLES is None:
+        _SPAWN_TABLES = {location: SpawnTable(weights) for location, weights in ENEMY_SPAWNS.items()}
+    return _SPAWN_TABLES.get(location_id)
+
+def get_random_enemy_for_location(location_id, rng=random):
     """Get a random enemy type appropriate for the given location"""
-    if location_id not in ENEMY_SPAWNS:
+    table = get_spawn_table(location_id)
+    if not table:
         return None
-    
-    enemy_types = ENEMY_SPAWNS[location_id]
-    if not enemy_types:
+
+    template = get_enemy_templates().get(table.sample(rng))
+    if template is None:
         return None
-        
-    enemy_id = random.choice(enemy_types)
-    enemies = initialize_enemies()
-    
-    if enemy_id in enemies:
-        return Enemy(
-            enemies[enemy_id].id,
-            enemies[enemy_id].name,
-            enemies[enemy_id].description,
-            enemies[enemy_id].max_health,
-            enemies[enemy_id].damage,
-            enemies[enemy_id].loot
-        )
-    
-    return None
\ No newline at end of file
+    return template.spawn()
@@ -3,29 +3,45 @@ Items for The Deep game.
 Defines the items, their properties, and their effects.
 """
 
-from game.player import Player
+from utils.content_pack import get_content_pack
 
 class Item:
+    """
+    Item definition. Definitions are shared flyweights and can't be modified;
+    the game handles ItemInstance objects, which hold the per-copy state.
+    """
+    __slots__ = ("id", "name", "description", "usable", "on_pickup_message", "consumable")
+
     def __init__(self, item_id, name, description, usable=False, on_pickup_message=None, consumable=False):
-        self.id = item_id
-        self.name = name
-        self.description = description
-        self.usable = usable
-        self.on_pickup_message = on_pickup_message
-        self.consumable = consumable
+        set_field = object.__setattr__
+        set_field(self, "id", item_id)
+        set_field(self, "name", name)
+        set_field(self, "description", description)
+        set_field(self, "usable", usable)
+        set_field(self, "on_pickup_message", on_pickup_message)
+        set_field(self, "consumable", consumable)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Item definition '{self.id}' is immutable")
+
+    def instance(self):
+        """Create a new copy of this item."""
+        return ItemInstance(self)
         
-    def use(self, player, location=None):
+    def use(self, player, location=None, instance=None):
         """Default use method, should be overridden by specific items"""
         if not self.usable:
             return f"You can't use the {self.name} here."
         return f"You used the {self.name}, but nothing happened."
 
 class HealingItem(Item):
+    __slots__ = ("heal_amount",)
+
     def __init__(self, item_id, name, description, heal_amount, on_pickup_message=None):
         super().__init__(item_id, name, description, usable=True, on_pickup_message=on_pickup_message, consumable=True)
-        self.heal_amount = heal_amount
+        object.__setattr__(self, "heal_amount", heal_amount)
         
-    def use(self, player, location=None):
+    def use(self, player, location=None, instance=None):
         """Use the healing item to restore health"""
         if player.health >= player.max_health:
             return f"You are already at full health."
@@ -36,10 +52,12 @@ class HealingItem(Item):
         return f"You used the {self.name} and recovered {player.health - old_health} health points."
 
 class SampleContainer(Item):
+    __slots__ = ()
+
     def __init__(self, item_id, name, description, on_pickup_message=None):
         super().__init__(item_id, name, description, usable=True, on_pickup_message=on_pickup_message, consumable=True)
         
-    def use(self, player, location=None):
+    def use(self, player, location=None, instance=None):
         """Use the sample container to collect a sample from the environment"""
         sample_name = f"Sample from {location.name if location else 'Unknown Location'}"
         player.samples.append(sample_name)
@@ -47,21 +65,25 @@ class SampleContainer(Item):
 
 class WeaponItem(Item):
     """Weapon item that enhances player attack damage"""
+    __slots__ = ("damage_bonus",)
+
     def __init__(self, item_id, name, description, damage_bonus, on_pickup_message=None, consumable=False):
         super().__init__(item_id, name, description, usable=True, on_pickup_message=on_pickup_message, consumable=consumable)
-        self.damage_bonus = damage_bonus
-        self.equipped = False
+        object.__setattr__(self, "damage_bonus", damage_bonus)
         
-    def use(self, player, location=None):
+    def use(self, player, location=None, instance=None):
         """Equip/unequip the weapon"""
+        if instance is None:
+            raise ValueError(f"Only a copy of the {self.name} can be equipped, not its definition")
+
         # Check if player has a weapon equipped attribute, add if not
         if not hasattr(player, 'equipped_weapon'):
             player.equipped_weapon = None
             
-        if player.equipped_weapon == self:
+        if player.equipped_weapon is instance:
             # Unequip the weapon
             player.equipped_weapon = None
-            self.equipped = False
+            instance.equipped = False
             return f"You put away the {self.name}."
         else:
             # Unequip current weapon if any
@@ -69,98 +91,176 @@ class WeaponItem(Item):
                 player.equipped_weapon.equipped = False
                 
             # Equip this weapon
-            player.equipped_weapon = self
-            self.equipped = True
+            player.equipped_weapon = instance
+            instance.equipped = True
             return f"You equipped the {self.name}, increasing your attack damage by {self.damage_bonus}."
 
-# Initialize all items in the game
-_ITEMS = {
-    # Basic equipment
-    "binoculars": Item("binoculars", "Binoculars", "Standard binoculars for observing distant objects.", usable=True),
-    "oxygen_tank": Item("oxygen_tank", "Oxygen Tank", "An auxiliary oxygen tank for deep dives.", usable=True),
+class ItemInstance:
+    """
+    One copy of an item. Only the mutable state lives here; every other
+    attribute (name, description, damage_bonus, ...) is read from the definition.
+    """
+    __slots__ = ("definition", "equipped", "charges")
+
+    def __init__(self, definition, charges=1):
+        self.definition = definition
+        self.equipped = False
+        self.charges = charges  # Uses left before a consumable is used up
+
+    def __getattr__(self, name):
+        if name in ItemInstance.__slots__:
+            raise AttributeError(name)  # Slot not set yet, e.g. while unpickling
+        return getattr(self.definition, name)
+
+    def use(self, player, location=None):
+        """Use this copy of the item"""
+        return self.definition.use(player, location, self)
+
+    def __repr__(self):
+        return f"<ItemInstance {self.definition.id}>"
+
+def _define_items():
+    """Built-in item definitions. This is the source compiled into the content pack."""
+    return {
+        # Basic equipment
+        "binoculars": Item("binoculars", "Binoculars", "Standard binoculars for observing distant objects.", usable=True),
+        "oxygen_tank": Item("oxygen_tank", "Oxygen Tank", "An auxiliary oxygen tank for deep dives.", usable=True),
     
-    # Samples and research items
-    "water_sample": Item("water_sample", "Water Sample", "A sample of water from the reef area.", usable=False),
-    "plastic_sample": Item("plastic_sample", "Plastic Debris Sample", "A sample of microplastic pollution.", usable=False),
-    "chemical_sample": Item("chemical_sample", "Chemical Waste Sample", "A vial containing unidentified chemical waste.", usable=False),
-    "thermal_sample": Item("thermal_sample", "Thermal Vent Sample", "A sample of mineral-rich water from a hydrothermal vent.", usable=False),
-    "pressure_sample": Item("pressure_sample", "Deep Pressure Sample", "A specially designed container holding water from extreme depths.", usable=False),
-    "sample_vial": SampleContainer("sample_vial", "Sample Vial", "A sterile container for collecting biological samples.", on_pickup_message="You can use this to collect samples for research."),
+        # Samples and research items
+        "water_sample": Item("water_sample", "Water Sample", "A sample of water from the reef area.", usable=False),
+        "plastic_sample": Item("plastic_sample", "Plastic Debris Sample", "A sample of microplastic pollution.", usable=False),
+        "chemical_sample": Item("chemical_sample", "Chemical Waste Sample", "A vial containing unidentified chemical waste.", usable=False),
+        "thermal_sample": Item("thermal_sample", "Thermal Vent Sample", "A sample of mineral-rich water from a hydrothermal vent.", usable=False),
+        "pressure_sample": Item("pressure_sample", "Deep Pressure Sample", "A specially designed container holding water from extreme depths.", usable=False),
+        "sample_vial": SampleContainer("sample_vial", "Sample Vial", "A sterile container for collecting biological samples.", on_pickup_message="You can use this to collect samples for research."),
     
-    # Health items
-    "medkit": HealingItem("medkit", "Medical Kit", "A waterproof first-aid kit designed for marine expeditions.", 50, "This will be useful if you get injured."),
+        # Health items
+        "medkit": HealingItem("medkit", "Medical Kit", "A waterproof first-aid kit designed for marine expeditions.", 50, "This will be useful if you get injured."),
     
-    # Story items
-    "research_log": Item("research_log", "Dr. Elson's Research Log", "A tablet containing research data from Dr. Mira Elson.", usable=True),
-    "strange_artifact": Item("strange_artifact", "Strange Artifact", "An object of unknown origin with peculiar markings.", usable=True),
-    "mutated_coral": Item("mutated_coral", "Mutated Coral Sample", "A piece of coral showing signs of unusual growth patterns.", usable=False),
-    "elson_final_notes": Item("elson_final_notes", "Dr. Elson's Final Notes", "The last recorded observations of Dr. Elson regarding 'The Awakening'.", usable=True),
-    "tidecaller_essence": Item("tidecaller_essence", "Tidecaller Essence", "A strange, pulsating substance that seems to be connected to the ocean itself.", usable=True),
+        # Story items
+        "research_log": Item("research_log", "Dr. Elson's Research Log", "A tablet containing research data from Dr. Mira Elson.", usable=True),
+        "strange_artifact": Item("strange_artifact", "Strange Artifact", "An object of unknown origin with peculiar markings.", usable=True),
+        "mutated_coral": Item("mutated_coral", "Mutated Coral Sample", "A piece of coral showing signs of unusual growth patterns.", usable=False),
+        "elson_final_notes": Item("elson_final_notes", "Dr. Elson's Final Notes", "The last recorded observations of Dr. Elson regarding 'The Awakening'.", usable=True),
+        "tidecaller_essence": Item("tidecaller_essence", "Tidecaller Essence", "A strange, pulsating substance that seems to be connected to the ocean itself.", usable=True),
     
-    # Additional healing items
-    "small_medkit": HealingItem(
-        "small_medkit", 
-        "Small First Aid Kit", 
-        "A small kit with basic first aid supplies.", 
-        25, 
-        "A basic first aid kit that could help with minor injuries."
-    ),
-    "large_medkit": HealingItem(
-        "large_medkit", 
-        "Advanced Medical Kit",
-        "A comprehensive medical kit with advanced treatments.",
-        75,
-        "This advanced medical kit could save your life in dangerous situations."
-    ),
-    "stim_pack": HealingItem(
-        "stim_pack",
-        "Emergency Stimulant",
-        "A fast-acting emergency medical stimulant.",
-        40,
-        "For emergency use only. Rapidly boosts recovery but with potential side effects."
-    ),
-    "healing_gel": HealingItem(
-        "healing_gel",
-        "Bio-Regenerative Gel",
-        "Advanced gel that accelerates natural healing processes.",
-        30,
-        "The latest in bio-regenerative technology. Apply directly to wounds."
-    ),
+        # Additional healing items
+        "small_medkit": HealingItem(
+            "small_medkit", 
+            "Small First Aid Kit", 
+            "A small kit with basic first aid supplies.", 
+            25, 
+            "A basic first aid kit that could help with minor injuries."
+        ),
+        "large_medkit": HealingItem(
+            "large_medkit", 
+            "Advanced Medical Kit",
+            "A comprehensive medical kit with advanced treatments.",
+            75,
+            "This advanced medical kit could save your life in dangerous situations."
+        ),
+        "stim_pack": HealingItem(
+            "stim_pack",
+            "Emergency Stimulant",
+            "A fast-acting emergency medical stimulant.",
+            40,
+            "For emergency use only. Rapidly boosts recovery but with potential side effects."
+        ),
+        "healing_gel": HealingItem(
+            "healing_gel",
+            "Bio-Regenerative Gel",
+            "Advanced gel that accelerates natural healing processes.",
+            30,
+            "The latest in bio-regenerative technology. Apply directly to wounds."
+        ),
     
-    # Weapons
-    "dive_knife": WeaponItem(
-        "dive_knife",
-        "Diving Knife",
-        "A standard diving knife with a serrated edge.",
-        5,
-        "A basic tool for divers, but can also be used for self-defense."
-    ),
-    "harpoon_gun": WeaponItem(
-        "harpoon_gun",
-        "Harpoon Gun",
-        "A compact underwater harpoon gun with limited range.",
-        15,
-        "Designed for underwater hunting and self-defense."
-    ),
-    "sonic_disruptor": WeaponItem(
-        "sonic_disruptor",
-        "Sonic Disruptor",
-        "An experimental device that emits targeted sonic waves.",
-        20,
-        "This prototype weapon disrupts the nervous system of marine predators."
-    ),
-    "plasma_cutter": WeaponItem(
-        "plasma_cutter",
-        "Plasma Cutting Tool",
-        "An industrial tool that generates a focused plasma arc.",
-        25,
-        "Designed for cutting through metal, but dangerous in combat too."
-    )
-}
+        # Weapons
+        "dive_knife": WeaponItem(
+            "dive_knife",
+            "Diving Knife",
+            "A standard diving knife with a serrated edge.",
+            5,
+            "A basic tool for divers, but can also be used for self-defense."
+        ),
+        "harpoon_gun": WeaponItem(
+            "harpoon_gun",
+            "Harpoon Gun",
+            "A compact underwater harpoon gun with limited range.",
+            15,
+            "Designed for underwater hunting and self-defense."
+        ),
+        "sonic_disruptor": WeaponItem(
+            "sonic_disruptor",
+            "Sonic Disruptor",
+            "An experimental device that emits targeted sonic waves.",
+            20,
+            "This prototype weapon disrupts the nervous system of marine predators."
+        ),
+        "plasma_cutter": WeaponItem(
+            "plasma_cutter",
+            "Plasma Cutting Tool",
+            "An industrial tool that generates a focused plasma arc.",
+            25,
+            "Designed for cutting through metal, but dangerous in combat too."
+        )
+    }
+
+# Item classes by name, used to rebuild items from content pack data
+ITEM_TYPES = {cls.__name__: cls for cls in (Item, HealingItem, SampleContainer, WeaponItem)}
+
+def item_to_data(item):
+    """Convert an item definition into plain data for the content pack."""
+    item = getattr(item, "definition", item)
+    data = {
+        "type": type(item).__name__,
+        "id": item.id,
+        "name": item.name,
+        "description": item.description,
+        "usable": item.usable,
+        "consumable": item.consumable,
+        "on_pickup_message": item.on_pickup_message,
+    }
+    if isinstance(item, HealingItem):
+        data["heal_amount"] = item.heal_amount
+    elif isinstance(item, WeaponItem):
+        data["damage_bonus"] = item.damage_bonus
+    return data
+
+def item_from_data(data):
+    """Rebuild an item from content pack data."""
+    item_type = data["type"]
+    if item_type == "HealingItem":
+        return HealingItem(data["id"], data["name"], data["description"], data["heal_amount"], data["on_pickup_message"])
+    if item_type == "WeaponItem":
+        return WeaponItem(data["id"], data["name"], data["description"], data["damage_bonus"], data["on_pickup_message"], data["consumable"])
+    if item_type == "SampleContainer":
+        return SampleContainer(data["id"], data["name"], data["description"], data["on_pickup_message"])
+    return Item(data["id"], data["name"], data["description"], data["usable"], data["on_pickup_message"], data["consumable"])
+
+_ITEMS = None
+
+def _get_items():
+    """Load the item table on first use, from the content pack if one is built."""
+    global _ITEMS
+    if _ITEMS is None:
+        pack = get_content_pack()
+        if pack is not None:
+            _ITEMS = {data["id"]: item_from_data(data) for data in pack.section("items")}
+        else:
+            _ITEMS = _define_items()
+    return _ITEMS
+
+def get_item_definitions():
+    """Get the shared item definitions by ID."""
+    return _get_items()
+
+def get_item_definition(item_id):
+    """Get the shared definition of an item by its ID, or None."""
+    return _get_items().get(item_id.lower())
 
 def get_item_by_id(item_id):
-    """Get an item instance by its ID."""
-    item = _ITEMS.get(item_id.lower())
-    if not item:
+    """Get a new instance of an item by its ID."""
+    definition = _get_items().get(item_id.lower())
+    if not definition:
         return None
-    return item
\ No newline at end of file
+    return definition.instance()
\ No newline at end of file
@@ -1,8 +1,15 @@
 """
 Locations for The Deep game.
 Defines the locations, their connections, and their contents.
+
+The world as it is at the start of a game is built once per process as a
+WorldTemplate and shared by every game. Each game only makes its own
+Location for a room when it enters or changes it (see GameState).
 """
 
+from types import MappingProxyType
+from utils.content_pack import get_content_pack
+
 class Location:
     def __init__(self, id, name, description, exits=None, items=None):
         self.id = id
@@ -11,28 +18,111 @@ class Location:
         self.exits = exits or {}  # Dictionary of direction -> location_id
         self.items = items or []  # List of items in this location
         self.visited = False      # Track if player has been here
+        self.version = 0          # Bumped when exits or items change so menus can be cached
         
     def add_exit(self, direction, location_id):
         """Add an exit from this location."""
         self.exits[direction] = location_id
+        self.version += 1
         
     def remove_exit(self, direction):
         """Remove an exit from this location."""
         if direction in self.exits:
             del self.exits[direction]
+            self.version += 1
             
     def add_item(self, item):
         """Add an item to this location."""
         if item not in self.items:
             self.items.append(item)
+            self.version += 1
             
     def remove_item(self, item):
         """Remove an item from this location."""
         if item in self.items:
             self.items.remove(item)
+            self.version += 1
+
+    @classmethod
+    def from_template(cls, template):
+        """A game's own copy of a template location, with new item instances"""
+        return cls(template.id, template.name, template.description, exits=dict(template.exits),
+                   items=[item.instance() for item in template.items])
+
+class LocationTemplate:
+    """
+    A location as it is at the start of a game. Shared between games, so it
+    can't be changed: it reads like a Location, but its exits are read-only,
+    its items are the shared item definitions and its add/remove methods
+    raise. GameState.enter_location() gives a game its own copy to change.
+    """
+    __slots__ = ("id", "name", "description", "exits", "items")
+    visited = False  # Nobody has been to a template location
+    version = 0
+
+    def __init__(self, id, name, description, exits, item_ids):
+        from world.items import get_item_definition
+        set_field = object.__setattr__
+        set_field(self, "id", id)
+        set_field(self, "name", name)
+        set_field(self, "description", description)
+        set_field(self, "exits", MappingProxyType(dict(exits)))
+        definitions = (get_item_definition(item_id) for item_id in item_ids)
+        set_field(self, "items", tuple(item for item in definitions if item is not None))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Location template '{self.id}' is immutable")
+
+    def _read_only(self, *args):
+        raise AttributeError(f"Location template '{self.id}' is immutable; change the game's own copy")
+
+    add_exit = remove_exit = add_item = remove_item = _read_only
+
+class WorldTemplate:
+    """Every location at the start of a game, and the routes between them"""
+    def __init__(self, templates, starting_location_id="ship_deck"):
+        from world.routes import RouteTable
+        self.locations = MappingProxyType({template.id: template for template in templates})
+        self.starting_location_id = starting_location_id
+        # Exits are the same in every game, so the routes are too
+        self.routes = RouteTable(self.locations)
+
+_WORLD = None
+
+def get_world_template():
+    """Get the shared world template, built once on first use."""
+    global _WORLD
+    if _WORLD is None:
+        pack = get_content_pack()
+        if pack is None:
+            records = [location_to_data(location) for location in _define_locations().values()]
+        else:
+            records = pack.section("locations")
+        _WORLD = WorldTemplate(
+            LocationTemplate(data["id"], data["name"], data["description"], data["exits"], data["items"])
+            for data in records
+        )
+    return _WORLD
+
+def location_to_data(location):
+    """Convert a location into plain data for the content pack."""
+    return {
+        "id": location.id,
+        "name": location.name,
+        "description": location.description,
+        "exits": location.exits,
+        "items": [item.id for item in location.items if item],
+    }
 
 def initialize_locations():
-    """Create and return a dictionary of all game locations."""
+    """Create and return a dictionary of all game locations, each a game's own copy."""
+    return {
+        location_id: Location.from_template(template)
+        for location_id, template in get_world_template().locations.items()
+    }
+
+def _define_locations():
+    """Built-in location definitions. This is the source compiled into the content pack."""
     from world.items import get_item_by_id
     
     # Create the locations dictionary
@@ -168,5 +258,5 @@ def initialize_locations():
 
 def get_starting_location():
     """Return the starting location for the game."""
-    locations = initialize_locations()
-    return locations["ship_deck"]
\ No newline at end of file
+    world = get_world_template()
+    return Location.from_template(world.locations[world.starting_location_id])
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Routes for The Deep game.
+Precomputes shortest routes and reachability between every pair of locations
+and reports exits that lead nowhere or can't be walked back.
+"""
+
+from collections import deque
+
+class RouteTable:
+    """All-pairs shortest routes over the location exits, computed once per world"""
+    def __init__(self, locations):
+        """
+        Args:
+            locations (dict): Location ID -> Location
+        """
+        self.location_ids = list(locations)
+        self._exits = {location_id: dict(location.exits) for location_id, location in locations.items()}
+        # _next_hop[a][b] is the exit to take from a towards b; _distance[a][b] the number of moves
+        self._next_hop = {}
+        self._distance = {}
+        for location_id in self.location_ids:
+            self._search_from(location_id)
+
+    def _search_from(self, start):
+        """Breadth-first search from one location, recording the first move towards each target"""
+        next_hop = {}
+        distance = {start: 0}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            for direction, target in self._exits[current].items():
+                if target in distance or target not in self._exits:
+                    continue
+                distance[target] = distance[current] + 1
+                # Targets next to the start are reached through their own exit,
+                # everything further away through the same first move as its parent
+                next_hop[target] = direction if current == start else next_hop[current]
+                queue.append(target)
+        self._next_hop[start] = next_hop
+        self._distance[start] = distance
+
+    def is_reachable(self, start, target):
+        """Check if target can be reached from start"""
+        return target in self._distance.get(start, ())
+
+    def distance(self, start, target):
+        """Number of moves on the shortest route, or None if there is no route"""
+        return self._distance.get(start, {}).get(target)
+
+    def next_hop(self, start, target):
+        """The exit to take from start towards target, or None"""
+        return self._next_hop.get(start, {}).get(target)
+
+    def route(self, start, target):
+        """
+        The shortest route between two locations.
+
+        Returns:
+            list: (direction, location_id) moves, empty if start == target,
+                  or None if target can't be reached
+        """
+        if not self.is_reachable(start, target):
+            return None
+        moves = []
+        current = start
+        while current != target:
+            direction = self._next_hop[current][target]
+            current = self._exits[current][direction]
+            moves.append((direction, current))
+        return moves
+
+    def reachable_from(self, start):
+        """IDs of every location reachable from start, start included"""
+        return set(self._distance.get(start, ()))
+
+    def dangling_exits(self):
+        """(location_id, direction, target) for exits that lead to unknown locations"""
+        return [
+            (location_id, direction, target)
+            for location_id, exits in self._exits.items()
+            for direction, target in exits.items()
+            if target not in self._exits
+        ]
+
+    def one_way_exits(self):
+        """(location_id, direction, target) for exits with no way straight back"""
+        return [
+            (location_id, direction, target)
+            for location_id, exits in self._exits.items()
+            for direction, target in exits.items()
+            if target in self._exits and location_id not in self._exits[target].values()
+        ]
+
+    def unreachable_from(self, start):
+        """IDs of locations that can never be reached from start"""
+        reachable = self._distance.get(start, {})
+        return [location_id for location_id in self.location_ids if location_id not in reachable]
+
+    def report(self, start):
+        """Human readable summary of exit problems in the world"""
+        lines = []
+        for location_id, direction, target in self.dangling_exits():
+            lines.append(f"Dangling exit: {location_id} --{direction}--> {target} (no such location)")
+        for location_id, direction, target in self.one_way_exits():
+            lines.append(f"One-way exit: {location_id} --{direction}--> {target} (no exit back)")
+        for location_id in self.unreachable_from(start):
+            lines.append(f"Unreachable from {start}: {location_id}")
+        return "\n".join(lines) if lines else "No exit problems found."
+
+if __name__ == "__main__":
+    from world.locations import initialize_locations
+    print(RouteTable(initialize_locations()).report("ship_deck"))
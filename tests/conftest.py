@@ -0,0 +1,54 @@
+"""
+Shared test setup for The Deep.
+The game is run from src, so its packages are imported from there.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+@pytest.fixture(autouse=True)
+def work_dir(tmp_path, monkeypatch):
+    """Run every test in its own directory so saves and journals don't leak between tests"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+@pytest.fixture
+def new_game():
+    """Make a started game with a fixed seed"""
+    from game.core import GameCore
+    from game.player import Player
+
+    def make(seed=7, name="Tester"):
+        core = GameCore(Player(name), seed=seed)
+        core.start()
+        return core
+    return make
+
+@pytest.fixture
+def play():
+    """Take random actions in a game until it ends or the actions run out; returns them"""
+    def choose(core, rng):
+        if core.in_combat:
+            return rng.choice(("attack", "attack", "attack", "flee", "use medkit"))
+        location = core.current_location
+        roll = rng.random()
+        if roll < 0.6 and location.exits:
+            return rng.choice(sorted(location.exits))
+        if roll < 0.8 and location.items:
+            return f"take {rng.choice(location.items).name.lower()}"
+        return rng.choice(("look", "inventory", "travel ship deck", "use medkit", "examine binoculars"))
+
+    def run(core, rng, actions):
+        taken = []
+        for _ in range(actions):
+            if not core.game_running:
+                break
+            action = choose(core, rng)
+            core.step(action)
+            taken.append(action)
+        return taken
+    return run
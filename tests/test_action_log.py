@@ -0,0 +1,66 @@
+"""
+Tests for the action journal: recovery after a crash, torn tails and syncing.
+"""
+
+import os
+import random
+import time
+
+from game.core import GameCore
+from game.player import Player
+from utils.action_log import ActionJournal
+from utils.save_load import get_background_saver
+
+def _journaled_game(seed):
+    core = GameCore(Player("Tester"), seed=seed)
+    core.journal = ActionJournal("journal.wal", "autosave.sav", snapshot_interval=7)
+    core.start()
+    return core
+
+def _crash(core):
+    """Leave the journal as a crash would: appended, but never closed"""
+    core.journal.sync()
+    get_background_saver().flush()
+
+def test_recovery_rebuilds_the_game(play):
+    game = _journaled_game(seed=1)
+    play(game, random.Random(2), 120)
+    # Crash mid-fight; a finished game would have discarded its journal
+    assert game.in_combat
+    _crash(game)
+
+    recovered = GameCore(Player("Tester"))
+    recovered.journal = ActionJournal("journal.wal", "autosave.sav", snapshot_interval=7)
+    assert recovered.recover() is not None
+    assert recovered.snapshot() == game.snapshot()
+
+def test_torn_tail_is_ignored():
+    journal = ActionJournal("journal.wal", "autosave.sav")
+    journal.start({"turn": 0})
+    for i in range(5):
+        journal.append(f"action {i}", [i])
+    journal.close()
+    get_background_saver().flush()
+
+    segment = f"journal.wal.{journal._segment}"
+    with open(segment, "r+b") as file:
+        file.truncate(os.path.getsize(segment) - 3)
+
+    snapshot, records, sequence = ActionJournal("journal.wal", "autosave.sav").recover()
+    assert snapshot == {"turn": 0}
+    assert records == [(f"action {i}", [i]) for i in range(4)]
+    assert sequence == 4
+
+def test_nothing_to_recover_without_a_journal():
+    assert ActionJournal("journal.wal", "autosave.sav").recover() is None
+
+def test_idle_appends_are_synced(monkeypatch):
+    journal = ActionJournal("journal.wal", "autosave.sav", fsync_interval=0.05)
+    journal.start({"turn": 0})
+    journal.append("look", [])
+    assert journal._unsynced == 1
+    deadline = time.monotonic() + 5
+    while journal._unsynced and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert journal._unsynced == 0
+    journal.close()
@@ -0,0 +1,48 @@
+"""
+Tests for counter-based combat dice and batched combat resolution.
+"""
+
+import pytest
+
+from game.combat import MIN_ARRAY_BATCH, CombatBatch, CombatDice, combat_roll
+from game.core import GameCore
+from game.player import Player
+from world.enemies import get_enemy_templates
+
+def _fighting_games(count):
+    enemy_ids = sorted(get_enemy_templates())
+    games = []
+    for seed in range(count):
+        game = GameCore(Player(f"Diver {seed}"), seed=seed)
+        game.start()
+        game.current_enemy = get_enemy_templates()[enemy_ids[seed % len(enemy_ids)]].spawn()
+        games.append(game)
+    return games
+
+def _action(game, tick):
+    return "flee" if (game.seed + tick) % 5 == 0 else "attack"
+
+def test_dice_depend_only_on_seed_round_and_slot():
+    assert combat_roll(42, 3, 1) == combat_roll(42, 3, 1)
+    assert combat_roll(42, 3, 0) != combat_roll(42, 3, 1) != combat_roll(42, 4, 1)
+    dice = CombatDice(42, 3)
+    assert [dice.random(), dice.random()] == [combat_roll(42, 3, 0), combat_roll(42, 3, 1)]
+    assert all(0.0 <= combat_roll(seed, 0, 0) < 1.0 for seed in range(1000))
+
+@pytest.mark.parametrize("count", [3, MIN_ARRAY_BATCH + 8])
+def test_batched_fights_match_stepped_fights(count):
+    stepped, batched = _fighting_games(count), _fighting_games(count)
+    batch = CombatBatch()
+    for tick in range(30):
+        stepped_events = {}
+        for game in stepped:
+            stepped_events[game.seed] = [event.text for event in game.step(_action(game, tick))]
+        for game in batched:
+            events = batch.submit(game, _action(game, tick))
+            if events is not None:
+                assert [event.text for event in events] == stepped_events[game.seed]
+        for game, events in batch.resolve():
+            assert [event.text for event in events] == stepped_events[game.seed]
+    assert [game.snapshot() for game in batched] == [game.snapshot() for game in stepped]
+    # Some games should have won, fled or died along the way
+    assert any(not game.in_combat for game in stepped)
@@ -0,0 +1,81 @@
+"""
+Tests for the headless game core: snapshots, seeded replays and command parsing.
+"""
+
+import random
+
+from game.core import GameCore
+from game.player import Player
+from utils.config import Config
+from utils.replay import replay, snapshot_checksum
+
+def test_snapshot_restores_an_identical_game(new_game, play):
+    game = new_game(seed=3)
+    play(game, random.Random(1), 120)
+    assert game.combat_round  # Fights are part of what is restored
+    snapshot = game.snapshot()
+
+    copy = GameCore(Player("Someone else"), seed=99)
+    copy.restore(snapshot)
+    assert copy.snapshot() == snapshot
+
+    # Both carry on the same way, rolls included
+    actions = play(game, random.Random(2), 40)
+    for action in actions:
+        copy.step(action)
+    assert copy.snapshot() == game.snapshot()
+
+def test_same_seed_plays_out_the_same(new_game, play):
+    first, second = new_game(seed=11), new_game(seed=11)
+    actions = play(first, random.Random(2), 120)
+    for action in actions:
+        second.step(action)
+    assert snapshot_checksum(first) == snapshot_checksum(second)
+
+def test_recording_replays_to_the_same_game(new_game, play):
+    game = new_game(seed=9)
+    play(game, random.Random(1), 150)
+    assert game.outcome == "dead"
+    assert snapshot_checksum(replay(game.recording())) == snapshot_checksum(game)
+
+def test_recording_of_a_restored_game_replays(new_game, play):
+    game = new_game(seed=8)
+    play(game, random.Random(1), 60)
+    game.restore(game.snapshot())
+    play(game, random.Random(2), 60)
+    recording = game.recording()
+    assert recording["start"] is not None
+    assert snapshot_checksum(replay(recording)) == snapshot_checksum(game)
+
+def test_long_recordings_keep_a_bounded_history(new_game, play, monkeypatch):
+    monkeypatch.setattr(Config, "RECORDING_MAX_ACTIONS", 10)
+    game = new_game(seed=12)
+    play(game, random.Random(1), 120)
+    recording = game.recording()
+    assert len(recording["actions"]) <= 10
+    assert recording["start"] is not None
+    assert snapshot_checksum(replay(recording)) == snapshot_checksum(game)
+
+def test_quit_must_be_typed_in_full(new_game):
+    game = new_game()
+    for typo in ("q", "qu", "qui", "qiut"):
+        game.step(typo)
+        assert game.game_running
+    assert game.wants_to_quit("quit")
+    assert not game.wants_to_quit("q")
+    game.step("quit")
+    assert not game.game_running
+    assert game.outcome == "quit"
+
+def test_ambiguous_location_asks_which(new_game):
+    game = new_game()
+    game.step("down")
+    game.step("up")
+    texts = [event.text for event in game.step("travel deck")]
+    assert any("Did you mean" in text for text in texts)
+
+def test_full_location_id_still_travels(new_game):
+    game = new_game()
+    game.step("down")
+    game.step("travel ship deck")
+    assert game.current_location.id == "ship_deck"
@@ -0,0 +1,41 @@
+"""
+Tests for enemy templates and alias-method spawn tables.
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from world.enemies import ENEMY_SPAWNS, SpawnTable, get_enemy_templates, get_spawn_table
+
+@pytest.mark.parametrize("weights", [
+    {"a": 1, "b": 1},
+    {"a": 5, "b": 3, "c": 2},
+    {"a": 0.1, "b": 0.6, "c": 0.3, "d": 0},
+])
+def test_samples_follow_the_weights(weights):
+    table = SpawnTable(weights)
+    draws = 40000
+    rng = random.Random(1)
+    counts = Counter(table.sample(rng) for _ in range(draws))
+    total = sum(weights.values())
+    for enemy_id, weight in weights.items():
+        assert counts[enemy_id] / draws == pytest.approx(weight / total, abs=0.015)
+
+def test_zero_weights_never_spawn_and_empty_tables_are_false():
+    assert SpawnTable({"a": 0, "b": 2}).enemy_ids == ("b",)
+    assert not SpawnTable({})
+    assert not SpawnTable({"a": 0})
+
+def test_every_spawn_names_a_template():
+    templates = get_enemy_templates()
+    for location_id, weights in ENEMY_SPAWNS.items():
+        assert set(weights) <= set(templates), location_id
+        assert get_spawn_table(location_id)
+
+def test_spawned_enemies_are_independent_copies():
+    template = next(iter(get_enemy_templates().values()))
+    first, second = template.spawn(), template.spawn()
+    first.health -= 1
+    assert second.health == template.spawn().health
@@ -0,0 +1,64 @@
+"""
+Tests for the indexed, stackable inventory.
+"""
+
+import pytest
+
+from game.inventory import Inventory
+from world.items import get_item_by_id
+
+def _check_indexes(inventory):
+    """The stacks, the name index and the count must all agree"""
+    stacks = list(inventory.stacks())
+    assert len(inventory) == sum(count for _, count in stacks) == len(list(inventory))
+    assert bool(inventory) == bool(stacks)
+    for item, count in stacks:
+        assert inventory.count(item.id) == count
+        assert inventory.get(item.name) is not None
+    assert set(inventory._names) == {item.name.lower() for item, _ in stacks}
+
+def test_copies_stack_and_unstack():
+    inventory = Inventory()
+    first, second = get_item_by_id("water_sample"), get_item_by_id("water_sample")
+    knife = get_item_by_id("dive_knife")
+    for item in (first, second, knife):
+        inventory.add(item)
+    _check_indexes(inventory)
+    assert inventory.count("water_sample") == 2
+    assert [item.id for item, _ in inventory.stacks()] == ["water_sample", "dive_knife"]
+
+    inventory.remove(first)
+    _check_indexes(inventory)
+    assert second in inventory and first not in inventory
+
+    assert inventory.take("Water Sample") is second
+    _check_indexes(inventory)
+    assert not inventory.has("water_sample")
+    assert inventory.has("diving knife")
+
+def test_removing_what_isnt_held_raises():
+    inventory = Inventory([get_item_by_id("water_sample")])
+    with pytest.raises(ValueError):
+        inventory.remove(get_item_by_id("water_sample"))
+    with pytest.raises(ValueError):
+        inventory.remove(get_item_by_id("dive_knife"))
+    _check_indexes(inventory)
+
+def test_version_changes_on_every_change():
+    inventory = Inventory()
+    versions = {inventory.version}
+    item = get_item_by_id("water_sample")
+    inventory.add(item)
+    versions.add(inventory.version)
+    inventory.take("water_sample")
+    versions.add(inventory.version)
+    inventory.clear()
+    versions.add(inventory.version)
+    assert len(versions) == 4
+    assert inventory.take("water_sample") is None
+
+def test_plain_strings_are_held_too():
+    inventory = Inventory(["Strange Shell"])
+    assert "strange shell" in inventory
+    assert inventory.take("Strange Shell") == "Strange Shell"
+    _check_indexes(inventory)
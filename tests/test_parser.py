@@ -0,0 +1,60 @@
+"""
+Tests for the command parser's tries and vocabularies.
+"""
+
+from types import SimpleNamespace
+
+from game.parser import (AMBIGUOUS, EXACT, FUZZY, PREFIX, UNKNOWN, Trie, Vocabulary,
+                         noun_vocabulary, verb_vocabulary)
+
+def _trie(*words):
+    trie = Trie()
+    for word in words:
+        trie.insert(word, word)
+    return trie
+
+def test_exact_and_unique_prefix():
+    trie = _trie("north", "inventory", "examine")
+    assert trie.lookup("north") == ("north", EXACT, [])
+    assert trie.lookup("inv") == ("inventory", PREFIX, [])
+    assert trie.lookup("zzz") == (None, UNKNOWN, [])
+
+def test_ambiguous_prefix_lists_candidates():
+    assert _trie("take", "travel", "look").lookup("t") == (None, AMBIGUOUS, ["take", "travel"])
+
+def test_exact_word_wins_over_longer_words():
+    assert _trie("use", "used").lookup("use") == ("use", EXACT, [])
+
+def test_one_word_for_several_values_is_ambiguous():
+    trie = Trie()
+    trie.insert("sample", "water_sample")
+    trie.insert("sample", "plastic_sample")
+    assert trie.lookup("sample") == (None, AMBIGUOUS, ["plastic_sample", "water_sample"])
+
+def test_fuzzy_suggestions_within_edit_distance():
+    vocabulary = Vocabulary([(word, word) for word in ("attack", "examine", "inventory")])
+    assert vocabulary.resolve("atack") == (None, FUZZY, ["attack"])
+    assert vocabulary.resolve("xyzzyq") == (None, UNKNOWN, [])
+    # Short words get no typo allowance
+    assert _trie("up").within_distance("uo", 0) == []
+
+def test_exact_only_words_need_the_whole_word():
+    vocabulary = Vocabulary([("look", "look")], exact_only=[("quit", "quit")])
+    assert vocabulary.resolve("quit") == ("quit", EXACT, [])
+    assert vocabulary.resolve("q")[0] is None
+    assert vocabulary.resolve("qiut")[0] is None
+
+def test_verb_vocabulary_aliases_and_sharing():
+    verbs = verb_vocabulary(["north", "south", "look", "quit"])
+    assert verbs.resolve("n")[0] == "north"
+    assert verbs.resolve("l")[0] == "look"
+    assert verbs.resolve("q")[0] is None
+    assert verb_vocabulary(["north", "south", "look", "quit"]) is verbs
+
+def test_nouns_resolve_by_any_trailing_words():
+    log = SimpleNamespace(id="research_log", name="Dr. Elson's Research Log")
+    nouns = noun_vocabulary([log])
+    assert nouns.resolve("log")[0] == "research_log"
+    assert nouns.resolve("research log")[0] == "research_log"
+    assert nouns.resolve("research_log")[0] == "research_log"
+    assert nouns.describe(["research_log"]) == "'Dr. Elson's Research Log'"
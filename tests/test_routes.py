@@ -0,0 +1,50 @@
+"""
+Tests for the precomputed route tables.
+"""
+
+from types import SimpleNamespace
+
+from world.locations import get_world_template
+from world.routes import RouteTable
+
+def _world(**exits):
+    return {location_id: SimpleNamespace(exits=location_exits) for location_id, location_exits in exits.items()}
+
+LINE = _world(
+    a={"east": "b"},
+    b={"west": "a", "east": "c", "down": "d"},
+    c={"west": "b", "north": "nowhere"},
+    d={"up": "b", "south": "e"},
+    e={},  # A dead end with no way back
+    island={},
+)
+
+def test_shortest_routes_follow_exits():
+    routes = RouteTable(LINE)
+    assert routes.route("a", "a") == []
+    assert routes.route("a", "e") == [("east", "b"), ("down", "d"), ("south", "e")]
+    assert routes.distance("a", "c") == 2
+    assert routes.next_hop("a", "d") == "east"
+
+def test_unreachable_targets_have_no_route():
+    routes = RouteTable(LINE)
+    assert routes.route("e", "a") is None
+    assert routes.distance("a", "island") is None
+    assert not routes.is_reachable("a", "island")
+    assert routes.reachable_from("d") == {"a", "b", "c", "d", "e"}
+
+def test_exit_problems_are_reported():
+    routes = RouteTable(LINE)
+    assert routes.dangling_exits() == [("c", "north", "nowhere")]
+    assert routes.one_way_exits() == [("d", "south", "e")]
+    assert routes.unreachable_from("a") == ["island"]
+
+def test_world_routes_walk_the_real_exits():
+    world = get_world_template()
+    start = world.starting_location_id
+    for target in world.routes.reachable_from(start):
+        current = start
+        for direction, location_id in world.routes.route(start, target):
+            assert world.locations[current].exits[direction] == location_id
+            current = location_id
+        assert current == target
@@ -0,0 +1,63 @@
+"""
+Tests for the binary save format and atomic file replacement.
+"""
+
+import os
+
+import pytest
+
+from utils.save_load import (SaveError, decode, dumps, encode, load_game, loads, read_save,
+                             save_game, write_atomic)
+
+SNAPSHOT = {
+    "name": "Dr. Elson ☂",
+    "health": 87,
+    "debt": -12345678901234567890,
+    "ratio": 0.1,
+    "flags": {"met_captain": True, "lost": False, "nothing": None},
+    "items": [["binoculars", 1], ["water_sample", 3]],
+    "raw": b"\x00\xff",
+}
+
+def test_encode_round_trip():
+    assert decode(encode(SNAPSHOT)) == SNAPSHOT
+
+def test_tuples_and_sets_come_back_as_lists():
+    assert decode(encode({"pair": (1, 2), "set": {3}})) == {"pair": [1, 2], "set": [3]}
+
+def test_unsupported_values_are_refused():
+    with pytest.raises(TypeError):
+        encode({"when": object()})
+
+def test_save_file_round_trip():
+    size = save_game(SNAPSHOT, "saves/game.sav")
+    assert os.path.getsize("saves/game.sav") == size
+    assert read_save("saves/game.sav") == SNAPSHOT
+
+def test_damaged_saves_are_rejected():
+    data = bytearray(dumps(SNAPSHOT))
+    data[-1] ^= 0xFF
+    with pytest.raises(SaveError):
+        loads(bytes(data))
+    with pytest.raises(SaveError):
+        loads(dumps(SNAPSHOT)[:-1])
+    with pytest.raises(SaveError):
+        loads(b"NOTASAVE" + bytes(20))
+
+def test_missing_or_damaged_save_loads_as_none():
+    assert load_game("saves/missing.sav") is None
+    with open("broken.sav", "wb") as file:
+        file.write(b"garbage")
+    assert load_game("broken.sav") is None
+
+def test_atomic_replace_keeps_the_old_file_on_failure():
+    write_atomic("state.bin", b"old")
+    write_atomic("state.bin", b"new")
+    with open("state.bin", "rb") as file:
+        assert file.read() == b"new"
+
+    with pytest.raises(TypeError):
+        write_atomic("state.bin", "not bytes")
+    with open("state.bin", "rb") as file:
+        assert file.read() == b"new"
+    assert os.listdir(".") == ["state.bin"]